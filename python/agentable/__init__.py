@@ -1,10 +1,24 @@
 from .models import (
     AgentableSchema, AgentableColumn, AgentableRow, AgentableView, AgentableSort, AgentableFilter,
-    generate_row_id, generate_col_id, generate_view_id, generate_filter_id, generate_sort_id
+    construct_agentable, RowIdAllocator, row_id_timestamp, row_id_created_at, generate_row_id, generate_col_id, generate_view_id, generate_filter_id, generate_sort_id
 )
 from .manager import AgentableManager
-from .migrate import validate_agentable, migrate_agentable
+from .columnar import ColumnarAgentableManager
+from .concurrent import ConcurrentAgentableManager, ReadWriteLock
+from .migrate import validate_agentable, migrate_agentable, check_agentable
+from .query import execute_view
+from .materialized import MaterializedView
+from .timeline import RowIdIndex
+from .order import RowOrder
+from .indexes import ColumnIndex, HashIndex, SortedIndex, TrigramIndex, PrefixIndex, SuffixIndex
+from .stats import ColumnSummary, GroupedSummary
+from .metrics import ManagerMetrics, LatencyHistogram
+from .stream import AgentableStreamReader, AgentableStreamWriter, write_agentable
+from .snapshot import AgentableSnapshot, open_snapshot, write_snapshot
+from .journal import AgentableJournal, replay_journal, recover_agentable
+from .merge import merge_agentable
 from .tools import AgentableAgentTooling
+from .aio import AsyncAgentableManager, AsyncAgentableAgentTooling
 
 __all__ = [
     "AgentableSchema",
@@ -13,10 +27,44 @@ __all__ = [
     "AgentableView",
     "AgentableSort",
     "AgentableFilter",
+    "construct_agentable",
     "AgentableManager",
+    "ColumnarAgentableManager",
+    "ConcurrentAgentableManager",
+    "ReadWriteLock",
     "validate_agentable",
     "migrate_agentable",
+    "check_agentable",
+    "execute_view",
+    "MaterializedView",
+    "ColumnIndex",
+    "HashIndex",
+    "SortedIndex",
+    "TrigramIndex",
+    "PrefixIndex",
+    "SuffixIndex",
+    "ColumnSummary",
+    "GroupedSummary",
+    "ManagerMetrics",
+    "LatencyHistogram",
+    "AgentableStreamReader",
+    "AgentableStreamWriter",
+    "write_agentable",
+    "AgentableSnapshot",
+    "open_snapshot",
+    "write_snapshot",
+    "AgentableJournal",
+    "replay_journal",
+    "recover_agentable",
+    "merge_agentable",
     "AgentableAgentTooling",
+    "AsyncAgentableManager",
+    "AsyncAgentableAgentTooling",
+    "RowIdAllocator",
+    "RowIdIndex",
+    "RowOrder",
+    "row_id_timestamp",
+    "row_id_created_at",
     "generate_row_id",
     "generate_col_id",
     "generate_view_id",
@@ -25,5 +73,7 @@ __all__ = [
     "create_table"
 ]
 
-def create_table(initial_schema=None):
+def create_table(initial_schema=None, storage="rows"):
+    if storage == "columnar":
+        return ColumnarAgentableManager(initial_schema)
     return AgentableManager(initial_schema)
@@ -0,0 +1,320 @@
+import asyncio
+import inspect
+import threading
+from collections import deque
+from concurrent.futures import Executor
+from datetime import datetime
+from functools import partial
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, Type, Union
+from pydantic import BaseModel
+from .concurrent import ConcurrentAgentableManager
+from .manager import AgentableManager
+from .models import AgentableSchema
+from .tools import AgentableAgentTooling
+
+AsyncChangeHandler = Callable[[AgentableSchema, Dict[str, Any]], Union[None, Awaitable[None]]]
+
+
+class AsyncAgentableManager:
+    """
+    asyncio front end for a manager. Every call runs on `executor` (the loop's default when
+    None), so neither CPU-heavy work (to_dict, view evaluation, validation, bulk edits,
+    schema generation) nor waiting on the manager's locks ever stalls the event loop.
+
+    on_change may be a coroutine function. Change events go through a queue of at most
+    `max_pending` entries drained by a single task, so handlers run in order and off the
+    caller's path; once the queue is full, the async mutators wait for it to drain, which
+    slows producers to the handler's pace instead of buffering without bound.
+
+    Events are first collected, on the executor threads, in an outbox of at most
+    `max_outbox` entries. It only fills when many calls finish before the queue takes their
+    events, or when the manager is edited directly. Past that limit changes are dropped, not
+    buffered: the handler gets one {"type": "overflow", "id": "changes", "dropped": n} event
+    in their place, after the events kept before them, and should reload the table.
+
+    Handlers receive the manager's live schema, not a copy taken at the time of the change.
+    Later edits may already be applied when a handler runs, so it should read the state from
+    the change record and the manager rather than from the schema.
+
+    Calls from many sessions run on executor threads at once, so the wrapped manager defaults
+    to (and should be) a ConcurrentAgentableManager, unless the executor has a single worker.
+    It takes over the manager's on_change; edits made through the manager directly are
+    delivered on the next async call or drain().
+    """
+
+    def __init__(
+        self,
+        manager: Optional[AgentableManager] = None,
+        on_change: Optional[AsyncChangeHandler] = None,
+        max_pending: int = 1024,
+        executor: Optional[Executor] = None,
+        max_outbox: int = 65536,
+    ):
+        self.manager = manager if manager is not None else ConcurrentAgentableManager()
+        self.on_change = on_change
+        self.max_pending = max_pending
+        self.executor = executor
+        self.max_outbox = max_outbox
+        # Filled synchronously (from any thread) by the manager, moved to the queue by the async API
+        self._outbox: Deque[Tuple[AgentableSchema, Dict[str, Any]]] = deque()
+        self._outbox_lock = threading.Lock()
+        # The overflow event at the end of the outbox, counting the changes dropped after it
+        self._overflow: Optional[Dict[str, Any]] = None
+        self._queue: Optional["asyncio.Queue[Tuple[AgentableSchema, Dict[str, Any]]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        self._error: Optional[BaseException] = None
+        self.manager.on_change = self._collect
+
+    def _collect(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        if self.on_change is None:
+            return
+        with self._outbox_lock:
+            outbox = self._outbox
+            if self._overflow is not None and outbox and outbox[-1][1] is self._overflow:
+                # Keep dropping until the overflow event is handed on, so order is kept
+                self._overflow["dropped"] += 1
+            elif len(outbox) < self.max_outbox:
+                outbox.append((schema, change))
+            else:
+                self._overflow = {"type": "overflow", "id": "changes", "dropped": 1}
+                outbox.append((schema, self._overflow))
+
+    def _next_event(self) -> Optional[Tuple[AgentableSchema, Dict[str, Any]]]:
+        with self._outbox_lock:
+            return self._outbox.popleft() if self._outbox else None
+
+    async def _flush(self) -> None:
+        if not self._outbox:
+            return
+        if self._queue is None:
+            self._queue = asyncio.Queue(self.max_pending)
+            self._worker = asyncio.ensure_future(self._dispatch())
+        event = self._next_event()
+        while event is not None:
+            # Blocks here when max_pending events are waiting: this is the backpressure point
+            await self._queue.put(event)
+            event = self._next_event()
+
+    async def _dispatch(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            schema, change = await queue.get()
+            try:
+                if self.on_change is not None:
+                    result = self.on_change(schema, change)
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as e:
+                if self._error is None:
+                    self._error = e
+            finally:
+                queue.task_done()
+
+    async def drain(self) -> None:
+        """
+        Waits until every change so far has been handled; re-raises the first handler error.
+        """
+        await self._flush()
+        if self._queue is not None:
+            await self._queue.join()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def aclose(self) -> None:
+        try:
+            await self.drain()
+        finally:
+            if self._worker is not None:
+                self._worker.cancel()
+                try:
+                    await self._worker
+                except asyncio.CancelledError:
+                    pass
+                self._worker = None
+                self._queue = None
+
+    async def __aenter__(self) -> "AsyncAgentableManager":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Runs fn on the executor, then hands the changes it produced to the on_change queue.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self.executor, partial(fn, *args, **kwargs))
+        finally:
+            await self._flush()
+
+    # --- Reads ---
+
+    async def get_row(self, id: str) -> Any:
+        return await self.call(self.manager.get_row, id)
+
+    async def get_column(self, id: str) -> Any:
+        return await self.call(self.manager.get_column, id)
+
+    async def get_view(self, id: str) -> Any:
+        return await self.call(self.manager.get_view, id)
+
+    async def row_count(self) -> int:
+        return await self.call(self.manager.row_count)
+
+    async def get_agentable(self) -> AgentableSchema:
+        return await self.call(self.manager.get_agentable)
+
+    async def to_dict(self) -> Dict[str, Any]:
+        return await self.call(self.manager.to_dict)
+
+    async def rows(self) -> List[Any]:
+        return await self.call(lambda: list(self.manager.iter_rows()))
+
+    async def query_view(self, view_id: str, limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        return await self.call(lambda: list(self.manager.query_view(view_id, limit=limit, offset=offset)))
+
+    async def validate(self, sample: Optional[int] = None, seed: Optional[int] = None) -> List[str]:
+        return await self.call(self.manager.validate, sample=sample, seed=seed)
+
+    async def diff_since(self, token: int) -> List[Dict[str, Any]]:
+        return await self.call(self.manager.diff_since, token)
+
+    async def rows_created_between(self, start: Optional[Union[datetime, int]] = None, end: Optional[Union[datetime, int]] = None) -> List[Any]:
+        return await self.call(self.manager.rows_created_between, start, end)
+
+    async def latest(self, n: int) -> List[Any]:
+        return await self.call(self.manager.latest, n)
+
+    async def aggregate(self, column_id: Optional[str] = None, op: str = "count", group_by: Optional[str] = None) -> Any:
+        return await self.call(self.manager.aggregate, column_id, op, group_by)
+
+    async def stats(self) -> Dict[str, Dict[str, float]]:
+        return await self.call(self.manager.stats)
+
+    async def write_snapshot(self, path: str) -> int:
+        return await self.call(self.manager.write_snapshot, path)
+
+    # --- Edits ---
+
+    async def update_metadata(self, title: Optional[str] = None, description: Optional[str] = None) -> None:
+        await self.call(self.manager.update_metadata, title=title, description=description)
+
+    async def add_column(self, name: str, type: str, **kwargs: Any) -> Any:
+        return await self.call(self.manager.add_column, name, type, **kwargs)
+
+    async def update_column(self, id: str, **kwargs: Any) -> Any:
+        return await self.call(self.manager.update_column, id, **kwargs)
+
+    async def delete_column(self, id: str) -> None:
+        await self.call(self.manager.delete_column, id)
+
+    async def add_row(self, cells: Dict[str, Any], validate: bool = True) -> Any:
+        return await self.call(self.manager.add_row, cells, validate=validate)
+
+    async def duplicate_row(self, id: str) -> Any:
+        return await self.call(self.manager.duplicate_row, id)
+
+    async def update_row(self, id: str, cells: Dict[str, Any], validate: bool = True) -> Any:
+        return await self.call(self.manager.update_row, id, cells, validate=validate)
+
+    async def set_cell(self, row_id: str, col_id: str, value: Any, validate: bool = True) -> None:
+        await self.call(self.manager.set_cell, row_id, col_id, value, validate=validate)
+
+    async def delete_row(self, id: str) -> None:
+        await self.call(self.manager.delete_row, id)
+
+    async def move_row(self, id: str, to_index: int) -> None:
+        await self.call(self.manager.move_row, id, to_index)
+
+    async def add_rows(self, rows: List[Dict[str, Any]], validate: bool = True) -> List[Any]:
+        return await self.call(self.manager.add_rows, rows, validate=validate)
+
+    async def update_rows(self, updates: Dict[str, Dict[str, Any]], validate: bool = True) -> List[Any]:
+        return await self.call(self.manager.update_rows, updates, validate=validate)
+
+    async def set_cells(self, updates: List[Tuple[str, str, Any]], validate: bool = True) -> None:
+        await self.call(self.manager.set_cells, updates, validate=validate)
+
+    async def delete_rows(self, ids: List[str]) -> None:
+        await self.call(self.manager.delete_rows, ids)
+
+    async def delete_where(self, where: Union[str, Callable[[Any], bool]]) -> List[str]:
+        return await self.call(self.manager.delete_where, where)
+
+    async def apply_patch(self, patch: List[Dict[str, Any]]) -> None:
+        await self.call(self.manager.apply_patch, patch)
+
+    async def create_view(self, name: str) -> Any:
+        return await self.call(self.manager.create_view, name)
+
+    async def add_filter(self, view_id: str, column_id: str, operator: str, value: Any) -> Any:
+        return await self.call(self.manager.add_filter, view_id, column_id, operator, value)
+
+    async def add_sort(self, view_id: str, column_id: str, direction: str) -> Any:
+        return await self.call(self.manager.add_sort, view_id, column_id, direction)
+
+
+class AsyncAgentableAgentTooling:
+    """
+    Awaitable counterpart of AgentableAgentTooling over an AsyncAgentableManager: tool calls
+    share its on_change queue and backpressure, and schema generation runs on the executor.
+    """
+
+    def __init__(self, manager: AsyncAgentableManager):
+        self.manager = manager
+        self.tools = AgentableAgentTooling(manager.manager)
+
+    async def describe_table(self, stats: bool = False) -> str:
+        return await self.manager.call(self.tools.describe_table, stats)
+
+    async def generate_row_model(self) -> Type[BaseModel]:
+        return await self.manager.call(self.tools.generate_row_model)
+
+    async def format_openai(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.manager.call(self.tools.format_openai, **kwargs)
+
+    async def format_anthropic(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.manager.call(self.tools.format_anthropic, **kwargs)
+
+    async def format_query_openai(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.manager.call(self.tools.format_query_openai, **kwargs)
+
+    async def format_query_anthropic(self, **kwargs: Any) -> Dict[str, Any]:
+        return await self.manager.call(self.tools.format_query_anthropic, **kwargs)
+
+    async def tool_query_rows(self, **kwargs: Any) -> str:
+        return await self.manager.call(self.tools.tool_query_rows, **kwargs)
+
+    async def tool_add_row(self, cells: Dict[str, Any]) -> str:
+        return await self.manager.call(self.tools.tool_add_row, cells)
+
+    async def tool_update_row(self, row_id: str, updates: Dict[str, Any]) -> str:
+        return await self.manager.call(self.tools.tool_update_row, row_id, updates)
+
+    async def tool_delete_row(self, row_id: str) -> str:
+        return await self.manager.call(self.tools.tool_delete_row, row_id)
+
+    async def tool_add_column(self, name: str, type: str, description: Optional[str] = None) -> str:
+        return await self.manager.call(self.tools.tool_add_column, name, type, description)
+
+    async def tool_update_column(self, column_id: str, **kwargs: Any) -> str:
+        return await self.manager.call(self.tools.tool_update_column, column_id, **kwargs)
+
+    async def tool_delete_column(self, column_id: str) -> str:
+        return await self.manager.call(self.tools.tool_delete_column, column_id)
+
+    async def tool_create_view(self, name: str) -> str:
+        return await self.manager.call(self.tools.tool_create_view, name)
+
+    async def tool_add_view_filter(self, view_id: str, column_id: str, operator: str, value: Any) -> str:
+        return await self.manager.call(self.tools.tool_add_view_filter, view_id, column_id, operator, value)
+
+    async def tool_add_view_sort(self, view_id: str, column_id: str, direction: str) -> str:
+        return await self.manager.call(self.tools.tool_add_view_sort, view_id, column_id, direction)
+
+    async def tool_update_table_metadata(self, **kwargs: Any) -> str:
+        return await self.manager.call(self.tools.tool_update_table_metadata, **kwargs)
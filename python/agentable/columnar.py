@@ -0,0 +1,811 @@
+import sys
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from .models import (
+    AgentableSchema, AgentableColumn, AgentableRow, AgentableView, AgentableFilter, AgentableSort,
+    _construct_row
+)
+from .manager import AgentableManager
+from .migrate import check_agentable
+from .query import compile_filter, _as_bool, _as_number, _compile_sort_part, _is_empty, _is_multi, project_row, visible_columns
+from .stats import select_histogram
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+# Per-slot cell states shared by every vector; values >= 2 are vector specific
+_ABSENT = 0  # the row's cells have no entry for the column
+_NULL = 1    # the entry is present and None
+_VALUE = 2
+_INT = 3     # NumberVector: a float64 that round-trips to a Python int
+
+_MAX_EXACT_INT = 2 ** 53
+# aggregate() ops computed on the vectors; the rest use the manager's column statistics
+_VECTOR_AGGREGATES = ("count", "nulls", "sum", "mean", "min", "max", "histogram")
+
+
+def _grow(array: "np.ndarray", capacity: int) -> "np.ndarray":
+    grown = np.zeros(capacity, dtype=array.dtype) if array.dtype != object else np.full(capacity, None, dtype=object)
+    grown[:len(array)] = array
+    return grown
+
+
+# --- Column vectors ---
+
+class _Vector(ABC):
+    """
+    Storage for one column: a byte of state per slot plus type-specific arrays.
+    put() returns False when a value does not fit, and the store then falls back to an ObjectVector.
+    """
+    arrays: Tuple[str, ...] = ("state",)
+
+    def __init__(self, capacity: int):
+        self.state = np.zeros(capacity, dtype=np.uint8)
+
+    def grow(self, capacity: int) -> None:
+        for name in self.arrays:
+            setattr(self, name, _grow(getattr(self, name), capacity))
+
+    def take(self, slots: "np.ndarray") -> "_Vector":
+        vector = self.__class__.__new__(self.__class__)
+        vector.__dict__.update(self.__dict__)
+        for name in self.arrays:
+            setattr(vector, name, getattr(self, name)[slots].copy())
+        return vector
+
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.arrays)
+
+    def clear(self, slots: Any) -> None:
+        self.state[slots] = _ABSENT
+
+    @abstractmethod
+    def get(self, slot: int) -> Tuple[bool, Any]:
+        ...
+
+    @abstractmethod
+    def put(self, slot: int, value: Any) -> bool:
+        ...
+
+    def values(self, slots: "np.ndarray") -> List[Tuple[bool, Any]]:
+        return [self.get(slot) for slot in slots.tolist()]
+
+    # Generic (per-slot) evaluation; subclasses vectorize the cases they can
+
+    def mask(self, flt: AgentableFilter, col: AgentableColumn, slots: "np.ndarray") -> "np.ndarray":
+        predicate = compile_filter(flt, col)
+        cid = flt.columnId
+        return np.fromiter(
+            (predicate({cid: value} if present else {}) for present, value in self.values(slots)),
+            dtype=bool, count=len(slots)
+        )
+
+    def sort_key(self, sort: AgentableSort, col: AgentableColumn, slots: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        # Returns (is_null, rank) arrays; ranks reproduce the query engine's ordering
+        part = _compile_sort_part(sort, col, invert=False, null_key=(1, 0))
+        cid = sort.columnId
+        keys = [part({cid: value} if present else {}) for present, value in self.values(slots)]
+        ranks = {key: rank for rank, key in enumerate(sorted({k for k in keys if k[0] == 0}))}
+        nulls = np.fromiter((k[0] == 1 for k in keys), dtype=bool, count=len(keys))
+        order = np.fromiter((ranks.get(k, 0) for k in keys), dtype=np.int64, count=len(keys))
+        return nulls, order
+
+
+class NumberVector(_Vector):
+    """float64 values with the state array doubling as the null mask."""
+    arrays = ("state", "values")
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.values = np.zeros(capacity, dtype=np.float64)
+
+    def get(self, slot: int) -> Tuple[bool, Any]:
+        state = self.state[slot]
+        if state == _ABSENT:
+            return False, None
+        if state == _NULL:
+            return True, None
+        value = self.values[slot]
+        return True, int(value) if state == _INT else float(value)
+
+    def put(self, slot: int, value: Any) -> bool:
+        if value is None:
+            self.state[slot] = _NULL
+        elif isinstance(value, bool):
+            return False
+        elif isinstance(value, int):
+            if abs(value) > _MAX_EXACT_INT:
+                return False
+            self.values[slot] = value
+            self.state[slot] = _INT
+        elif isinstance(value, float):
+            self.values[slot] = value
+            self.state[slot] = _VALUE
+        else:
+            return False
+        return True
+
+    def mask(self, flt: AgentableFilter, col: AgentableColumn, slots: "np.ndarray") -> "np.ndarray":
+        state = self.state[slots]
+        if flt.operator == "isEmpty":
+            return state < _VALUE
+        if flt.operator == "isNotEmpty":
+            return state >= _VALUE
+        if flt.operator in ("is", "isNot", "gt", "lt"):
+            target = _as_number(flt.value)
+            if target is None:
+                result = np.zeros(len(slots), dtype=bool)
+            else:
+                values = self.values[slots]
+                if flt.operator in ("is", "isNot"):
+                    result = values == target
+                elif flt.operator == "gt":
+                    result = values > target
+                else:
+                    result = values < target
+                result &= state >= _VALUE
+            return ~result if flt.operator == "isNot" else result
+        return super().mask(flt, col, slots)
+
+    def sort_key(self, sort: AgentableSort, col: AgentableColumn, slots: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        # Empty slots may still hold an old value; give them one key so they keep display order
+        nulls = self.state[slots] < _VALUE
+        return nulls, np.where(nulls, 0.0, self.values[slots])
+
+
+class BoolVector(_Vector):
+    arrays = ("state", "values")
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.values = np.zeros(capacity, dtype=np.bool_)
+
+    def get(self, slot: int) -> Tuple[bool, Any]:
+        state = self.state[slot]
+        if state == _ABSENT:
+            return False, None
+        if state == _NULL:
+            return True, None
+        return True, bool(self.values[slot])
+
+    def put(self, slot: int, value: Any) -> bool:
+        if value is None:
+            self.state[slot] = _NULL
+        elif isinstance(value, bool):
+            self.values[slot] = value
+            self.state[slot] = _VALUE
+        else:
+            return False
+        return True
+
+    def mask(self, flt: AgentableFilter, col: AgentableColumn, slots: "np.ndarray") -> "np.ndarray":
+        state = self.state[slots]
+        if flt.operator == "isEmpty":
+            return state < _VALUE
+        if flt.operator == "isNotEmpty":
+            return state >= _VALUE
+        if flt.operator in ("gt", "lt"):
+            return np.zeros(len(slots), dtype=bool)
+        if flt.operator in ("is", "isNot"):
+            flag = _as_bool(flt.value)
+            if flag is None:
+                result = np.zeros(len(slots), dtype=bool)
+            else:
+                result = (state >= _VALUE) & (self.values[slots] == flag)
+            return ~result if flt.operator == "isNot" else result
+        return super().mask(flt, col, slots)
+
+    def sort_key(self, sort: AgentableSort, col: AgentableColumn, slots: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        nulls = self.state[slots] < _VALUE
+        return nulls, np.where(nulls, 0, self.values[slots].astype(np.int8))
+
+
+class SelectVector(_Vector):
+    """Dictionary-encoded single-select values: int32 codes into a list of distinct strings."""
+    arrays = ("state", "codes")
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.codes = np.zeros(capacity, dtype=np.int32)
+        self.categories: List[str] = []
+        self._lookup: Dict[str, int] = {}
+
+    def take(self, slots: "np.ndarray") -> "_Vector":
+        vector = super().take(slots)
+        vector.categories = list(self.categories)
+        vector._lookup = dict(self._lookup)
+        return vector
+
+    def get(self, slot: int) -> Tuple[bool, Any]:
+        state = self.state[slot]
+        if state == _ABSENT:
+            return False, None
+        if state == _NULL:
+            return True, None
+        return True, self.categories[self.codes[slot]]
+
+    def put(self, slot: int, value: Any) -> bool:
+        if value is None:
+            self.state[slot] = _NULL
+            return True
+        if not isinstance(value, str):
+            return False
+        code = self._lookup.get(value)
+        if code is None:
+            code = self._lookup[value] = len(self.categories)
+            self.categories.append(value)
+        self.codes[slot] = code
+        self.state[slot] = _VALUE
+        return True
+
+    def mask(self, flt: AgentableFilter, col: AgentableColumn, slots: "np.ndarray") -> "np.ndarray":
+        # Evaluate the filter once per distinct value, then gather by code
+        predicate = compile_filter(flt, col)
+        cid = flt.columnId
+        table = np.array([predicate({cid: c}) for c in self.categories] + [False], dtype=bool)
+        state = self.state[slots]
+        codes = np.where(state >= _VALUE, self.codes[slots], len(self.categories))
+        result = table[codes]
+        result[state == _ABSENT] = predicate({})
+        result[state == _NULL] = predicate({cid: None})
+        return result
+
+    def sort_key(self, sort: AgentableSort, col: AgentableColumn, slots: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+        ranks = np.empty(len(self.categories) + 1, dtype=np.int64)
+        ranks[np.argsort(np.array(self.categories, dtype=object), kind="stable")] = np.arange(len(self.categories))
+        ranks[-1] = 0
+        state = self.state[slots]
+        # Empty strings are treated as nulls by the query engine
+        empty = self._lookup.get("")
+        nulls = state < _VALUE
+        if empty is not None:
+            nulls |= self.codes[slots] == empty
+        return nulls, ranks[np.where(nulls, len(self.categories), self.codes[slots])]
+
+
+class ObjectVector(_Vector):
+    """Arbitrary values (text, dates, urls, multi-selects, mixed types); strings are interned."""
+    arrays = ("state", "objects")
+
+    def __init__(self, capacity: int):
+        super().__init__(capacity)
+        self.objects = np.full(capacity, None, dtype=object)
+
+    def get(self, slot: int) -> Tuple[bool, Any]:
+        state = self.state[slot]
+        if state == _ABSENT:
+            return False, None
+        return True, self.objects[slot]
+
+    def put(self, slot: int, value: Any) -> bool:
+        if isinstance(value, str):
+            value = sys.intern(value)
+        self.objects[slot] = value
+        self.state[slot] = _NULL if value is None else _VALUE
+        return True
+
+    def clear(self, slots: Any) -> None:
+        self.state[slots] = _ABSENT
+        self.objects[slots] = None
+
+    def values(self, slots: "np.ndarray") -> List[Tuple[bool, Any]]:
+        states = self.state[slots].tolist()
+        objects = self.objects[slots].tolist()
+        return [(state != _ABSENT, value) for state, value in zip(states, objects)]
+
+    def nbytes(self) -> int:
+        # Pointer array only; interned strings are shared with the rest of the process
+        return super().nbytes()
+
+
+def _vector_for(col: AgentableColumn, capacity: int) -> _Vector:
+    if col.type == "number":
+        return NumberVector(capacity)
+    if col.type == "boolean":
+        return BoolVector(capacity)
+    if col.type == "select" and not _is_multi(col):
+        return SelectVector(capacity)
+    return ObjectVector(capacity)
+
+
+# --- Store ---
+
+class ColumnStore:
+    """
+    Slot-addressed column vectors. Rows keep their slot for life; display order is a separate
+    int64 array of slots, so moves and deletes never touch the column data.
+    """
+
+    def __init__(self, columns: List[AgentableColumn], capacity: int = 1024):
+        self.capacity = capacity
+        self.slots_used = 0
+        self.ids = np.zeros(capacity, dtype="S12")
+        self.order = np.zeros(capacity, dtype=np.int64)
+        self.count = 0
+        self.index: Dict[str, int] = {}
+        self.vectors: Dict[str, _Vector] = {c.id: _vector_for(c, capacity) for c in columns}
+        # Cells keyed by an ID that is not a column of the table
+        self.extras: Dict[int, Dict[str, Any]] = {}
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.slots_used + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        self.ids = _grow(self.ids, capacity)
+        self.order = _grow(self.order, capacity)
+        for vector in self.vectors.values():
+            vector.grow(capacity)
+        self.capacity = capacity
+
+    # Columns
+
+    def add_column(self, col: AgentableColumn) -> None:
+        self.vectors[col.id] = _vector_for(col, self.capacity)
+
+    def drop_column(self, col_id: str) -> None:
+        self.vectors.pop(col_id, None)
+        for cells in self.extras.values():
+            cells.pop(col_id, None)
+
+    def retype_column(self, col: AgentableColumn) -> None:
+        old = self.vectors.get(col.id)
+        vector = _vector_for(col, self.capacity)
+        if old is None or type(old) is type(vector):
+            return
+        self.vectors[col.id] = vector
+        for slot in self.order[:self.count].tolist():
+            present, value = old.get(slot)
+            if present:
+                self._put(col.id, slot, value)
+
+    # Cells
+
+    def _put(self, col_id: str, slot: int, value: Any) -> None:
+        vector = self.vectors[col_id]
+        if not vector.put(slot, value):
+            # Value does not fit the typed vector: fall back to generic storage for this column
+            fallback = ObjectVector(self.capacity)
+            for other in self.order[:self.count].tolist():
+                present, existing = vector.get(other)
+                if present:
+                    fallback.put(other, existing)
+            fallback.put(slot, value)
+            self.vectors[col_id] = fallback
+
+    def write(self, slot: int, cells: Dict[str, Any]) -> None:
+        for col_id, value in cells.items():
+            if col_id in self.vectors:
+                self._put(col_id, slot, value)
+            else:
+                self.extras.setdefault(slot, {})[col_id] = value
+
+    def cells(self, slot: int) -> Dict[str, Any]:
+        cells = {}
+        for col_id, vector in self.vectors.items():
+            present, value = vector.get(slot)
+            if present:
+                cells[col_id] = value
+        extra = self.extras.get(slot)
+        if extra:
+            cells.update(extra)
+        return cells
+
+    # Rows
+
+    def append(self, row_id: str, cells: Dict[str, Any]) -> int:
+        self._reserve(1)
+        slot = self.slots_used
+        self.slots_used += 1
+        self.ids[slot] = row_id.encode("ascii")
+        self.index[row_id] = slot
+        self.order[self.count] = slot
+        self.count += 1
+        self.write(slot, cells)
+        return slot
+
+    def insert(self, position: int, row_id: str, cells: Dict[str, Any]) -> int:
+        slot = self.append(row_id, cells)
+        self.move(self.count - 1, position)
+        return slot
+
+    def position(self, slot: int) -> int:
+        return int(np.flatnonzero(self.order[:self.count] == slot)[0])
+
+    def move(self, from_index: int, to_index: int) -> None:
+        order = self.order
+        slot = order[from_index]
+        if from_index < to_index:
+            order[from_index:to_index] = order[from_index + 1:to_index + 1]
+        elif from_index > to_index:
+            order[to_index + 1:from_index + 1] = order[to_index:from_index].copy()
+        order[to_index] = slot
+
+    def remove(self, row_ids: List[str]) -> None:
+        slots = np.array([self.index.pop(row_id) for row_id in row_ids], dtype=np.int64)
+        if self.extras:
+            for slot in slots.tolist():
+                self.extras.pop(slot, None)
+        for vector in self.vectors.values():
+            vector.clear(slots)
+        live = self.order[:self.count]
+        kept = live[~np.isin(live, slots)]
+        self.count = len(kept)
+        self.order[:self.count] = kept
+        if self.slots_used > 1024 and self.count < self.slots_used // 2:
+            self.compact()
+
+    def compact(self) -> None:
+        # Drop slots of deleted rows and renumber the remaining ones in display order
+        live = self.order[:self.count].copy()
+        capacity = max(self.count, 1024)
+        ids = np.zeros(capacity, dtype="S12")
+        ids[:self.count] = self.ids[live]
+        vectors = {}
+        for col_id, vector in self.vectors.items():
+            vectors[col_id] = vector.take(live)
+            vectors[col_id].grow(capacity)
+        remap = {int(old): new for new, old in enumerate(live.tolist())}
+        self.extras = {remap[slot]: cells for slot, cells in self.extras.items() if slot in remap}
+        self.ids = ids
+        self.vectors = vectors
+        self.order = np.zeros(capacity, dtype=np.int64)
+        self.order[:self.count] = np.arange(self.count)
+        self.index = {row_id.decode("ascii"): slot for slot, row_id in enumerate(ids[:self.count].tolist())}
+        self.slots_used = self.count
+        self.capacity = capacity
+
+    def row(self, slot: int) -> AgentableRow:
+        return _construct_row(self.ids[slot].decode("ascii"), self.cells(slot))
+
+    def nbytes(self) -> int:
+        return self.ids.nbytes + self.order.nbytes + sum(v.nbytes() for v in self.vectors.values())
+
+
+class ColumnarAgentableManager(AgentableManager):
+    """
+    AgentableManager backed by a ColumnStore instead of a list of AgentableRow models.
+
+    AgentableRow objects are materialized only at the API boundary (get_row, iter_rows,
+    get_agentable, ...); they are snapshots, so edit rows through the manager methods.
+    query_view and aggregate evaluate directly on the column vectors. Requires numpy.
+    """
+
+    def __init__(self, initial_schema: Optional[Dict[str, Any]] = None, on_change: Optional[Callable[[AgentableSchema, Dict[str, Any]], None]] = None, trusted: bool = False):
+        if np is None:
+            raise ImportError("ColumnarAgentableManager requires numpy (pip install agentable[columnar])")
+        rows: List[Any] = []
+        if initial_schema:
+            initial_schema = dict(initial_schema)
+            rows = initial_schema.pop("rows", None) or []
+        # Rows handed out as schema.rows, patched row by row on edits; None once a change
+        # (inserting inside the table, deleting, moving, dropping a column) makes them stale
+        self._materialized_rows: Optional[List[AgentableRow]] = []
+        self._materialized_by_id: Dict[str, AgentableRow] = {}
+        super().__init__(initial_schema, on_change=on_change, trusted=trusted)
+        self._schema.rows = self._materialized_rows
+        self._store = ColumnStore(self._schema.columns, capacity=max(len(rows), 1024))
+        validate_row = AgentableRow.model_validate
+        for data in rows:
+            if trusted:
+                row_id, cells = data["id"], data.get("cells", {})
+            else:
+                row = validate_row(data)
+                row_id, cells = row.id, row.cells
+            if row_id in self._store.index:
+                raise ValueError(f"Duplicate row ID {row_id}")
+            self._store.append(row_id, cells)
+        if rows:
+            self.row_id_allocator.observe(max(self._store.index))
+            self._touch()
+
+    @property
+    def schema(self) -> AgentableSchema:
+        # Rows live in the store; schema.rows is rebuilt from it on the first read after a change
+        # that _patch_rows could not apply in place
+        schema = self._schema
+        if self._materialized_rows is None:
+            self._materialized_rows = list(self.iter_rows())
+            self._materialized_by_id = {row.id: row for row in self._materialized_rows}
+            schema.rows = self._materialized_rows
+        return schema
+
+    @schema.setter
+    def schema(self, schema: AgentableSchema) -> None:
+        self._schema = schema
+
+    def _slot(self, id: str) -> int:
+        slot = self._store.index.get(id)
+        if slot is None:
+            raise ValueError(f"Row {id} not found")
+        return slot
+
+    def _touch(self) -> None:
+        self._materialized_rows = None
+
+    def _patch_rows(self, change_type: str, row_id: str) -> None:
+        # Keeps schema.rows in step with one change without rebuilding it: edits refresh the
+        # touched row and appends append; anything else marks the list stale
+        rows = self._materialized_rows
+        if rows is None or not change_type.startswith(("row.", "cell.", "column.update", "column.delete")):
+            return
+        store = self._store
+        slot = store.index.get(row_id)
+        if change_type in ("cell.update", "row.update"):
+            row = self._materialized_by_id.get(row_id)
+            if row is not None and slot is not None:
+                cells = row.cells
+                cells.clear()
+                cells.update(store.cells(slot))
+                return
+        elif change_type == "row.add" and slot is not None:
+            if len(rows) < store.count and store.order[len(rows)] == slot:
+                row = store.row(slot)
+                rows.append(row)
+                self._materialized_by_id[row_id] = row
+                return
+        self._touch()
+
+    def _notify(self, change_type: str, id: str, column_id: Optional[str] = None) -> None:
+        self._patch_rows(change_type, id)
+        super()._notify(change_type, id, column_id)
+
+    def _notify_batch(self, changes: List[Dict[str, Any]]) -> None:
+        for change in changes:
+            self._patch_rows(change["type"], change["id"])
+        super()._notify_batch(changes)
+
+    # --- Reading ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = self._schema.model_dump(exclude={"rows"})
+        store = self._store
+        data["rows"] = [{"id": store.ids[slot].decode("ascii"), "cells": store.cells(slot)} for slot in store.order[:store.count].tolist()]
+        return data
+
+    def row_count(self) -> int:
+        return self._store.count
+
+    def validate(self, sample: Optional[int] = None, seed: Optional[int] = None) -> List[str]:
+        return check_agentable(self.get_agentable(), sample=sample, seed=seed)
+
+    def get_row(self, id: str) -> Optional[AgentableRow]:
+        slot = self._store.index.get(id)
+        return None if slot is None else self._store.row(slot)
+
+    def iter_rows(self) -> Iterator[AgentableRow]:
+        store = self._store
+        return (store.row(slot) for slot in store.order[:store.count].tolist())
+
+    def _row_position(self, id: str) -> int:
+        slot = self._store.index.get(id)
+        return -1 if slot is None else self._store.position(slot)
+
+    def _in_display_order(self, row_ids: List[str]) -> List[str]:
+        store = self._store
+        rank = np.empty(store.capacity, dtype=np.int64)
+        rank[store.order[:store.count]] = np.arange(store.count)
+        present = [row_id for row_id in row_ids if row_id in store.index]
+        slots = np.array([store.index[row_id] for row_id in present], dtype=np.int64)
+        return [present[i] for i in np.argsort(rank[slots], kind="stable").tolist()]
+
+    def memory_usage(self) -> int:
+        return self._store.nbytes()
+
+    # --- Columns ---
+
+    def add_column(self, name: str, type: str, **kwargs) -> AgentableColumn:
+        col = super().add_column(name, type, **kwargs)
+        self._store.add_column(col)
+        return col
+
+    def update_column(self, id: str, **kwargs) -> AgentableColumn:
+        col = super().update_column(id, **kwargs)
+        self._store.retype_column(col)
+        # Retyping may convert stored values
+        self._touch()
+        return col
+
+    def _put_column(self, col: AgentableColumn) -> None:
+        if col.id in self._store.vectors:
+            self._store.retype_column(col)
+            self._touch()
+        else:
+            self._store.add_column(col)
+        super()._put_column(col)
+
+    def _drop_cells(self, col_id: str) -> None:
+        self._store.drop_column(col_id)
+        self._touch()
+
+    # --- Rows ---
+
+    def _insert_row(self, index: int, row_id: str, cells: Dict[str, Any]) -> AgentableRow:
+        index = max(0, min(index, self._store.count))
+        self._store.insert(index, row_id, cells)
+        self.row_id_allocator.observe(row_id)
+        self._notify("row.add", row_id)
+        return _construct_row(row_id, cells)
+
+    def add_row(self, cells: Dict[str, Any], validate: bool = True) -> AgentableRow:
+        if validate:
+            self._validate_cells(cells, complete=True)
+        new_id = self._new_row_id()
+        row = self._model(AgentableRow, id=new_id, cells=cells)
+        self._store.append(new_id, row.cells)
+        self._notify("row.add", new_id)
+        return row
+
+    def add_rows(self, rows: List[Dict[str, Any]], validate: bool = True) -> List[AgentableRow]:
+        for cells in rows:
+            if not isinstance(cells, dict):
+                raise ValueError("Row cells must be a dictionary")
+            if validate:
+                self._validate_cells(cells, complete=True)
+        new_ids = self._new_row_ids(len(rows))
+        for new_id, cells in zip(new_ids, rows):
+            self._store.append(new_id, cells)
+        new_rows = [_construct_row(new_id, dict(cells)) for new_id, cells in zip(new_ids, rows)]
+        self._notify_batch([{"type": "row.add", "id": new_id} for new_id in new_ids])
+        return new_rows
+
+    def duplicate_row(self, id: str) -> AgentableRow:
+        slot = self._slot(id)
+        new_id = self._new_row_id()
+        cells = self._store.cells(slot)
+        self._store.insert(self._store.position(slot) + 1, new_id, cells)
+        self._notify("row.add", new_id)
+        return _construct_row(new_id, cells)
+
+    def update_row(self, id: str, cells: Dict[str, Any], validate: bool = True) -> AgentableRow:
+        slot = self._slot(id)
+        if validate:
+            self._validate_cells(cells)
+        self._store.write(slot, cells)
+        self._notify("row.update", id)
+        return self._store.row(slot)
+
+    def update_rows(self, updates: Dict[str, Dict[str, Any]], validate: bool = True) -> List[AgentableRow]:
+        slots = [self._slot(row_id) for row_id in updates]
+        if validate:
+            for cells in updates.values():
+                self._validate_cells(cells)
+        for slot, cells in zip(slots, updates.values()):
+            self._store.write(slot, cells)
+        self._notify_batch([{"type": "row.update", "id": row_id} for row_id in updates])
+        return [self._store.row(slot) for slot in slots]
+
+    def set_cell(self, row_id: str, col_id: str, value: Any, validate: bool = True) -> None:
+        slot = self._slot(row_id)
+        if validate:
+            self._cell_validator(col_id)(value)
+        self._store.write(slot, {col_id: value})
+        self._notify("cell.update", row_id, column_id=col_id)
+
+    def set_cells(self, updates: List[Tuple[str, str, Any]], validate: bool = True) -> None:
+        slots = []
+        for row_id, col_id, value in updates:
+            slots.append(self._slot(row_id))
+            if validate:
+                self._cell_validator(col_id)(value)
+        for slot, (_, col_id, value) in zip(slots, updates):
+            self._store.write(slot, {col_id: value})
+        self._notify_batch([{"type": "cell.update", "id": row_id, "columnId": col_id} for row_id, col_id, _ in updates])
+
+    def delete_row(self, id: str) -> None:
+        if id in self._store.index:
+            self._store.remove([id])
+        self._notify("row.delete", id)
+
+    def delete_rows(self, ids: List[str]) -> None:
+        doomed = [id for id in dict.fromkeys(ids) if id in self._store.index]
+        if doomed:
+            self._store.remove(doomed)
+        self._notify_batch([{"type": "row.delete", "id": id} for id in dict.fromkeys(ids)])
+
+    def move_row(self, id: str, to_index: int) -> None:
+        slot = self._slot(id)
+        from_index = self._store.position(slot)
+        # Same clamping as list.insert after the row has been taken out
+        n = self._store.count - 1
+        target = max(to_index + n, 0) if to_index < 0 else min(to_index, n)
+        self._store.move(from_index, target)
+        self._notify("row.move", id)
+
+    # --- Vectorized queries ---
+
+    def _view_slots(self, view: AgentableView) -> "np.ndarray":
+        store = self._store
+        slots = store.order[:store.count]
+        for flt in view.filters:
+            col = self.get_column(flt.columnId)
+            vector = store.vectors.get(flt.columnId)
+            if col is None or vector is None:
+                # Filters on unknown columns see every cell as missing
+                if not compile_filter(flt, col)({}):
+                    return slots[:0]
+                continue
+            slots = slots[vector.mask(flt, col, slots)]
+
+        keys = []
+        for sort in view.sorts:
+            col = self.get_column(sort.columnId)
+            vector = store.vectors.get(sort.columnId)
+            if col is None or vector is None:
+                continue
+            nulls, values = vector.sort_key(sort, col, slots)
+            if sort.direction == "desc":
+                values = -values.astype(np.float64)
+            keys.append((nulls, values))
+        if keys:
+            # lexsort is stable and treats its last key as the primary one
+            lex = []
+            for nulls, values in reversed(keys):
+                lex.append(values)
+                lex.append(nulls)
+            slots = slots[np.lexsort(lex)]
+        return slots
+
+    def _view_rows(self, view: AgentableView) -> List[AgentableRow]:
+        # Rows passing the filters on the vectors, in display order
+        store = self._store
+        slots = self._view_slots(view.model_copy(update={"sorts": []}))
+        return [store.row(slot) for slot in slots.tolist()]
+
+    def query_view(self, view_id: str, limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        if offset < 0 or (limit is not None and limit < 0):
+            raise ValueError("limit and offset must be non-negative")
+        view = self.get_view(view_id)
+        if not view:
+            raise ValueError(f"View {view_id} not found")
+        slots = self._view_slots(view)
+        column_ids = visible_columns(view, self._schema.columns)
+        end = None if limit is None else offset + limit
+        store = self._store
+        return (project_row(store.row(slot), column_ids) for slot in slots[offset:end].tolist())
+
+    def aggregate(self, column_id: Optional[str] = None, op: str = "count", group_by: Optional[str] = None) -> Any:
+        """
+        Vectorized column aggregate for count, nulls, sum, mean, min, max and histogram (over
+        select options). Other requests (group_by, distinct, summary, ...) go to the
+        incrementally maintained statistics of AgentableManager.aggregate.
+        """
+        if column_id is None or group_by is not None or op not in _VECTOR_AGGREGATES:
+            return super().aggregate(column_id, op, group_by)
+        vector = self._store.vectors.get(column_id)
+        if vector is None:
+            raise ValueError(f"Column {column_id} not found")
+        store = self._store
+        slots = store.order[:store.count]
+        present = self._filled(vector, slots)
+        if op == "count":
+            return int(present.sum())
+        if op == "nulls":
+            return int((~present).sum())
+        if isinstance(vector, NumberVector):
+            values = vector.values[slots][present]
+            if op == "sum":
+                return float(values.sum())
+            if op in ("mean", "min", "max"):
+                return float(getattr(values, op)()) if len(values) else None
+        if isinstance(vector, SelectVector) and op == "histogram":
+            counts = np.bincount(vector.codes[slots][present], minlength=len(vector.categories))
+            col = self.get_column(column_id)
+            assert col is not None
+            return select_histogram(col, {value: int(n) for value, n in zip(vector.categories, counts.tolist()) if n})
+        return super().aggregate(column_id, op)
+
+    def _filled(self, vector: _Vector, slots: "np.ndarray") -> "np.ndarray":
+        # Slots holding a value that is not empty (None, "" or []), as the query engine and
+        # the column statistics define it
+        present = vector.state[slots] >= _VALUE
+        if isinstance(vector, SelectVector):
+            empty = vector._lookup.get("")
+            if empty is not None:
+                present &= vector.codes[slots] != empty
+        elif isinstance(vector, ObjectVector):
+            objects = vector.objects[slots].tolist()
+            present &= ~np.fromiter((_is_empty(value) for value in objects), dtype=bool, count=len(objects))
+        return present
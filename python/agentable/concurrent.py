@@ -0,0 +1,295 @@
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from .models import AgentableRow, AgentableSchema, _construct_row
+from .manager import AgentableManager
+from .timeline import RowIdIndex
+
+
+class ReadWriteLock:
+    """
+    Writer-preferring reader-writer lock. Both sides are re-entrant per thread, and a thread
+    holding the write side may also take the read side; upgrading read to write is refused
+    since two threads doing it at once would deadlock.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._waiting_writers = 0
+        self._local = threading.local()
+
+    def _held(self) -> List[int]:
+        held = getattr(self._local, "held", None)
+        if held is None:
+            # [read depth, write depth] for the current thread
+            held = self._local.held = [0, 0]
+        return held
+
+    def acquire_read(self) -> None:
+        held = self._held()
+        if held[0] or held[1]:
+            held[0] += 1
+            return
+        with self._cond:
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        held[0] = 1
+
+    def release_read(self) -> None:
+        held = self._held()
+        held[0] -= 1
+        if held[0] == 0 and not held[1]:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        held = self._held()
+        if held[1]:
+            held[1] += 1
+            return
+        if held[0]:
+            raise RuntimeError("Cannot take the write lock while holding the read lock")
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = threading.get_ident()
+        held[1] = 1
+
+    def release_write(self) -> None:
+        held = self._held()
+        held[1] -= 1
+        if not held[1]:
+            with self._cond:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+def _exclusive(method: Callable[..., Any]) -> Callable[..., Any]:
+    def locked(self: "ConcurrentAgentableManager", *args: Any, **kwargs: Any) -> Any:
+        with self._lock.write():
+            return method(self, *args, **kwargs)
+    locked.__name__ = method.__name__
+    locked.__doc__ = method.__doc__
+    return locked
+
+
+def _consistent(method: Callable[..., Any]) -> Callable[..., Any]:
+    def locked(self: "ConcurrentAgentableManager", *args: Any, **kwargs: Any) -> Any:
+        with self._consistent_read():
+            return method(self, *args, **kwargs)
+    locked.__name__ = method.__name__
+    locked.__doc__ = method.__doc__
+    return locked
+
+
+def _by_creation(method: Callable[..., Any]) -> Callable[..., Any]:
+    def locked(self: "ConcurrentAgentableManager", *args: Any, **kwargs: Any) -> Any:
+        with self._lock.read():
+            # The ID index is built under the notify lock, which comes before the stripes
+            self._row_id_index()
+            with self._consistent_read():
+                return method(self, *args, **kwargs)
+    locked.__name__ = method.__name__
+    locked.__doc__ = method.__doc__
+    return locked
+
+
+def _shared(method: Callable[..., Any]) -> Callable[..., Any]:
+    def locked(self: "ConcurrentAgentableManager", *args: Any, **kwargs: Any) -> Any:
+        with self._lock.read():
+            return method(self, *args, **kwargs)
+    locked.__name__ = method.__name__
+    locked.__doc__ = method.__doc__
+    return locked
+
+
+class ConcurrentAgentableManager(AgentableManager):
+    """
+    AgentableManager that many threads can share.
+
+    Edits confined to one existing row (set_cell, update_row) hold the table lock shared plus
+    a lock striped by row ID, so writers on different rows run side by side. Anything that
+    changes the table's structure (adding, deleting or moving rows, columns, views, bulk
+    edits) holds it exclusively. Whole-table reads hold it shared together with every stripe,
+    so they run alongside each other but always see a state between complete operations.
+    Listeners and on_change are called one at a time.
+
+    Locks are always taken in the same order: the table lock, then the notify lock, then the
+    row stripes. Nothing waits for the notify lock while holding a stripe.
+
+    Reads hand out copies rather than live objects: get_row and iter_rows return row
+    snapshots, get_agentable a deep copy, and query_view a fully evaluated page.
+    """
+
+    def __init__(self, initial_schema: Optional[Dict[str, Any]] = None, on_change: Optional[Callable[[AgentableSchema, Dict[str, Any]], None]] = None, trusted: bool = False, stripes: int = 64):
+        self._lock = ReadWriteLock()
+        self._notify_lock = threading.RLock()
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        # Concurrent readers may all find tombstones to compact; one of them does it
+        self._compact_lock = threading.Lock()
+        super().__init__(initial_schema, on_change=on_change, trusted=trusted)
+
+    def _stripe(self, row_id: str) -> Any:
+        return self._stripes[hash(row_id) % len(self._stripes)]
+
+    @contextmanager
+    def _consistent_read(self) -> Iterator[None]:
+        with self._lock.read():
+            for stripe in self._stripes:
+                stripe.acquire()
+            try:
+                yield
+            finally:
+                for stripe in self._stripes:
+                    stripe.release()
+
+    def _compact(self) -> None:
+        with self._compact_lock:
+            super()._compact()
+
+    def _row_id_index(self) -> RowIdIndex:
+        index = self._id_index
+        if index is not None:
+            return index
+        # Readers run side by side, so the first one to ask builds the index under the lock
+        with self._notify_lock:
+            return super()._row_id_index()
+
+    def _notify(self, change_type: str, id: str, column_id: Optional[str] = None) -> None:
+        with self._notify_lock:
+            super()._notify(change_type, id, column_id)
+
+    def _notify_batch(self, changes: List[Dict[str, Any]]) -> None:
+        with self._notify_lock:
+            super()._notify_batch(changes)
+
+    def add_listener(self, listener: Callable[[AgentableSchema, Dict[str, Any]], None]) -> None:
+        with self._notify_lock:
+            super().add_listener(listener)
+
+    def remove_listener(self, listener: Callable[[AgentableSchema, Dict[str, Any]], None]) -> None:
+        with self._notify_lock:
+            super().remove_listener(listener)
+
+    # --- Row-local edits: shared table lock + row stripe ---
+
+    def set_cell(self, row_id: str, col_id: str, value: Any, validate: bool = True) -> None:
+        with self._lock.read():
+            with self._stripe(row_id):
+                row = self._rows_by_id.get(row_id)
+                if not row:
+                    raise ValueError(f"Row {row_id} not found")
+                if validate:
+                    self._cell_validator(col_id)(value)
+                row.cells[col_id] = value
+            # Notify outside the stripe: listeners may read other rows
+            self._notify("cell.update", row_id, column_id=col_id)
+
+    def update_row(self, id: str, cells: Dict[str, Any], validate: bool = True) -> AgentableRow:
+        with self._lock.read():
+            with self._stripe(id):
+                row = self._rows_by_id.get(id)
+                if not row:
+                    raise ValueError(f"Row {id} not found")
+                if validate:
+                    self._validate_cells(cells)
+                row.cells.update(cells)
+                snapshot = _construct_row(id, dict(row.cells))
+            self._notify("row.update", id)
+            return snapshot
+
+    # --- Reads ---
+
+    def get_row(self, id: str) -> Optional[AgentableRow]:
+        with self._lock.read(), self._stripe(id):
+            row = super().get_row(id)
+            return None if row is None else _construct_row(row.id, dict(row.cells))
+
+    def iter_rows(self) -> Iterator[AgentableRow]:
+        with self._consistent_read():
+            return iter([_construct_row(r.id, dict(r.cells)) for r in super().iter_rows()])
+
+    def get_agentable(self) -> AgentableSchema:
+        with self._consistent_read():
+            return self.schema.model_copy(deep=True)
+
+    def query_view(self, view_id: str, limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        # Row-local edits update the indexes after releasing their stripe; holding the notify
+        # lock (taken before the stripes, as writers do) keeps the indexes in step with the rows
+        settled = self._notify_lock if self._indexes is not None else nullcontext()
+        with self._lock.read(), settled, self._consistent_read():
+            # Rows are projected into new dicts, so the page stays valid after the lock is released
+            return iter(list(super().query_view(view_id, limit=limit, offset=offset)))
+
+    def aggregate(self, column_id: Optional[str] = None, op: str = "count", group_by: Optional[str] = None) -> Any:
+        # Statistics follow edits through the listeners, so settle them as query_view does.
+        # The notify lock is taken before the stripes, in the same order as every other path
+        with self._lock.read(), self._notify_lock, self._consistent_read():
+            return super().aggregate(column_id, op, group_by)
+
+    get_column = _shared(AgentableManager.get_column)
+    get_view = _shared(AgentableManager.get_view)
+    row_count = _shared(AgentableManager.row_count)
+    to_dict = _consistent(AgentableManager.to_dict)
+    validate = _consistent(AgentableManager.validate)
+    write_json = _consistent(AgentableManager.write_json)
+    write_snapshot = _consistent(AgentableManager.write_snapshot)
+    diff_since = _consistent(AgentableManager.diff_since)
+    index_memory_usage = _consistent(AgentableManager.index_memory_usage)
+    rows_created_between = _by_creation(AgentableManager.rows_created_between)
+    latest = _by_creation(AgentableManager.latest)
+
+    # --- Structural edits: exclusive ---
+
+    checkpoint = _exclusive(AgentableManager.checkpoint)
+    apply_patch = _exclusive(AgentableManager.apply_patch)
+    update_metadata = _exclusive(AgentableManager.update_metadata)
+    add_column = _exclusive(AgentableManager.add_column)
+    update_column = _exclusive(AgentableManager.update_column)
+    delete_column = _exclusive(AgentableManager.delete_column)
+    add_row = _exclusive(AgentableManager.add_row)
+    duplicate_row = _exclusive(AgentableManager.duplicate_row)
+    add_rows = _exclusive(AgentableManager.add_rows)
+    update_rows = _exclusive(AgentableManager.update_rows)
+    set_cells = _exclusive(AgentableManager.set_cells)
+    delete_rows = _exclusive(AgentableManager.delete_rows)
+    delete_where = _exclusive(AgentableManager.delete_where)
+    delete_row = _exclusive(AgentableManager.delete_row)
+    move_row = _exclusive(AgentableManager.move_row)
+    set_column_visibility = _exclusive(AgentableManager.set_column_visibility)
+    create_view = _exclusive(AgentableManager.create_view)
+    update_view = _exclusive(AgentableManager.update_view)
+    add_filter = _exclusive(AgentableManager.add_filter)
+    remove_filter = _exclusive(AgentableManager.remove_filter)
+    add_sort = _exclusive(AgentableManager.add_sort)
+    remove_sort = _exclusive(AgentableManager.remove_sort)
+    create_index = _exclusive(AgentableManager.create_index)
+    drop_index = _exclusive(AgentableManager.drop_index)
+    materialize_view = _exclusive(AgentableManager.materialize_view)
+    drop_materialized_view = _exclusive(AgentableManager.drop_materialized_view)
+    # Swapping the timed methods in or out waits for the operations in flight
+    enable_metrics = _exclusive(AgentableManager.enable_metrics)
+    disable_metrics = _exclusive(AgentableManager.disable_metrics)
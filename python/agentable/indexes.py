@@ -0,0 +1,575 @@
+import sys
+from abc import ABC, abstractmethod
+import threading
+from bisect import bisect_left, bisect_right, insort
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from .models import AgentableColumn, AgentableFilter, AgentableSchema
+from .query import _as_bool, _as_number, _is_empty, _is_multi
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+# Sorts after every row ID, so (key, _AFTER) bounds all entries with that key
+_AFTER = "\uffff"
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+class ColumnIndex(ABC):
+    """
+    Secondary index over one column. lookup() returns a set of row IDs holding every row a
+    filter matches (as compile_filter would decide), or None when the index cannot answer it.
+    Hash, sorted, prefix and suffix lookups are exact; trigram lookups may include rows that
+    the filter then rejects.
+    """
+
+    kind = ""
+    operators: Tuple[str, ...] = ()
+
+    def __init__(self, column: AgentableColumn):
+        self.column = column
+        self.column_id = column.id
+
+    @abstractmethod
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        ...
+
+    @abstractmethod
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        """
+        Re-indexes a row from its current cells; None removes it.
+        """
+
+    @abstractmethod
+    def lookup(self, operator: str, value: Any) -> Optional[Set[str]]:
+        ...
+
+    @abstractmethod
+    def memory_usage(self) -> int:
+        """
+        Approximate bytes held by the index's own structures. Row IDs and cell values are
+        shared with the table and not counted.
+        """
+
+
+class HashIndex(ColumnIndex):
+    """
+    Equality index (is / isNot): key -> row IDs. multiSelect cells are indexed per element;
+    number cells by numeric value, so "5" and 5 share a key as they do in filters.
+    """
+
+    kind = "hash"
+    operators = ("is", "isNot")
+
+    def __init__(self, column: AgentableColumn):
+        super().__init__(column)
+        self._buckets: Dict[Any, Set[str]] = {}
+        # Row ID -> its key, or the tuple of its element keys for multiSelect columns
+        self._keys: Dict[str, Any] = {}
+
+    def _index_key(self, value: Any) -> Any:
+        # None when the cell cannot equal any hashable target
+        col = self.column
+        if _is_multi(col):
+            if not isinstance(value, list):
+                return None
+            return tuple({v for v in value if _hashable(v)}) or None
+        if col.type == "number":
+            number = _as_number(value)
+            # NaN equals nothing, including itself
+            return None if number is None or number != number else number
+        if col.type == "boolean":
+            return value if isinstance(value, bool) else None
+        return value if value is not None and _hashable(value) else None
+
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self.column = column
+        self._buckets = {}
+        self._keys = {}
+        column_id = column.id
+        if _is_multi(column):
+            for row_id, cells in rows:
+                self.update(row_id, cells)
+            return
+        buckets = self._buckets
+        keys = self._keys
+        index_key = self._index_key
+        for row_id, cells in rows:
+            key = index_key(cells.get(column_id))
+            if key is not None:
+                keys[row_id] = key
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = set()
+                bucket.add(row_id)
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        key = None if cells is None else self._index_key(cells.get(self.column_id))
+        old = self._keys.get(row_id)
+        if key == old:
+            return
+        multi = _is_multi(self.column)
+        buckets = self._buckets
+        if old is not None:
+            for k in (old if multi else (old,)):
+                bucket = buckets[k]
+                bucket.discard(row_id)
+                if not bucket:
+                    del buckets[k]
+            del self._keys[row_id]
+        if key is not None:
+            for k in (key if multi else (key,)):
+                bucket = buckets.get(k)
+                if bucket is None:
+                    bucket = buckets[k] = set()
+                bucket.add(row_id)
+            self._keys[row_id] = key
+
+    def lookup(self, operator: str, value: Any) -> Optional[Set[str]]:
+        if operator not in self.operators:
+            return None
+        col = self.column
+        if col.type == "number":
+            key = _as_number(value)
+            if key is None:
+                return set()
+        elif col.type == "boolean":
+            key = _as_bool(value)
+            if key is None:
+                return set()
+        else:
+            # A None target also matches rows without the cell, which are not indexed
+            if value is None or not _hashable(value):
+                return None
+            key = value
+        return self._buckets.get(key, set())
+
+    def memory_usage(self) -> int:
+        size = sys.getsizeof(self._buckets) + sys.getsizeof(self._keys)
+        size += sum(sys.getsizeof(bucket) for bucket in self._buckets.values())
+        if _is_multi(self.column):
+            size += sum(sys.getsizeof(keys) for keys in self._keys.values())
+        elif self.column.type == "number":
+            # Numeric keys are floats created for the index
+            size += len(self._keys) * sys.getsizeof(0.0)
+        return size
+
+
+class _SortedEntries:
+    """
+    (key, row ID) pairs kept in order with O(1) updates: added entries wait in a pending list
+    that the next read merges in, and retired ones stay in place, skipped through `is_live`,
+    until half the list is stale.
+    """
+
+    def __init__(self, is_live: Callable[[Tuple[Any, str]], bool]):
+        self.is_live = is_live
+        self._entries: List[Tuple[Any, str]] = []
+        self._pending: List[Tuple[Any, str]] = []
+        self._stale = 0
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self._pending)
+
+    def reset(self, entries: Iterable[Tuple[Any, str]]) -> None:
+        self._entries = sorted(entries)
+        self._pending = []
+        self._stale = 0
+
+    def add(self, entry: Tuple[Any, str]) -> None:
+        self._pending.append(entry)
+        if len(self._pending) > max(1024, len(self._entries)):
+            # Without reads the pending list would grow with every update
+            self.settle()
+
+    def retire(self) -> None:
+        self._stale += 1
+
+    def settle(self) -> List[Tuple[Any, str]]:
+        entries = self._entries
+        if self._pending:
+            if len(self._pending) < 64:
+                for entry in self._pending:
+                    insort(entries, entry)
+            else:
+                # Two sorted runs: timsort merges them in linear time
+                entries.extend(sorted(self._pending))
+                entries.sort()
+            self._pending = []
+        if self._stale * 2 > len(entries):
+            is_live = self.is_live
+            live: List[Tuple[Any, str]] = []
+            for entry in entries:
+                # Skips retired entries and duplicates of a row that went back to an earlier key
+                if is_live(entry) and (not live or live[-1] != entry):
+                    live.append(entry)
+            self._entries = entries = live
+            self._stale = 0
+        return entries
+
+    def memory_usage(self) -> int:
+        size = sys.getsizeof(self._entries) + sys.getsizeof(self._pending)
+        sample = self._entries[0] if self._entries else self._pending[0] if self._pending else None
+        if sample is not None:
+            size += len(self) * sys.getsizeof(sample)
+        return size
+
+
+class SortedIndex(ColumnIndex):
+    """
+    Range index (gt / lt): (key, row ID) entries in key order, keys being numbers for number
+    columns and strings for text-like ones (ISO dates compare as text). Updates are O(1).
+    """
+
+    kind = "sorted"
+    operators = ("gt", "lt")
+
+    def __init__(self, column: AgentableColumn):
+        super().__init__(column)
+        self._keys: Dict[str, Any] = {}
+        self._entries = _SortedEntries(lambda entry: self._keys.get(entry[1]) == entry[0])
+
+    def _index_key(self, value: Any) -> Any:
+        col = self.column
+        if col.type == "number":
+            number = _as_number(value)
+            return None if number is None or number != number else number
+        if col.type == "boolean" or _is_multi(col) or _is_empty(value):
+            return None
+        return str(value)
+
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self.column = column
+        self._keys = {}
+        for row_id, cells in rows:
+            key = self._index_key(cells.get(column.id))
+            if key is not None:
+                self._keys[row_id] = key
+        self._entries.reset((key, row_id) for row_id, key in self._keys.items())
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        key = None if cells is None else self._index_key(cells.get(self.column_id))
+        old = self._keys.get(row_id)
+        if key == old:
+            return
+        if old is not None:
+            self._entries.retire()
+        if key is None:
+            del self._keys[row_id]
+        else:
+            self._keys[row_id] = key
+            self._entries.add((key, row_id))
+
+    def lookup(self, operator: str, value: Any) -> Optional[Set[str]]:
+        if operator not in self.operators:
+            return None
+        col = self.column
+        if col.type == "boolean" or _is_multi(col):
+            return set()
+        if col.type == "number":
+            bound = _as_number(value)
+            if bound is None or bound != bound:
+                return set()
+        else:
+            bound = str(value)
+        entries = self._entries.settle()
+        if operator == "gt":
+            found = entries[bisect_right(entries, (bound, _AFTER)):]
+        else:
+            found = entries[:bisect_left(entries, (bound, ""))]
+        keys = self._keys
+        return {row_id for key, row_id in found if keys.get(row_id) == key}
+
+    def memory_usage(self) -> int:
+        size = self._entries.memory_usage() + sys.getsizeof(self._keys)
+        if self.column.type == "number":
+            # Numeric keys are floats created for the index
+            size += len(self._keys) * sys.getsizeof(0.0)
+        return size
+
+
+def _texts(value: Any) -> Tuple[str, ...]:
+    # The lower-cased strings text filters test a cell by: each element of a list
+    if _is_empty(value):
+        return ()
+    if isinstance(value, list):
+        return tuple({str(v).lower() for v in value})
+    return (str(value).lower(),)
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex(ColumnIndex):
+    """
+    Substring index (contains): trigram -> row IDs over the lower-cased cell text. A needle of
+    three or more characters narrows the search to rows holding all of its trigrams; shorter
+    needles fall back to a scan. Memory grows with the total text length, about one set
+    entry per character.
+    """
+
+    kind = "trigram"
+    operators = ("contains",)
+
+    def __init__(self, column: AgentableColumn):
+        super().__init__(column)
+        self._postings: Dict[str, Set[str]] = {}
+        # Row ID -> indexed texts; a row's trigrams are recomputed from them when it changes
+        self._texts: Dict[str, Tuple[str, ...]] = {}
+
+    @staticmethod
+    def _grams(texts: Tuple[str, ...]) -> Set[str]:
+        grams: Set[str] = set()
+        for text in texts:
+            grams |= _trigrams(text)
+        return grams
+
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self.column = column
+        self._postings = {}
+        self._texts = {}
+        for row_id, cells in rows:
+            self.update(row_id, cells)
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        texts = () if cells is None else _texts(cells.get(self.column_id))
+        old_texts = self._texts.get(row_id, ())
+        if texts == old_texts:
+            return
+        grams = self._grams(texts)
+        old = self._grams(old_texts)
+        postings = self._postings
+        for gram in old - grams:
+            posting = postings[gram]
+            posting.discard(row_id)
+            if not posting:
+                del postings[gram]
+        for gram in grams - old:
+            posting = postings.get(gram)
+            if posting is None:
+                posting = postings[gram] = set()
+            posting.add(row_id)
+        if texts:
+            self._texts[row_id] = texts
+        else:
+            self._texts.pop(row_id, None)
+
+    def lookup(self, operator: str, value: Any) -> Optional[Set[str]]:
+        if operator not in self.operators:
+            return None
+        needle = str(value).lower() if value is not None else ""
+        if len(needle) < 3:
+            return None
+        postings = sorted((self._postings.get(gram, set()) for gram in _trigrams(needle)), key=len)
+        found = set(postings[0])
+        for posting in postings[1:]:
+            if not found:
+                break
+            found &= posting
+        return found
+
+    def memory_usage(self) -> int:
+        size = sys.getsizeof(self._postings) + sys.getsizeof(self._texts)
+        size += sum(sys.getsizeof(gram) + sys.getsizeof(posting) for gram, posting in self._postings.items())
+        size += sum(sys.getsizeof(texts) + sum(sys.getsizeof(text) for text in texts) for texts in self._texts.values())
+        return size
+
+
+class PrefixIndex(ColumnIndex):
+    """
+    startsWith index: the lower-cased cell texts in sorted order, so the rows starting with a
+    prefix are one contiguous run found by binary search.
+    """
+
+    kind = "prefix"
+    operators = ("startsWith",)
+
+    def __init__(self, column: AgentableColumn):
+        super().__init__(column)
+        self._texts: Dict[str, Tuple[str, ...]] = {}
+        self._entries = _SortedEntries(lambda entry: entry[0] in self._texts.get(entry[1], ()))
+
+    def _keys(self, value: Any) -> Tuple[str, ...]:
+        return _texts(value)
+
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self.column = column
+        self._texts = {}
+        for row_id, cells in rows:
+            keys = self._keys(cells.get(column.id))
+            if keys:
+                self._texts[row_id] = keys
+        self._entries.reset((key, row_id) for row_id, keys in self._texts.items() for key in keys)
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        keys = () if cells is None else self._keys(cells.get(self.column_id))
+        old = self._texts.get(row_id, ())
+        if keys == old:
+            return
+        for _ in old:
+            self._entries.retire()
+        if keys:
+            self._texts[row_id] = keys
+            for key in keys:
+                self._entries.add((key, row_id))
+        else:
+            self._texts.pop(row_id, None)
+
+    def lookup(self, operator: str, value: Any) -> Optional[Set[str]]:
+        if operator not in self.operators:
+            return None
+        needle = str(value).lower() if value is not None else ""
+        if not needle:
+            return None
+        needle = self._keys(needle)[0]
+        entries = self._entries.settle()
+        texts = self._texts
+        found = set()
+        for i in range(bisect_left(entries, (needle, "")), len(entries)):
+            key, row_id = entries[i]
+            if not key.startswith(needle):
+                break
+            if key in texts.get(row_id, ()):
+                found.add(row_id)
+        return found
+
+    def memory_usage(self) -> int:
+        size = self._entries.memory_usage() + sys.getsizeof(self._texts)
+        return size + sum(sys.getsizeof(keys) for keys in self._texts.values())
+
+
+class SuffixIndex(PrefixIndex):
+    """
+    endsWith index: a prefix index over the reversed cell texts.
+    """
+
+    kind = "suffix"
+    operators = ("endsWith",)
+
+    def _keys(self, value: Any) -> Tuple[str, ...]:
+        return tuple(text[::-1] for text in _texts(value))
+
+
+_INDEX_KINDS = {
+    "hash": HashIndex,
+    "sorted": SortedIndex,
+    "trigram": TrigramIndex,
+    "prefix": PrefixIndex,
+    "suffix": SuffixIndex,
+}
+
+
+def default_index_kind(column: AgentableColumn) -> str:
+    return "sorted" if column.type in ("number", "date") else "hash"
+
+
+class ColumnIndexes:
+    """
+    A manager's secondary indexes, kept current from its change stream: cell and row edits
+    re-index only the touched rows and columns, column changes rebuild (or, on delete, drop)
+    that column's indexes. candidates() lets view evaluation skip the full scan.
+    """
+
+    def __init__(self, manager: "AgentableManager"):
+        self.manager = manager
+        self._indexes: Dict[Tuple[str, str], ColumnIndex] = {}
+        self._by_column: Dict[str, List[ColumnIndex]] = {}
+        # Listeners may run while a concurrent manager's readers consult the indexes
+        self._lock = threading.RLock()
+        manager.add_listener(self._on_change)
+
+    def close(self) -> None:
+        self.manager.remove_listener(self._on_change)
+
+    def __len__(self) -> int:
+        return len(self._indexes)
+
+    def _rows(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        return ((row.id, row.cells) for row in self.manager.iter_rows())
+
+    def create(self, column: AgentableColumn, kind: str) -> ColumnIndex:
+        if kind not in _INDEX_KINDS:
+            raise ValueError(f"Unknown index kind {kind}")
+        with self._lock:
+            index = self._indexes.get((column.id, kind))
+            if index is None:
+                index = _INDEX_KINDS[kind](column)
+                index.rebuild(column, self._rows())
+                self._indexes[(column.id, kind)] = index
+                self._by_column.setdefault(column.id, []).append(index)
+            return index
+
+    def drop(self, column_id: str, kind: Optional[str] = None) -> None:
+        with self._lock:
+            for index in list(self._by_column.get(column_id, [])):
+                if kind is None or index.kind == kind:
+                    del self._indexes[(column_id, index.kind)]
+                    self._by_column[column_id].remove(index)
+            if not self._by_column.get(column_id):
+                self._by_column.pop(column_id, None)
+
+    def memory_usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {f"{column_id}/{kind}": index.memory_usage() for (column_id, kind), index in self._indexes.items()}
+
+    def _on_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        change_type = change["type"]
+        if change_type == "cell.update":
+            indexes = self._by_column.get(change["columnId"])
+            if not indexes:
+                return
+        elif change_type in ("row.add", "row.update", "row.delete"):
+            indexes = list(self._indexes.values())
+            if not indexes:
+                return
+        elif change_type == "column.delete":
+            self.drop(change["id"])
+            return
+        elif change_type == "column.update":
+            column = self.manager.get_column(change["id"])
+            with self._lock:
+                for index in self._by_column.get(change["id"], []):
+                    index.rebuild(column, self._rows())
+            return
+        else:
+            return
+        row_id = change["id"]
+        row = self.manager.get_row(row_id)
+        cells = None if row is None else row.cells
+        with self._lock:
+            for index in indexes:
+                index.update(row_id, cells)
+
+    def candidates(self, filters: List[AgentableFilter]) -> Optional[Set[str]]:
+        """
+        IDs of every row that can match all filters, from the indexes that apply; None when
+        no index narrows the search. Rows still have to pass the filters themselves.
+        """
+        with self._lock:
+            matched: Optional[Set[str]] = None
+            excluded: List[Set[str]] = []
+            for flt in filters:
+                for index in self._by_column.get(flt.columnId, ()):
+                    found = index.lookup(flt.operator, flt.value)
+                    if found is None:
+                        continue
+                    if flt.operator == "isNot":
+                        excluded.append(found)
+                    elif matched is None:
+                        matched = set(found)
+                    else:
+                        matched &= found
+                    break
+            if matched is None:
+                # Exclusions alone would still leave almost every row to check
+                return None
+            for found in excluded:
+                matched -= found
+            return matched
@@ -0,0 +1,304 @@
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, IO, List, Optional
+from .models import AgentableColumn, AgentableMetadata, AgentableSchema, AgentableView
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+_VIEW_CHANGES = ("view.add", "view.update", "view.filter.add", "view.filter.remove", "view.sort.add", "view.sort.remove")
+
+
+class AgentableJournal:
+    """
+    Durable change log for a manager: every change is appended to `path` as one compact JSON
+    line carrying the data needed to redo it, so persisting an edit costs O(change) rather
+    than rewriting the table.
+
+    Records are group-committed: they are buffered and written with a single fsync once
+    `sync_every` records are pending or `sync_interval` seconds have passed since the last
+    commit. Records left pending when writes stop are committed by a timer once
+    `sync_interval` has passed, and close() (also run at interpreter exit) commits the rest;
+    call sync() to force a commit. snapshot()
+    writes the whole table to `snapshot_path` and truncates the journal; it runs once on
+    attach if no snapshot exists yet, and every `snapshot_every` records when set.
+    recover_agentable() rebuilds the table from the snapshot plus the journal tail (without
+    a snapshot, replay starts from an empty table).
+
+    With a snapshot the journal's first line names the snapshot it continues (by digest), so
+    a crash after a new snapshot is in place but before the journal is reset cannot replay
+    records the snapshot already contains.
+    """
+
+    def __init__(
+        self,
+        manager: "AgentableManager",
+        path: str,
+        snapshot_path: Optional[str] = None,
+        sync_every: int = 1024,
+        sync_interval: float = 0.05,
+        snapshot_every: Optional[int] = None,
+    ):
+        self.manager = manager
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.snapshot_every = snapshot_every
+        self._pending: List[str] = []
+        self._last_sync = time.monotonic()
+        self._since_snapshot = 0
+        # Commits records left pending once sync_interval has passed without another write
+        self._timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
+        _drop_torn_tail(path)
+        self._fp: Optional[IO[str]] = open(path, "a", encoding="utf-8")
+        if snapshot_path is not None:
+            if not os.path.exists(snapshot_path):
+                # Recovery needs a starting point for whatever the manager held before journaling
+                self.snapshot()
+            elif _journal_base(path) != _file_digest(snapshot_path):
+                # The journal is missing or belongs to an older snapshot
+                self._reset(_file_digest(snapshot_path))
+        manager.add_listener(self)
+        atexit.register(self.close)
+
+    def __call__(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        with self._lock:
+            if change["type"] == "batch":
+                for inner in change["changes"]:
+                    self._record(inner)
+            else:
+                self._record(change)
+            if len(self._pending) >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+                self.sync()
+            elif self._pending and self._timer is None:
+                self._schedule()
+        if self.snapshot_every is not None and self._since_snapshot >= self.snapshot_every:
+            self.snapshot()
+
+    def _record(self, change: Dict[str, Any]) -> None:
+        record = _describe(self.manager, change)
+        if record is not None:
+            self._pending.append(_encode(record) + "\n")
+            self._since_snapshot += 1
+
+    def _schedule(self) -> None:
+        delay = max(0.0, self._last_sync + self.sync_interval - time.monotonic())
+        timer = self._timer = threading.Timer(delay, self._sync_due)
+        timer.daemon = True
+        timer.start()
+
+    def _sync_due(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._fp is not None and self._pending:
+                self.sync()
+
+    def sync(self) -> None:
+        """
+        Writes pending records and fsyncs the journal once for the whole group.
+        """
+        with self._lock:
+            if self._fp is None:
+                raise ValueError("Journal is closed")
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._pending:
+                self._fp.write("".join(self._pending))
+                self._pending.clear()
+                self._fp.flush()
+                os.fsync(self._fp.fileno())
+            self._last_sync = time.monotonic()
+
+    def snapshot(self) -> None:
+        """
+        Atomically replaces the snapshot with the current table, then starts the journal over.
+        """
+        if self.snapshot_path is None:
+            raise ValueError("Journal has no snapshot_path")
+        self.sync()
+        tmp = self.snapshot_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            self.manager.write_json(f)
+            f.flush()
+            os.fsync(f.fileno())
+        digest = _file_digest(tmp)
+        os.replace(tmp, self.snapshot_path)
+        self._reset(digest)
+
+    def _reset(self, digest: str) -> None:
+        self._fp.truncate(0)
+        self._fp.seek(0)
+        self._fp.write(_encode({"op": "journal", "snapshot": digest}) + "\n")
+        self._fp.flush()
+        os.fsync(self._fp.fileno())
+        self._since_snapshot = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fp is not None:
+                self.sync()
+                self.manager.remove_listener(self)
+                self._fp.close()
+                self._fp = None
+        atexit.unregister(self.close)
+
+    def __enter__(self) -> "AgentableJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def _dump(model: Any) -> Dict[str, Any]:
+    return model.model_dump(mode="json", by_alias=True)
+
+
+def _describe(manager: "AgentableManager", change: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Turns a {type, id, columnId} notification into a redo record holding the resulting state
+    change_type = change["type"]
+    id = change["id"]
+    if change_type == "row.add":
+        row = manager.get_row(id)
+        if row is None:
+            return None
+        return {"op": change_type, "id": id, "index": manager._row_position(id), "cells": row.cells}
+    if change_type == "row.update":
+        row = manager.get_row(id)
+        return None if row is None else {"op": change_type, "id": id, "cells": row.cells}
+    if change_type == "cell.update":
+        row = manager.get_row(id)
+        if row is None:
+            return None
+        column_id = change["columnId"]
+        return {"op": change_type, "id": id, "columnId": column_id, "value": row.cells.get(column_id)}
+    if change_type == "row.move":
+        return {"op": change_type, "id": id, "index": manager._row_position(id)}
+    if change_type in ("row.delete", "column.delete"):
+        return {"op": change_type, "id": id}
+    if change_type in ("column.add", "column.update"):
+        col = manager.get_column(id)
+        return None if col is None else {"op": "column.put", "column": _dump(col)}
+    if change_type in _VIEW_CHANGES:
+        view = manager.get_view(id)
+        return None if view is None else {"op": "view.put", "view": _dump(view)}
+    if change_type == "metadata.update":
+        return {"op": change_type, "metadata": _dump(manager._schema.metadata)}
+    return None
+
+
+# --- Recovery ---
+
+def _drop_torn_tail(path: str) -> None:
+    # A crash mid-write can leave a partial last line; cut it so new records start cleanly
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _journal_base(path: str) -> Optional[str]:
+    # Digest of the snapshot named by the journal header, or None for a bare journal
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        line = f.readline()
+    if not line.endswith("\n"):
+        return None
+    record = json.loads(line)
+    return record.get("snapshot") if record.get("op") == "journal" else None
+
+
+def apply_journal_record(manager: "AgentableManager", record: Dict[str, Any]) -> None:
+    """
+    Redoes one journal record against a manager, through its own edit methods.
+    """
+    op = record["op"]
+    if op == "journal":
+        return
+    if op == "row.add":
+        row_id = record["id"]
+        row = manager.get_row(row_id)
+        if row is None:
+            manager._insert_row(record["index"], row_id, dict(record["cells"]))
+        else:
+            # Through the manager, so listeners (indexes, statistics, views) see the edit.
+            # Records carry the row's full cells, so merging them gives the recorded row
+            manager.update_row(row_id, dict(record["cells"]), validate=False)
+    elif op == "row.update":
+        if manager.get_row(record["id"]) is not None:
+            manager.update_row(record["id"], dict(record["cells"]), validate=False)
+    elif op == "cell.update":
+        if manager.get_row(record["id"]) is not None:
+            manager.set_cell(record["id"], record["columnId"], record["value"], validate=False)
+    elif op == "row.move":
+        if manager.get_row(record["id"]) is not None:
+            manager.move_row(record["id"], record["index"])
+    elif op == "row.delete":
+        manager.delete_row(record["id"])
+    elif op == "column.put":
+        manager._put_column(AgentableColumn.model_validate(record["column"]))
+    elif op == "column.delete":
+        manager.delete_column(record["id"])
+    elif op == "view.put":
+        manager._put_view(AgentableView.model_validate(record["view"]))
+    elif op == "metadata.update":
+        manager._put_metadata(AgentableMetadata.model_validate(record["metadata"]))
+    else:
+        raise ValueError(f"Unknown journal operation {op}")
+
+
+def replay_journal(manager: "AgentableManager", path: str) -> int:
+    """
+    Applies every complete record in the journal at path and returns how many were applied.
+    A torn final line (from a crash mid-write) is ignored.
+    """
+    if not os.path.exists(path):
+        return 0
+    count = 0
+    decode = json.JSONDecoder().decode
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            if line.strip():
+                apply_journal_record(manager, decode(line))
+                count += 1
+    return count
+
+
+def recover_agentable(path: str, snapshot_path: Optional[str] = None) -> "AgentableManager":
+    """
+    Rebuilds a table from its last snapshot (if any) plus the journal tail.
+    """
+    from .manager import AgentableManager
+
+    if snapshot_path is not None and os.path.exists(snapshot_path):
+        with open(snapshot_path, "r", encoding="utf-8") as f:
+            # The snapshot was written from a live manager, so it is loaded without re-validation
+            manager = AgentableManager(json.load(f), trusted=True)
+        base = _journal_base(path)
+        if base is not None and base != _file_digest(snapshot_path):
+            # Crashed between writing a snapshot and resetting the journal: nothing to replay
+            return manager
+    else:
+        manager = AgentableManager()
+    replay_journal(manager, path)
+    return manager
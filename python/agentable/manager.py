@@ -1,14 +1,54 @@
-from typing import Any, Dict, List, Optional, Callable
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import IO, Any, Dict, Iterator, List, Optional, Callable, Set, Tuple, Type, TypeVar, Union
+from pydantic import BaseModel
 from .models import (
     AgentableSchema, AgentableColumn, AgentableRow, AgentableView,
     AgentableFilter, AgentableSort,
-    AgentableMetadata, generate_row_id, generate_col_id, generate_view_id,
+    AgentableMetadata, RowIdAllocator, _construct_row, row_id_floor, construct_agentable, generate_col_id, generate_view_id,
     generate_filter_id, generate_sort_id
 )
+from .query import compile_predicate, execute_view
+from .stream import write_agentable
+from .snapshot import write_snapshot
+from .migrate import check_agentable
+from .materialized import MaterializedView
+from .validators import CellValidator, compile_validator, validate_cells
+from .patch import ChangeTracker, PatchOp, apply_patch, build_patch
+from .timeline import RowIdIndex
+from .indexes import ColumnIndex, ColumnIndexes, default_index_kind
+from .stats import ColumnStatistics
+from .order import RowOrder
+from .metrics import ManagerMetrics, MetricsExporter
+
+M = TypeVar("M", bound=BaseModel)
 
 class AgentableManager:
-    def __init__(self, initial_schema: Optional[Dict[str, Any]] = None, on_change: Optional[Callable[[AgentableSchema, Dict[str, Any]], None]] = None):
+    # Tombstoned rows are compacted out of schema.rows once they pass this share of it
+    compaction_ratio = 0.25
+
+    def __init__(self, initial_schema: Optional[Dict[str, Any]] = None, on_change: Optional[Callable[[AgentableSchema, Dict[str, Any]], None]] = None, trusted: bool = False):
         self.on_change = on_change
+        # IDs of deleted rows still in schema.rows' list, dropped by _compact()
+        self._tombstones: Set[str] = set()
+        # Internal subscribers (materialized views, ...) see every change record, batches unrolled
+        self._listeners: List[Callable[[AgentableSchema, Dict[str, Any]], None]] = []
+        self._materialized: Dict[str, MaterializedView] = {}
+        # Compiled per-column validators, built on first use and dropped when the column changes
+        self._validators: Dict[str, CellValidator] = {}
+        # Change log for diff_since(), started by the first checkpoint()
+        self._tracker: Optional[ChangeTracker] = None
+        # Secondary column indexes, created by create_index()
+        self._indexes: Optional[ColumnIndexes] = None
+        # Sorted row IDs for creation-time queries, built on first use
+        self._id_index: Optional[RowIdIndex] = None
+        # Column summaries for aggregate(), each built on first use
+        self._stats: Optional[ColumnStatistics] = None
+        # Bumped by every column add, update and delete; caches derived from the columns key on it
+        self.column_version = 0
+        # Operation timings, recorded only between enable_metrics() and disable_metrics()
+        self._metrics: Optional[ManagerMetrics] = None
         if initial_schema:
             # Validate and load provided schema
             # Pydantic will handle validation and default values where possible
@@ -16,7 +56,11 @@ class AgentableManager:
                 initial_schema["version"] = "agentable-1.0.0"
             if "$schema" not in initial_schema:
                 initial_schema["$schema"] = "https://raw.githubusercontent.com/aztekgold/agentable/main/schema.json"
-            self.schema = AgentableSchema(**initial_schema)
+            if trusted:
+                # Previously validated data: skip validation, check later with validate()
+                self.schema = construct_agentable(initial_schema)
+            else:
+                self.schema = AgentableSchema(**initial_schema)
         else:
             self.schema = AgentableSchema(
                 schema_url="https://raw.githubusercontent.com/aztekgold/agentable/main/schema.json",
@@ -29,13 +73,131 @@ class AgentableManager:
                 views=[],
                 rows=[]
             )
+        self._rebuild_indexes()
+        # Starts above every loaded ID, so new IDs never collide with (or reuse) a row's ID
+        self.row_id_allocator = RowIdAllocator(max(self._rows_by_id, default=None))
+
+    @property
+    def schema(self) -> AgentableSchema:
+        # Every reader sees the table without the tombstoned rows
+        if self._tombstones:
+            self._compact()
+        return self._schema
+
+    @schema.setter
+    def schema(self, schema: AgentableSchema) -> None:
+        self._schema = schema
+
+    def _compact(self) -> None:
+        tombstones = self._tombstones
+        if tombstones:
+            self._schema.rows = [r for r in self._schema.rows if r.id not in tombstones]
+            self._tombstones = set()
+
+    def _rebuild_indexes(self) -> None:
+        # id -> object lookups for point operations; positions are refreshed lazily
+        self._columns_by_id: Dict[str, AgentableColumn] = {c.id: c for c in self._schema.columns}
+        self._views_by_id: Dict[str, AgentableView] = {v.id: v for v in self._schema.views}
+        self._rows_by_id: Dict[str, AgentableRow] = {r.id: r for r in self.schema.rows}
+        # Display positions, kept in step with schema.rows. Finding a position is O(sqrt n),
+        # but schema.rows stays a plain list for serialization, so inserting, moving or
+        # deleting a row is still O(n) overall: one memmove of the list's pointers
+        self._order = RowOrder(self._rows_by_id)
+
+    def _row_position(self, id: str) -> int:
+        return self._order.position(id)
+
+    def _in_display_order(self, row_ids: List[str]) -> List[str]:
+        return self._order.in_order(row_ids)
+
+    def _append_row(self, row: AgentableRow) -> None:
+        self._rows_by_id[row.id] = row
+        self._order.append(row.id)
+        # Appending leaves tombstones where they are
+        self._schema.rows.append(row)
+
+    def _insert_row(self, index: int, row_id: str, cells: Dict[str, Any]) -> AgentableRow:
+        # Adds a row under a known ID (patches, journal replay) and notifies like add_row
+        row = _construct_row(row_id, cells)
+        rows = self.schema.rows
+        index = max(0, min(index, len(rows)))
+        rows.insert(index, row)
+        self._rows_by_id[row_id] = row
+        self._order.insert(index, row_id)
+        self.row_id_allocator.observe(row_id)
+        self._notify("row.add", row_id)
+        return row
+
+    def _drop_cells(self, col_id: str) -> None:
+        for row in self.schema.rows:
+            if col_id in row.cells:
+                del row.cells[col_id]
+
+    def _put_column(self, col: AgentableColumn) -> None:
+        existing = self._columns_by_id.get(col.id)
+        if existing is None:
+            self._schema.columns.append(col)
+        else:
+            self._schema.columns[self._schema.columns.index(existing)] = col
+        self._columns_by_id[col.id] = col
+        self._validators.pop(col.id, None)
+        self.column_version += 1
+        self._notify("column.update" if existing else "column.add", col.id)
+
+    def _put_view(self, view: AgentableView) -> None:
+        existing = self._views_by_id.get(view.id)
+        if existing is None:
+            self._schema.views.append(view)
+        else:
+            self._schema.views[self._schema.views.index(existing)] = view
+        self._views_by_id[view.id] = view
+        self._notify("view.update" if existing else "view.add", view.id)
+
+    def _put_metadata(self, metadata: AgentableMetadata) -> None:
+        self._schema.metadata = metadata
+        self._notify("metadata.update", "metadata")
+
+    def _new_row_id(self) -> str:
+        return self.row_id_allocator.next()
+
+    def _new_row_ids(self, count: int) -> List[str]:
+        return self.row_id_allocator.reserve(count)
+
+    def _model(self, model: Type[M], **data: Any) -> M:
+        # Every validated model the manager builds goes through here, so metrics can time it
+        return model(**data)
+
+    def _emit_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        # Its own method so metrics can time the user's callback
+        self.on_change(schema, change)  # type: ignore[misc]
 
     def _notify(self, change_type: str, id: str, column_id: Optional[str] = None) -> None:
-        if self.on_change:
+        if self.on_change or self._listeners:
             change = {"type": change_type, "id": id}
             if column_id:
                 change["columnId"] = column_id
-            self.on_change(self.schema, change)
+            for listener in self._listeners:
+                listener(self._schema, change)
+            if self.on_change:
+                self._emit_change(self.schema, change)
+
+    def _notify_batch(self, changes: List[Dict[str, Any]]) -> None:
+        if not changes:
+            return
+        # Internal listeners look rows up by ID, so they do not need tombstones compacted
+        for listener in self._listeners:
+            for change in changes:
+                listener(self._schema, change)
+        # A single "batch" event wraps the individual {type, id, columnId} records
+        if self.on_change:
+            self._emit_change(self.schema, {"type": "batch", "id": "rows", "changes": changes})
+
+    def add_listener(self, listener: Callable[[AgentableSchema, Dict[str, Any]], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[AgentableSchema, Dict[str, Any]], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
 
     def get_agentable(self) -> AgentableSchema:
         return self.schema
@@ -43,37 +205,79 @@ class AgentableManager:
     def to_dict(self) -> Dict[str, Any]:
         return self.schema.model_dump()
 
+    def validate(self, sample: Optional[int] = None, seed: Optional[int] = None) -> List[str]:
+        return check_agentable(self.schema, sample=sample, seed=seed)
+
+    def validate_in_background(self, sample: Optional[int] = None, seed: Optional[int] = None) -> "Future[List[str]]":
+        future: "Future[List[str]]" = Future()
+
+        def run() -> None:
+            try:
+                future.set_result(self.validate(sample=sample, seed=seed))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=run, name="agentable-validate", daemon=True).start()
+        return future
+
+    def checkpoint(self) -> int:
+        """
+        Returns a token for the current state; diff_since(token) later yields the edits made after it.
+        """
+        if self._tracker is None:
+            self._tracker = ChangeTracker(self)
+        return self._tracker.checkpoint()
+
+    def diff_since(self, token: int) -> List[PatchOp]:
+        if self._tracker is None:
+            raise ValueError(f"Unknown checkpoint {token}")
+        return build_patch(self, self._tracker.changes_since(token))
+
+    def apply_patch(self, patch: List[PatchOp]) -> None:
+        apply_patch(self, patch)
+
+    def write_json(self, fp: IO[str]) -> int:
+        # Streams rows straight to fp instead of building the full to_dict() copy first
+        return write_agentable(fp, self._schema, self.iter_rows())
+
+    def write_snapshot(self, path: str) -> int:
+        """
+        Writes the table in the binary snapshot format; open it again with open_snapshot(path).
+        """
+        with open(path, "wb") as fp:
+            return write_snapshot(fp, self._schema, self.iter_rows())
+
     # --- Metadata Management ---
 
     def update_metadata(self, title: Optional[str] = None, description: Optional[str] = None) -> None:
         if title is not None:
-            self.schema.metadata.title = title
+            self._schema.metadata.title = title
         if description is not None:
-            self.schema.metadata.description = description
+            self._schema.metadata.description = description
         self._notify("metadata.update", "metadata")
 
     # --- Column Management ---
 
     def add_column(self, name: str, type: str, **kwargs) -> AgentableColumn:
         new_id = generate_col_id()
-        while any(c.id == new_id for c in self.schema.columns):
+        while new_id in self._columns_by_id:
             new_id = generate_col_id()
 
-        new_col = AgentableColumn(
+        new_col = self._model(
+            AgentableColumn,
             id=new_id,
             name=name,
             type=type, # type: ignore - validated by Pydantic
             **kwargs
         )
-        self.schema.columns.append(new_col)
+        self._schema.columns.append(new_col)
+        self._columns_by_id[new_id] = new_col
+        self.column_version += 1
         self._notify("column.add", new_id)
         return new_col
 
     def get_column(self, id: str) -> Optional[AgentableColumn]:
-        for col in self.schema.columns:
-            if col.id == id:
-                return col
-        return None
+        return self._columns_by_id.get(id)
 
     def update_column(self, id: str, **kwargs) -> AgentableColumn:
         col = self.get_column(id)
@@ -84,21 +288,25 @@ class AgentableManager:
         data = kwargs.copy()
         data.pop("id", None)
         
-        for key, value in data.items():
-            if hasattr(col, key):
-                setattr(col, key, value)
+        updates = {key: value for key, value in data.items() if hasattr(col, key)}
+        # Validate through the model so nested values (e.g. constraints) are parsed, not stored as dicts
+        validated = self._model(AgentableColumn, **{**col.model_dump(), **updates})
+        for key in updates:
+            setattr(col, key, getattr(validated, key))
+        self._validators.pop(id, None)
+        self.column_version += 1
         
         self._notify("column.update", id)
         return col
 
     def delete_column(self, id: str) -> None:
-        self.schema.columns = [c for c in self.schema.columns if c.id != id]
-        # Cleanup rows
-        for row in self.schema.rows:
-            if id in row.cells:
-                del row.cells[id]
+        self._schema.columns = [c for c in self._schema.columns if c.id != id]
+        self._columns_by_id.pop(id, None)
+        self._validators.pop(id, None)
+        self.column_version += 1
+        self._drop_cells(id)
         # Cleanup views
-        for view in self.schema.views:
+        for view in self._schema.views:
             view.filters = [f for f in view.filters if f.columnId != id]
             view.sorts = [s for s in view.sorts if s.columnId != id]
             view.hiddenColumns = [cid for cid in view.hiddenColumns if cid != id]
@@ -107,106 +315,222 @@ class AgentableManager:
 
     # --- Row Management ---
 
-    def add_row(self, cells: Dict[str, Any]) -> AgentableRow:
-        new_id = generate_row_id()
-        while any(r.id == new_id for r in self.schema.rows):
-            new_id = generate_row_id()
+    def get_row(self, id: str) -> Optional[AgentableRow]:
+        return self._rows_by_id.get(id)
+
+    def iter_rows(self) -> Iterator[AgentableRow]:
+        return iter(self.schema.rows)
 
-        new_row = AgentableRow(
+    def row_count(self) -> int:
+        return len(self._schema.rows) - len(self._tombstones)
+
+    def add_row(self, cells: Dict[str, Any], validate: bool = True) -> AgentableRow:
+        if validate:
+            self._validate_cells(cells, complete=True)
+        new_id = self._new_row_id()
+
+        new_row = self._model(
+            AgentableRow,
             id=new_id,
             cells=cells
         )
-        self.schema.rows.append(new_row)
+        self._append_row(new_row)
         self._notify("row.add", new_id)
         return new_row
 
     def duplicate_row(self, id: str) -> AgentableRow:
-        source_index = -1
-        for i, row in enumerate(self.schema.rows):
-            if row.id == id:
-                source_index = i
-                break
-        
+        """
+        Inserts a copy of the row right after it. O(n): the copy shifts schema.rows.
+        """
+        source_index = self._row_position(id)
         if source_index == -1:
             raise ValueError(f"Row {id} not found")
 
         source_row = self.schema.rows[source_index]
-        new_id = generate_row_id()
-        while any(r.id == new_id for r in self.schema.rows):
-            new_id = generate_row_id()
+        new_id = self._new_row_id()
 
-        new_row = AgentableRow(
+        new_row = self._model(
+            AgentableRow,
             id=new_id,
             cells=source_row.cells.copy()
         )
         
         self.schema.rows.insert(source_index + 1, new_row)
+        self._rows_by_id[new_id] = new_row
+        self._order.insert(source_index + 1, new_id)
         self._notify("row.add", new_id)
         return new_row
 
     def update_row(self, id: str, cells: Dict[str, Any], validate: bool = True) -> AgentableRow:
-        for row in self.schema.rows:
-            if row.id == id:
-                row.cells.update(cells)
-                # Note: Full validation could be added here if desired
-                self._notify("row.update", id)
-                return row
-        raise ValueError(f"Row {id} not found")
+        row = self._rows_by_id.get(id)
+        if not row:
+            raise ValueError(f"Row {id} not found")
+        if validate:
+            self._validate_cells(cells)
+        row.cells.update(cells)
+        self._notify("row.update", id)
+        return row
 
     def set_cell(self, row_id: str, col_id: str, value: Any, validate: bool = True) -> None:
-        row = next((r for r in self.schema.rows if r.id == row_id), None)
+        row = self._rows_by_id.get(row_id)
         if not row:
             raise ValueError(f"Row {row_id} not found")
         
         if validate:
-            col = self.get_column(col_id)
-            if not col:
-                raise ValueError(f"Column {col_id} not found")
-            self._validate_cell(col, value)
+            self._cell_validator(col_id)(value)
 
         row.cells[col_id] = value
         self._notify("cell.update", row_id, column_id=col_id)
 
+    # --- Bulk Row Management ---
+
+    def add_rows(self, rows: List[Dict[str, Any]], validate: bool = True) -> List[AgentableRow]:
+        for cells in rows:
+            if not isinstance(cells, dict):
+                raise ValueError("Row cells must be a dictionary")
+            if validate:
+                self._validate_cells(cells, complete=True)
+
+        # IDs are freshly generated and cells are checked above, so skip per-row model validation
+        new_ids = self._new_row_ids(len(rows))
+        new_rows = [_construct_row(new_id, dict(cells)) for new_id, cells in zip(new_ids, rows)]
+
+        self._schema.rows.extend(new_rows)
+        self._rows_by_id.update(zip(new_ids, new_rows))
+        self._order.extend(new_ids)
+        changes = [{"type": "row.add", "id": new_id} for new_id in new_ids]
+        self._notify_batch(changes)
+        return new_rows
+
+    def update_rows(self, updates: Dict[str, Dict[str, Any]], validate: bool = True) -> List[AgentableRow]:
+        rows = []
+        for row_id, cells in updates.items():
+            row = self._rows_by_id.get(row_id)
+            if not row:
+                raise ValueError(f"Row {row_id} not found")
+            if validate:
+                self._validate_cells(cells)
+            rows.append(row)
+
+        for row, cells in zip(rows, updates.values()):
+            row.cells.update(cells)
+        self._notify_batch([{"type": "row.update", "id": r.id} for r in rows])
+        return rows
+
+    def set_cells(self, updates: List[Tuple[str, str, Any]], validate: bool = True) -> None:
+        rows = []
+        for row_id, col_id, value in updates:
+            row = self._rows_by_id.get(row_id)
+            if not row:
+                raise ValueError(f"Row {row_id} not found")
+            if validate:
+                self._cell_validator(col_id)(value)
+            rows.append(row)
+
+        changes = []
+        for row, (row_id, col_id, value) in zip(rows, updates):
+            row.cells[col_id] = value
+            changes.append({"type": "cell.update", "id": row_id, "columnId": col_id})
+        self._notify_batch(changes)
+
+    def delete_rows(self, ids: List[str]) -> None:
+        """
+        Deletes rows in O(len(ids)) with one batched notification. The rows are tombstoned:
+        lookups forget them at once, and schema.rows drops them on its next access or once
+        they exceed compaction_ratio of the list.
+        """
+        doomed = {id for id in ids if id in self._rows_by_id}
+        if doomed:
+            for id in doomed:
+                del self._rows_by_id[id]
+            self._order.remove_many(doomed)
+            self._tombstones |= doomed
+            if len(self._tombstones) > self.compaction_ratio * len(self._schema.rows):
+                self._compact()
+        self._notify_batch([{"type": "row.delete", "id": id} for id in dict.fromkeys(ids)])
+
+    def delete_where(self, where: Union[str, Callable[[AgentableRow], bool]]) -> List[str]:
+        """
+        Deletes the rows a view's filters keep (where is a view ID) or those a predicate over
+        rows accepts, as one delete_rows call. Returns the deleted IDs in display order.
+        """
+        if isinstance(where, str):
+            view = self.get_view(where)
+            if not view:
+                raise ValueError(f"View {where} not found")
+            predicate = compile_predicate(view.filters, self._columns_by_id)
+            ids = [row.id for row in self._view_rows(view) if predicate is None or predicate(row.cells)]
+        else:
+            ids = [row.id for row in self.iter_rows() if where(row)]
+        self.delete_rows(ids)
+        return ids
+
     def delete_row(self, id: str) -> None:
-        self.schema.rows = [r for r in self.schema.rows if r.id != id]
+        index = self._row_position(id)
+        if index != -1:
+            del self.schema.rows[index]
+            del self._rows_by_id[id]
+            self._order.remove(id)
         self._notify("row.delete", id)
 
     def move_row(self, id: str, to_index: int) -> None:
-        from_index = -1
-        for i, row in enumerate(self.schema.rows):
-            if row.id == id:
-                from_index = i
-                break
-        
+        """
+        Moves a row to display position to_index. O(n): the position is found in O(sqrt n),
+        but the row is moved within schema.rows with a memmove of the rows between.
+        """
+        from_index = self._row_position(id)
         if from_index == -1:
             raise ValueError(f"Row {id} not found")
         
         row = self.schema.rows.pop(from_index)
         self.schema.rows.insert(to_index, row)
+        self._order.move(id, to_index)
         self._notify("row.move", id)
 
-    def _validate_cell(self, col: AgentableColumn, value: Any) -> None:
-        if value is None:
-            if col.constraints and col.constraints.required:
-                raise ValueError(f"Column {col.name} is required")
-            return
+    # --- Creation-time queries ---
+
+    def _row_id_index(self) -> RowIdIndex:
+        if self._id_index is None:
+            self._id_index = RowIdIndex(self)
+        return self._id_index
+
+    def rows_created_between(self, start: Optional[Union[datetime, int]] = None, end: Optional[Union[datetime, int]] = None) -> List[AgentableRow]:
+        """
+        Rows created in [start, end), oldest first, found by binary search over the row IDs.
+        Bounds are datetimes or milliseconds since the epoch; None leaves that side open.
+        """
+        ids = self._row_id_index().between(
+            None if start is None else row_id_floor(start),
+            None if end is None else row_id_floor(end),
+        )
+        return [self.get_row(id) for id in ids]
+
+    def latest(self, n: int) -> List[AgentableRow]:
+        """
+        The n most recently created rows, newest first.
+        """
+        return [self.get_row(id) for id in self._row_id_index().latest(n)]
+
+    def _cell_validator(self, col_id: str) -> CellValidator:
+        validator = self._validators.get(col_id)
+        if validator is None:
+            col = self._columns_by_id.get(col_id)
+            if not col:
+                raise ValueError(f"Column {col_id} not found")
+            validator = self._validators[col_id] = compile_validator(col)
+        return validator
 
-        # Basic type validation
-        if col.type == "number" and not isinstance(value, (int, float)):
-            raise ValueError(f"Column {col.name} requires a number")
-        elif col.type == "boolean" and not isinstance(value, bool):
-            raise ValueError(f"Column {col.name} requires a boolean")
-        elif col.type == "select" and col.constraints and col.constraints.options:
-            options = [o.value for o in col.constraints.options]
-            if col.constraints.multiSelect:
-                if not isinstance(value, list):
-                    raise ValueError(f"Column {col.name} requires a list")
-                for v in value:
-                    if v not in options:
-                        raise ValueError(f"Value {v} not in options for column {col.name}")
-            else:
-                if value not in options:
-                    raise ValueError(f"Value {value} not in options for column {col.name}")
+    def _column_validators(self) -> Dict[str, CellValidator]:
+        if len(self._validators) != len(self._columns_by_id):
+            for col_id in self._columns_by_id:
+                self._cell_validator(col_id)
+        return self._validators
+
+    def _validate_cells(self, cells: Dict[str, Any], complete: bool = False) -> None:
+        # complete=True (new rows) also reports required columns the cells leave out
+        if not isinstance(cells, dict):
+            raise ValueError("Row cells must be a dictionary")
+        validate_cells(self._column_validators(), cells, complete=complete)
 
     def set_column_visibility(self, view_id: str, column_id: str, visible: bool) -> None:
         view = self.get_view(view_id)
@@ -225,26 +549,25 @@ class AgentableManager:
 
     def create_view(self, name: str) -> AgentableView:
         new_id = generate_view_id()
-        while any(v.id == new_id for v in self.schema.views):
+        while new_id in self._views_by_id:
             new_id = generate_view_id()
 
-        new_view = AgentableView(
+        new_view = self._model(
+            AgentableView,
             id=new_id,
             name=name,
             filters=[],
             sorts=[],
             hiddenColumns=[],
-            columnOrder=[c.id for c in self.schema.columns]
+            columnOrder=[c.id for c in self._schema.columns]
         )
-        self.schema.views.append(new_view)
+        self._schema.views.append(new_view)
+        self._views_by_id[new_id] = new_view
         self._notify("view.add", new_id)
         return new_view
 
     def get_view(self, id: str) -> Optional[AgentableView]:
-        for view in self.schema.views:
-            if view.id == id:
-                return view
-        return None
+        return self._views_by_id.get(id)
 
     def update_view(self, id: str, **kwargs) -> AgentableView:
         view = self.get_view(id)
@@ -273,7 +596,8 @@ class AgentableManager:
         while any(f.id == new_id for f in view.filters):
             new_id = generate_filter_id()
         
-        new_filter = AgentableFilter(
+        new_filter = self._model(
+            AgentableFilter,
             id=new_id,
             columnId=column_id,
             operator=operator, # type: ignore
@@ -299,7 +623,8 @@ class AgentableManager:
         while any(s.id == new_id for s in view.sorts):
             new_id = generate_sort_id()
         
-        new_sort = AgentableSort(
+        new_sort = self._model(
+            AgentableSort,
             id=new_id,
             columnId=column_id,
             direction=direction # type: ignore
@@ -314,3 +639,100 @@ class AgentableManager:
             raise ValueError(f"View {view_id} not found")
         view.sorts = [s for s in view.sorts if s.id != sort_id]
         self._notify("view.sort.remove", view_id)
+
+    # --- View Queries ---
+
+    def _view_rows(self, view: AgentableView) -> List[AgentableRow]:
+        # Rows a view has to check, in display order: the index candidates when there are some
+        if self._indexes is not None and view.filters:
+            candidates = self._indexes.candidates(view.filters)
+            if candidates is not None:
+                rows_by_id = self._rows_by_id
+                return [rows_by_id[id] for id in self._order.in_order(candidates)]
+        return self.schema.rows
+
+    def query_view(self, view_id: str, limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        view = self.get_view(view_id)
+        if not view:
+            raise ValueError(f"View {view_id} not found")
+        return execute_view(view, self._schema.columns, self._view_rows(view), limit=limit, offset=offset)
+
+    # --- Secondary Indexes ---
+
+    def create_index(self, column_id: str, kind: Optional[str] = None) -> ColumnIndex:
+        """
+        Indexes a column for view filters: "hash" serves is/isNot, "sorted" gt/lt, "trigram"
+        contains, "prefix" startsWith and "suffix" endsWith. kind defaults to "sorted" for
+        number and date columns and "hash" otherwise. Views use the indexes automatically;
+        creating an existing index returns it.
+        """
+        col = self.get_column(column_id)
+        if not col:
+            raise ValueError(f"Column {column_id} not found")
+        if self._indexes is None:
+            self._indexes = ColumnIndexes(self)
+        return self._indexes.create(col, kind or default_index_kind(col))
+
+    def drop_index(self, column_id: str, kind: Optional[str] = None) -> None:
+        if self._indexes is not None:
+            self._indexes.drop(column_id, kind)
+
+    def index_memory_usage(self) -> Dict[str, int]:
+        """
+        Approximate bytes used by each index, keyed "<columnId>/<kind>".
+        """
+        return {} if self._indexes is None else self._indexes.memory_usage()
+
+    # --- Aggregation ---
+
+    def aggregate(self, column_id: Optional[str] = None, op: str = "count", group_by: Optional[str] = None) -> Any:
+        """
+        Column statistic: count (filled cells), nulls, distinct, sum, mean, min, max, histogram
+        (rows per value; per option for select columns) or summary (a dict of the ones that
+        suit the column's type). Without a column, count is the number of rows. group_by
+        returns {group value: result} per value of that column.
+
+        The first request for a column (and group column) scans the table once; after that its
+        statistics are kept up to date from edits, so repeat requests cost O(1).
+        """
+        if self._stats is None:
+            self._stats = ColumnStatistics(self)
+        return self._stats.aggregate(column_id, op, group_by)
+
+    def materialize_view(self, view_id: str) -> MaterializedView:
+        if view_id not in self._materialized:
+            if not self.get_view(view_id):
+                raise ValueError(f"View {view_id} not found")
+            self._materialized[view_id] = MaterializedView(self, view_id)
+        return self._materialized[view_id]
+
+    def drop_materialized_view(self, view_id: str) -> None:
+        materialized = self._materialized.pop(view_id, None)
+        if materialized:
+            materialized.close()
+
+    # --- Metrics ---
+
+    def enable_metrics(self, exporter: Optional[MetricsExporter] = None) -> None:
+        """
+        Starts timing the manager's operations, on_change and Pydantic model construction;
+        read the results with stats(). exporter, if given, is called with (name, seconds)
+        after every timed call, e.g. to feed a metrics backend. Enabling again starts over.
+        """
+        self.disable_metrics()
+        self._metrics = ManagerMetrics(exporter)
+        self._metrics.attach(self)
+
+    def disable_metrics(self) -> None:
+        """
+        Stops timing; stats() keeps returning what was recorded until metrics are enabled again.
+        """
+        if self._metrics is not None:
+            self._metrics.detach(self)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        {operation: {count, total, mean, p50, p99, max}} in seconds, for every operation
+        called since enable_metrics(); empty if metrics were never enabled.
+        """
+        return {} if self._metrics is None else self._metrics.stats()
@@ -0,0 +1,176 @@
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Set, Tuple
+from .models import AgentableSchema, AgentableView
+from .query import Predicate, SortKey, compile_predicate, compile_sort_key, project_row, visible_columns
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+# Changes to these force a full rebuild when they touch the materialized view
+_VIEW_REBUILD_CHANGES = ("view.filter.add", "view.filter.remove", "view.sort.add", "view.sort.remove")
+_ROW_CHANGES = ("row.add", "row.update", "cell.update")
+
+
+class MaterializedView:
+    """
+    Keeps the filtered and sorted row IDs of a view up to date from the manager's change stream.
+
+    Each row change re-evaluates only the touched row and re-inserts it by binary search; a full
+    rebuild happens only when the view's filters or sorts (or a column they use) change.
+    Rows that tie on every sort (every row, in an unsorted view) keep display order, as in
+    query_view: each run of tied rows is kept as a group, and a group that gained a row or
+    had one moved is put back in display order on the next read.
+    """
+
+    def __init__(self, manager: "AgentableManager", view_id: str):
+        self.manager = manager
+        self.view_id = view_id
+        # Distinct sort keys in order, the rows having each one, and each row's key
+        self._keys: List[Tuple[Any, ...]] = []
+        self._groups: Dict[Tuple[Any, ...], List[str]] = {}
+        self._entries: Dict[str, Tuple[Any, ...]] = {}
+        # Groups that may be out of display order
+        self._unordered: Set[Tuple[Any, ...]] = set()
+        # Row IDs in view order; None after a change until the next read
+        self._ids: Optional[List[str]] = []
+        self._predicate: Optional[Predicate] = None
+        self._sort_key: Optional[SortKey] = None
+        self._columns: Set[str] = set()
+        # The filters and sorts the view was last built from
+        self._definition: Tuple[Any, ...] = ()
+        self.rebuild()
+        manager.add_listener(self._on_change)
+
+    def close(self) -> None:
+        self.manager.remove_listener(self._on_change)
+
+    def rebuild(self) -> None:
+        view = self.manager.get_view(self.view_id)
+        if not view:
+            raise ValueError(f"View {self.view_id} not found")
+        columns = {c.id: c for c in self.manager._schema.columns}
+        self._predicate = compile_predicate(view.filters, columns)
+        sorting = compile_sort_key(view.sorts, columns, allow_reverse=False)
+        self._sort_key = sorting[0] if sorting else None
+        self._columns = {f.columnId for f in view.filters} | {s.columnId for s in view.sorts}
+        self._definition = _definition(view)
+
+        # Rows are scanned in display order, so every group starts out in order
+        entries = {}
+        groups: Dict[Tuple[Any, ...], List[str]] = {}
+        for row in self.manager.iter_rows():
+            key = self._key(row.cells)
+            if key is not None:
+                entries[row.id] = key
+                group = groups.get(key)
+                if group is None:
+                    groups[key] = [row.id]
+                else:
+                    group.append(row.id)
+        self._entries = entries
+        self._groups = groups
+        self._keys = sorted(groups)
+        self._unordered = set()
+        self._ids = None
+
+    def _key(self, cells: Dict[str, Any]) -> Optional[Tuple[Any, ...]]:
+        if self._predicate is not None and not self._predicate(cells):
+            return None
+        if self._sort_key is None:
+            return ()
+        return self._sort_key(cells)
+
+    def _remove(self, row_id: str) -> None:
+        key = self._entries.pop(row_id, None)
+        if key is not None:
+            group = self._groups[key]
+            group.remove(row_id)
+            if not group:
+                del self._groups[key]
+                del self._keys[bisect_left(self._keys, key)]
+                self._unordered.discard(key)
+            self._ids = None
+
+    def _refresh_row(self, row_id: str) -> None:
+        row = self.manager.get_row(row_id)
+        key = None if row is None else self._key(row.cells)
+        if key is not None and self._entries.get(row_id) == key:
+            return
+        self._remove(row_id)
+        if key is not None:
+            group = self._groups.get(key)
+            if group is None:
+                self._groups[key] = [row_id]
+                self._keys.insert(bisect_left(self._keys, key), key)
+            else:
+                group.append(row_id)
+                self._unordered.add(key)
+            self._entries[row_id] = key
+            self._ids = None
+
+    def _moved(self, row_id: str) -> None:
+        key = self._entries.get(row_id)
+        if key is not None and len(self._groups[key]) > 1:
+            self._unordered.add(key)
+            self._ids = None
+
+    def _ordered_ids(self) -> List[str]:
+        if self._ids is None:
+            for key in self._unordered:
+                self._groups[key] = self.manager._in_display_order(self._groups[key])
+            self._unordered = set()
+            groups = self._groups
+            self._ids = [row_id for key in self._keys for row_id in groups[key]]
+        return self._ids
+
+    def _on_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        change_type = change["type"]
+        if change_type in _ROW_CHANGES:
+            column_id = change.get("columnId")
+            if column_id is not None and column_id not in self._columns:
+                # The cell cannot affect membership or ordering
+                return
+            self._refresh_row(change["id"])
+        elif change_type == "row.delete":
+            self._remove(change["id"])
+        elif change_type == "row.move":
+            self._moved(change["id"])
+        elif change_type in _VIEW_REBUILD_CHANGES:
+            if change["id"] == self.view_id:
+                self.rebuild()
+        elif change_type == "view.update":
+            # Whole-view replacements (patches, journal replay) may bring new filters or sorts
+            if change["id"] == self.view_id:
+                view = self.manager.get_view(self.view_id)
+                if view is not None and _definition(view) != self._definition:
+                    self.rebuild()
+        elif change_type in ("column.update", "column.delete"):
+            if change["id"] in self._columns:
+                self.rebuild()
+
+    # --- Reading ---
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def row_ids(self) -> List[str]:
+        return list(self._ordered_ids())
+
+    def rows(self, limit: Optional[int] = None, offset: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Projected rows ({"id", "cells"}) in view order, like AgentableManager.query_view.
+        """
+        view = self.manager.get_view(self.view_id)
+        if not view:
+            raise ValueError(f"View {self.view_id} not found")
+        column_ids = visible_columns(view, self.manager._schema.columns)
+        end = None if limit is None else offset + limit
+        get_row = self.manager.get_row
+        return (project_row(get_row(row_id), column_ids) for row_id in self._ordered_ids()[offset:end])
+
+
+def _definition(view: AgentableView) -> Tuple[Any, ...]:
+    return (
+        tuple((f.columnId, f.operator, f.value) for f in view.filters),
+        tuple((s.columnId, s.direction) for s in view.sorts),
+    )
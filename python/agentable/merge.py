@@ -0,0 +1,234 @@
+from typing import Any, Callable, Dict, List, Set, Tuple, Union
+from .models import AgentableSchema, _construct_row
+
+MergeSource = Union[AgentableSchema, Dict[str, Any]]
+Conflict = Dict[str, Any]
+ConflictPolicy = Union[str, Callable[[Conflict], Any]]
+
+# Absent value (deleted entity, unset cell); distinct from None
+_MISSING: Any = object()
+# Sorts after every row ID, ends a replica in the merge walk
+_END = "\uffff"
+# List-valued members whose items are matched by their "id"
+_KEYED = ("columns", "views", "filters", "sorts")
+
+
+class _Merge:
+    def __init__(self, policy: ConflictPolicy):
+        if not callable(policy) and policy not in ("ours", "theirs", "raise"):
+            raise ValueError(f"Unknown merge policy {policy}")
+        self.policy = policy
+        self.conflicts: List[Conflict] = []
+
+    def resolve(self, path: str, base: Any, ours: Any, theirs: Any) -> Any:
+        conflict: Conflict = {"path": path}
+        for side, value in (("base", base), ("ours", ours), ("theirs", theirs)):
+            if value is not _MISSING:
+                conflict[side] = value
+        policy = self.policy
+        if policy == "raise":
+            raise ValueError(f"Merge conflict at {path}")
+        if policy == "ours":
+            resolved = ours
+        elif policy == "theirs":
+            resolved = theirs
+        else:
+            resolved = policy(conflict)
+            if resolved is None:
+                resolved = _MISSING
+        if resolved is not _MISSING:
+            conflict["resolved"] = resolved
+        self.conflicts.append(conflict)
+        return resolved
+
+    def value(self, path: str, base: Any, ours: Any, theirs: Any) -> Any:
+        if ours == theirs:
+            return ours
+        if ours == base:
+            return theirs
+        if theirs == base:
+            return ours
+        return self.resolve(path, base, ours, theirs)
+
+    def fields(self, path: str, base: Any, ours: Dict[str, Any], theirs: Dict[str, Any], deep: bool = True) -> Dict[str, Any]:
+        # Both sides have the object: merge member by member, ours' key order first
+        if base is _MISSING:
+            base = {}
+        merged: Dict[str, Any] = {}
+        for key in list(ours) + [k for k in theirs if k not in ours]:
+            b, o, t = base.get(key, _MISSING), ours.get(key, _MISSING), theirs.get(key, _MISSING)
+            if o == t:
+                value = o
+            elif deep and key in _KEYED and all(isinstance(v, list) or v is _MISSING for v in (b, o, t)):
+                value = self.keyed(f"{path}/{key}", b, o, t)
+            elif deep and all(isinstance(v, dict) for v in (o, t)) and (b is _MISSING or isinstance(b, dict)):
+                value = self.fields(f"{path}/{key}", b, o, t)
+            else:
+                value = self.value(f"{path}/{key}", b, o, t)
+            if value is not _MISSING:
+                merged[key] = value
+        return merged
+
+    def entity(self, path: str, base: Any, ours: Any, theirs: Any, fields_path: str = "", deep: bool = True) -> Any:
+        if ours == theirs:
+            return ours
+        if ours is _MISSING or theirs is _MISSING:
+            if base is _MISSING:
+                # Added on one side only
+                return theirs if ours is _MISSING else ours
+            kept = theirs if ours is _MISSING else ours
+            if kept == base:
+                return _MISSING
+            # Deleted on one side, changed on the other
+            return self.resolve(path, base, ours, theirs)
+        if ours == base:
+            return theirs
+        if theirs == base:
+            return ours
+        return self.fields(fields_path or path, base, ours, theirs, deep=deep)
+
+    def keyed(self, path: str, base: Any, ours: Any, theirs: Any) -> List[Dict[str, Any]]:
+        by_id = [{item["id"]: item for item in side} if side is not _MISSING else {} for side in (base, ours, theirs)]
+        b, o, t = by_id
+        merged = []
+        order = list(o) + [id for id in t if id not in o] + [id for id in b if id not in o and id not in t]
+        for id in order:
+            item = self.entity(f"{path}/{id}", b.get(id, _MISSING), o.get(id, _MISSING), t.get(id, _MISSING))
+            if item is not _MISSING:
+                merged.append(item)
+        return merged
+
+
+def _header(source: MergeSource) -> Dict[str, Any]:
+    if isinstance(source, AgentableSchema):
+        return source.model_dump(mode="json", by_alias=True, exclude={"rows"})
+    # Validated so that dict and model inputs compare alike (defaults filled in, same key set)
+    header = AgentableSchema(**{k: v for k, v in source.items() if k != "rows"})
+    return header.model_dump(mode="json", by_alias=True, exclude={"rows"})
+
+
+def _rows(source: MergeSource, name: str) -> Tuple[List[str], List[Dict[str, Any]], List[Dict[str, Any]]]:
+    # Row IDs in display order, then IDs (ending in _END) and cells sorted by ID
+    if isinstance(source, AgentableSchema):
+        ids = [r.id for r in source.rows]
+        cells = [r.cells for r in source.rows]
+    else:
+        rows = source.get("rows", [])
+        ids = [r["id"] for r in rows]
+        cells = [r.get("cells", {}) for r in rows]
+    # Time-sortable IDs make this close to linear: rows that were never moved are already in order
+    order = sorted(range(len(ids)), key=ids.__getitem__)
+    sorted_ids = [ids[i] for i in order]
+    for prev, id in zip(sorted_ids, sorted_ids[1:]):
+        if prev == id:
+            raise ValueError(f"Duplicate row ID {id} in {name}")
+    sorted_ids.append(_END)
+    return ids, sorted_ids, [cells[i] for i in order]
+
+
+def merge_agentable(base: MergeSource, ours: MergeSource, theirs: MergeSource, policy: ConflictPolicy = "ours") -> Tuple[AgentableSchema, List[Conflict]]:
+    """
+    Three-way merge of two replicas (ours, theirs) that diverged from a common ancestor (base).
+    Returns the merged table and a list of conflicts.
+
+    Rows are paired by a single sorted walk over their IDs, so the merge is O(n + m) for
+    replicas whose rows are mostly in creation order. Cells, columns, views, filters and
+    sorts are matched by ID and merged member by member: a change on one side wins over
+    the unchanged other side, and an edit on one side against a delete on the other, or
+    different edits on both, is a conflict.
+
+    A conflict is {"path", "base", "ours", "theirs", "resolved"} with paths in the patch
+    format (/rows/<id>/cells/<columnId>, /columns/<id>/name, /rows/<id>, ...); a side or
+    resolution is left out when the value is absent. `policy` settles each one: "ours",
+    "theirs", "raise" (ValueError on the first conflict), or a callable taking the conflict
+    and returning the value to keep, None to drop the cell or entity.
+
+    Row order follows ours; rows only theirs kept go after the row preceding them in theirs.
+    """
+    merge = _Merge(policy)
+    headers = [_header(source) for source in (base, ours, theirs)]
+    header = merge.fields("", *headers)
+
+    column_ids = {c["id"] for c in header.get("columns", [])}
+    dropped: Set[str] = {c["id"] for h in headers for c in h.get("columns", [])} - column_ids
+    if dropped:
+        # Same clean-up as delete_column for columns the merge removed
+        for view in header.get("views", []):
+            view["filters"] = [f for f in view.get("filters", []) if f["columnId"] not in dropped]
+            view["sorts"] = [s for s in view.get("sorts", []) if s["columnId"] not in dropped]
+            view["hiddenColumns"] = [id for id in view.get("hiddenColumns", []) if id not in dropped]
+            view["columnOrder"] = [id for id in view.get("columnOrder", []) if id not in dropped]
+
+    _, b_ids, b_cells = _rows(base, "base")
+    o_order, o_ids, o_cells = _rows(ours, "ours")
+    t_order, t_ids, t_cells = _rows(theirs, "theirs")
+
+    merged: Dict[str, Dict[str, Any]] = {}
+    # Kept rows that ours does not have, placed by theirs' order
+    extra: Set[str] = set()
+    entity = merge.entity
+    bi = oi = ti = 0
+    while True:
+        b_id, o_id, t_id = b_ids[bi], o_ids[oi], t_ids[ti]
+        if b_id == o_id == t_id:
+            if b_id == _END:
+                break
+            id = b_id
+            b, o, t = b_cells[bi], o_cells[oi], t_cells[ti]
+            bi += 1
+            oi += 1
+            ti += 1
+        else:
+            id = min(b_id, o_id, t_id)
+            b = o = t = _MISSING
+            if b_id == id:
+                b = b_cells[bi]
+                bi += 1
+            if o_id == id:
+                o = o_cells[oi]
+                oi += 1
+            if t_id == id:
+                t = t_cells[ti]
+                ti += 1
+        # Unchanged and one-sided rows (the vast majority) settle without building paths
+        if o == t:
+            cells = o
+        elif o == b and t is not _MISSING:
+            cells = t
+        elif t == b and o is not _MISSING:
+            cells = o
+        else:
+            cells = entity(f"/rows/{id}", b, o, t, fields_path=f"/rows/{id}/cells", deep=False)
+        if cells is _MISSING:
+            continue
+        if dropped:
+            cells = {k: v for k, v in cells.items() if k not in dropped}
+        else:
+            # Never share cell dicts with the inputs
+            cells = dict(cells)
+        merged[id] = cells
+        if o is _MISSING:
+            extra.add(id)
+
+    after: Dict[Any, List[str]] = {}
+    if extra:
+        anchor = None
+        for id in t_order:
+            if id in extra:
+                after.setdefault(anchor, []).append(id)
+            elif id in merged:
+                anchor = id
+    rows = [_construct_row(id, merged[id]) for id in after.get(None, [])]
+    if after:
+        for id in o_order:
+            cells = merged.get(id)
+            if cells is not None:
+                rows.append(_construct_row(id, cells))
+                for extra_id in after.get(id, ()):
+                    rows.append(_construct_row(extra_id, merged[extra_id]))
+    else:
+        rows.extend([_construct_row(id, merged[id]) for id in o_order if id in merged])
+
+    schema = AgentableSchema(**header)
+    schema.rows = rows
+    return schema, merge.conflicts
@@ -0,0 +1,154 @@
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+# Called with (operation name, seconds) for every timed call
+MetricsExporter = Callable[[str, float], None]
+
+# Public manager methods timed under their own names
+OPERATIONS = (
+    "get_row", "get_agentable", "to_dict", "validate", "checkpoint", "diff_since", "apply_patch",
+    "write_json", "write_snapshot", "update_metadata", "add_column", "update_column", "delete_column",
+    "add_row", "duplicate_row", "update_row", "set_cell", "add_rows", "update_rows", "set_cells",
+    "delete_rows", "delete_where", "delete_row", "move_row", "rows_created_between", "latest",
+    "set_column_visibility", "create_view", "update_view", "add_filter", "remove_filter", "add_sort",
+    "remove_sort", "query_view", "create_index", "drop_index", "aggregate", "materialize_view",
+)
+
+# Internal steps: method -> the name they are timed under
+INTERNALS = {
+    "_validate_cells": "validate_cells",
+    "_new_row_id": "new_row_id",
+    "_new_row_ids": "new_row_ids",
+    "_compact": "compact",
+    "_emit_change": "on_change",
+    "_model": "pydantic",
+}
+
+# Histogram resolution: buckets per doubling of the latency, about 9% wide each
+_STEPS = 8
+# Latencies below a nanosecond share the first bucket
+_FLOOR = 1e-9
+
+
+class LatencyHistogram:
+    """
+    Call count, total, maximum and a log-scale histogram of latencies. Recording is O(1) and
+    memory grows with the spread of latencies, not the number of calls; percentiles are the
+    upper edge of the bucket they fall in (capped at the maximum), so within about 9%.
+    """
+
+    __slots__ = ("count", "total", "max", "_buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._buckets: Dict[int, int] = {}
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        bucket = math.floor(math.log2(max(seconds, _FLOOR)) * _STEPS)
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p * self.count))
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= rank:
+                return min(2.0 ** ((bucket + 1) / _STEPS), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(0.5),
+            "p99": self.percentile(0.99),
+            "max": self.max,
+        }
+
+
+class ManagerMetrics:
+    """
+    Per-operation latency histograms for one manager. attach() replaces the timed methods
+    with instance-level wrappers and detach() deletes them again, so a manager without
+    metrics runs its plain methods with no checks on the way.
+
+    Besides the public operations, the steps inside them are timed on their own: cell
+    validation ("validate_cells", "validate_cell"), row ID allocation ("new_row_id",
+    "new_row_ids"), tombstone compaction ("compact"), the on_change callback ("on_change")
+    and Pydantic model construction ("pydantic"). Calls nest, so an add_row's time includes
+    its validate_cells and pydantic time. query_view on a row manager returns a lazy
+    iterator, and only producing the iterator is timed.
+    """
+
+    def __init__(self, exporter: Optional[MetricsExporter] = None):
+        self.exporter = exporter
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+        self._patched: List[str] = []
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = LatencyHistogram()
+            histogram.record(seconds)
+        if self.exporter is not None:
+            self.exporter(name, seconds)
+
+    def timed(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        record = self.record
+        clock = time.perf_counter
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = clock()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                record(name, clock() - start)
+        wrapper.__name__ = getattr(fn, "__name__", name)
+        wrapper.__doc__ = fn.__doc__
+        return wrapper
+
+    def _timed_validator(self, fn: Callable[[str], Callable[[Any], None]]) -> Callable[[str], Callable[[Any], None]]:
+        # set_cell validates through the validator this returns, so time that instead
+        def cell_validator(col_id: str) -> Callable[[Any], None]:
+            return self.timed("validate_cell", fn(col_id))
+        return cell_validator
+
+    def attach(self, manager: "AgentableManager") -> None:
+        names = {name: name for name in OPERATIONS}
+        names.update(INTERNALS)
+        for attr, name in names.items():
+            method = getattr(manager, attr, None)
+            if method is not None:
+                setattr(manager, attr, self.timed(name, method))
+                self._patched.append(attr)
+        manager._cell_validator = self._timed_validator(manager._cell_validator)  # type: ignore[method-assign]
+        self._patched.append("_cell_validator")
+
+    def detach(self, manager: "AgentableManager") -> None:
+        for attr in self._patched:
+            manager.__dict__.pop(attr, None)
+        self._patched = []
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
@@ -1,5 +1,7 @@
-from typing import Any, Dict
-from .models import AgentableSchema
+import random
+from typing import Any, Dict, List, Optional
+from pydantic import ValidationError
+from .models import AgentableRow, AgentableSchema, construct_agentable
 
 def validate_agentable(data: Dict[str, Any]) -> AgentableSchema:
     """
@@ -8,9 +10,43 @@ def validate_agentable(data: Dict[str, Any]) -> AgentableSchema:
     """
     return AgentableSchema(**data)
 
-def migrate_agentable(data: Dict[str, Any]) -> AgentableSchema:
+def check_agentable(schema: AgentableSchema, sample: Optional[int] = None, seed: Optional[int] = None) -> List[str]:
+    """
+    Re-validates a schema that was built without validation (see construct_agentable).
+    Checks the header and either every row or a random sample of `sample` rows.
+    Returns a list of problems; an empty list means nothing was found.
+    """
+    problems: List[str] = []
+    header = schema.model_dump(by_alias=True, exclude={"rows"})
+    try:
+        AgentableSchema(**header)
+    except ValidationError as e:
+        problems.append(f"Header: {e}")
+
+    rows = schema.rows
+    if sample is not None and sample < len(rows):
+        indexes = sorted(random.Random(seed).sample(range(len(rows)), sample))
+    else:
+        indexes = range(len(rows))
+        seen = set()
+        for row in rows:
+            if row.id in seen:
+                problems.append(f"Row {row.id}: duplicate ID")
+            seen.add(row.id)
+
+    validate_row = AgentableRow.model_validate
+    for i in indexes:
+        row = rows[i]
+        try:
+            validate_row({"id": row.id, "cells": row.cells})
+        except ValidationError as e:
+            problems.append(f"Row {i} ({row.id!r}): {e}")
+    return problems
+
+def migrate_agentable(data: Dict[str, Any], trusted: bool = False) -> AgentableSchema:
     """
     Migrates a raw dictionary to the latest AGENTABLE schema version.
+    With trusted=True the result is built without validation (see check_agentable).
     """
     if not isinstance(data, dict):
         raise ValueError("Invalid AGENTABLE data: Input must be a dictionary.")
@@ -30,4 +66,6 @@ def migrate_agentable(data: Dict[str, Any]) -> AgentableSchema:
         data["metadata"] = {"title": "Migrated Table"}
     
     # 3. Validate
+    if trusted:
+        return construct_agentable(data)
     return validate_agentable(data)
@@ -1,5 +1,7 @@
-from typing import List, Optional, Any, Dict, Literal
+from typing import List, Optional, Any, Dict, Literal, Tuple, Type, Union, get_args, get_origin
 from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, timezone
+import threading
 import re
 import time
 import random
@@ -23,6 +25,99 @@ def generate_row_id() -> str:
     timestamp = int(time.time() * 1000)
     return _to_base36(timestamp, 9) + random_3_char()
 
+_BASE36_PAIRS = [a + b for a in BASE36_ALPHABET for b in BASE36_ALPHABET]
+# Row IDs are a 12-digit base36 number: milliseconds in the first 9 digits, 3 more below them
+_ROW_ID_SUFFIXES = 36 ** 3
+_ROW_ID_LIMIT = 36 ** 12
+_BASE36_TRIPLES: List[str] = []
+
+class RowIdAllocator:
+    """
+    Monotonic row ID source: each millisecond starts at a random 3-char suffix and further IDs
+    in it count up, carrying into the next millisecond's range when a burst exhausts it. IDs
+    from one allocator therefore never repeat and sort in allocation order, without looking
+    at existing rows. observe() raises the floor past IDs that came from elsewhere.
+    """
+
+    def __init__(self, floor: Optional[str] = None):
+        self._last = -1
+        self._lock = threading.Lock()
+        # Encoded 9-char prefix of the most recent millisecond
+        self._ms = -1
+        self._prefix = ""
+        if not _BASE36_TRIPLES:
+            _BASE36_TRIPLES.extend([p + c for p in _BASE36_PAIRS for c in BASE36_ALPHABET])
+        if floor:
+            self.observe(floor)
+
+    def observe(self, row_id: str) -> None:
+        try:
+            value = int(row_id, 36)
+        except ValueError:
+            return
+        with self._lock:
+            if value > self._last:
+                self._last = value
+
+    def _start(self, count: int) -> int:
+        # Called with the lock held: first value of a block of `count`
+        now = int(time.time() * 1000) * _ROW_ID_SUFFIXES
+        # A random suffix only when the clock has moved past the last ID's millisecond
+        start = now + random.randrange(_ROW_ID_SUFFIXES) if now > self._last else self._last + 1
+        end = start + count
+        if end > _ROW_ID_LIMIT:
+            raise ValueError("Row ID space exhausted")
+        self._last = end - 1
+        return start
+
+    def next(self) -> str:
+        with self._lock:
+            ms, low = divmod(self._start(1), _ROW_ID_SUFFIXES)
+            if ms != self._ms:
+                self._ms = ms
+                self._prefix = _to_base36(ms, 9)
+            return self._prefix + _BASE36_TRIPLES[low]
+
+    def reserve(self, count: int) -> List[str]:
+        """
+        Allocates `count` consecutive IDs in one step.
+        """
+        if count <= 0:
+            return []
+        with self._lock:
+            start = self._start(count)
+        return _encode_row_ids(start, start + count)
+
+def _encode_row_ids(start: int, end: int) -> List[str]:
+    # The 9-char prefix is encoded once per millisecond; suffixes come from a lookup table
+    ids: List[str] = []
+    while start < end:
+        ms, low = divmod(start, _ROW_ID_SUFFIXES)
+        high = min(end - ms * _ROW_ID_SUFFIXES, _ROW_ID_SUFFIXES)
+        prefix = _to_base36(ms, 9)
+        ids.extend([prefix + suffix for suffix in _BASE36_TRIPLES[low:high]])
+        start = (ms + 1) * _ROW_ID_SUFFIXES
+    return ids
+
+def row_id_timestamp(row_id: str) -> int:
+    """
+    Creation time encoded in a row ID, in milliseconds since the epoch.
+    """
+    try:
+        return int(row_id[:9], 36)
+    except ValueError:
+        raise ValueError(f"Invalid row ID {row_id}")
+
+def row_id_created_at(row_id: str) -> datetime:
+    return datetime.fromtimestamp(row_id_timestamp(row_id) / 1000, tz=timezone.utc)
+
+def row_id_floor(when: Union[datetime, int, float]) -> str:
+    """
+    Smallest row ID created at `when` (a datetime or milliseconds since the epoch).
+    """
+    ms = int(when.timestamp() * 1000) if isinstance(when, datetime) else int(when)
+    return _to_base36(min(max(ms, 0), 36 ** 9 - 1), 9) + "000"
+
 def generate_col_id() -> str:
     return f"col_{random_3_char()}"
 
@@ -94,6 +189,15 @@ class AgentableRow(BaseModel):
     cells: Dict[str, Any] = {}
 
 
+_ROW_FIELDS = frozenset(("id", "cells"))
+
+
+def _construct_row(id: str, cells: Dict[str, Any]) -> AgentableRow:
+    # Trusted constructor for rows whose id and cells are already known to be valid;
+    # passing the fields set skips model_construct's default filling
+    return AgentableRow.model_construct(set(_ROW_FIELDS), id=id, cells=cells)
+
+
 class AgentableMetadata(BaseModel):
     title: str
     description: Optional[str] = None
@@ -116,3 +220,62 @@ class AgentableSchema(BaseModel):
     columns: List[AgentableColumn] = []
     views: List[AgentableView] = []
     rows: List[AgentableRow] = []
+
+
+# --- Trusted construction ---
+
+_ConstructPlan = List[Tuple[str, str, Optional[Type[BaseModel]], bool]]
+_construct_plans: Dict[Type[BaseModel], _ConstructPlan] = {}
+
+
+def _nested_model(annotation: Any) -> Tuple[Optional[Type[BaseModel]], bool]:
+    # Finds the model inside Optional[...] / List[...] annotations, and whether it is a list
+    origin = get_origin(annotation)
+    if origin is Union:
+        for arg in get_args(annotation):
+            if arg is not type(None):
+                return _nested_model(arg)
+        return None, False
+    if origin in (list, List):
+        model, _ = _nested_model(get_args(annotation)[0])
+        return model, True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+def _construct_plan(cls: Type[BaseModel]) -> _ConstructPlan:
+    plan = _construct_plans.get(cls)
+    if plan is None:
+        plan = []
+        for name, field in cls.model_fields.items():
+            model, many = _nested_model(field.annotation)
+            plan.append((name, field.alias or name, model, many))
+        _construct_plans[cls] = plan
+    return plan
+
+
+def _construct_model(cls: Type[BaseModel], data: Dict[str, Any]) -> BaseModel:
+    values = {}
+    for name, key, model, many in _construct_plan(cls):
+        if key in data:
+            value = data[key]
+        elif name in data:
+            value = data[name]
+        else:
+            continue
+        if model is not None and value is not None:
+            value = [_construct_model(model, v) for v in value] if many else _construct_model(model, value)
+        values[name] = value
+    return cls.model_construct(**values)
+
+
+def construct_agentable(data: Dict[str, Any]) -> AgentableSchema:
+    """
+    Builds an AgentableSchema from trusted data (e.g. a snapshot this library wrote) without
+    running validation. Row cell dicts are adopted as-is, not copied.
+    """
+    header = {k: v for k, v in data.items() if k != "rows"}
+    schema = _construct_model(AgentableSchema, header)
+    schema.rows = [_construct_row(r["id"], r.get("cells", {})) for r in data.get("rows", [])]
+    return schema  # type: ignore[return-value]
@@ -0,0 +1,222 @@
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Set
+
+# Blocks split when they grow past twice this size
+_BLOCK_SIZE = 512
+
+
+class _Block:
+    __slots__ = ("ids", "index")
+
+    def __init__(self, ids: List[str], index: int):
+        self.ids = ids
+        self.index = index
+
+
+class RowOrder:
+    """
+    Row IDs in display order, as a blocked list: runs of at most 2 * block_size IDs, each
+    row mapped to its block, and the blocks' start offsets refreshed lazily from the first
+    one that changed. Finding a row's position, inserting at a position and removing or
+    moving a row cost O(n / block_size + block_size) instead of rescanning the table, and
+    the scans that remain (offsets, list.index within a block) are short C-level loops.
+
+    The manager still keeps schema.rows as a plain list, so its row inserts, moves and
+    deletes stay O(n) overall. RowOrder removes the Python-level position scans; the list
+    shift that remains is a memmove (see benchmarks/bench_order.py).
+    """
+
+    def __init__(self, ids: Iterable[str] = (), block_size: int = _BLOCK_SIZE):
+        self._block_size = block_size
+        self.reset(ids)
+
+    def reset(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        size = self._block_size
+        self._blocks: List[_Block] = [_Block(ids[i:i + size], n) for n, i in enumerate(range(0, len(ids), size))]
+        self._block_of: Dict[str, _Block] = {}
+        for block in self._blocks:
+            self._block_of.update(dict.fromkeys(block.ids, block))
+        self._starts: List[int] = [0] * len(self._blocks)
+        # Blocks before this index have correct start offsets
+        self._valid = 0
+        self._len = len(ids)
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __contains__(self, row_id: object) -> bool:
+        return row_id in self._block_of
+
+    def __iter__(self) -> Iterator[str]:
+        for block in self._blocks:
+            yield from block.ids
+
+    def _settle(self, upto: int) -> None:
+        # Refreshes start offsets through block `upto`
+        starts = self._starts
+        blocks = self._blocks
+        i = self._valid
+        if i > upto:
+            return
+        offset = 0 if i == 0 else starts[i - 1] + len(blocks[i - 1].ids)
+        for i in range(i, min(upto + 1, len(blocks))):
+            starts[i] = offset
+            offset += len(blocks[i].ids)
+        self._valid = max(self._valid, min(upto + 1, len(blocks)))
+
+    def _touched(self, index: int) -> None:
+        # Starts after block `index` shifted
+        if index + 1 < self._valid:
+            self._valid = index + 1
+
+    def _renumber(self, start: int) -> None:
+        blocks = self._blocks
+        for i in range(start, len(blocks)):
+            blocks[i].index = i
+        del self._starts[len(blocks):]
+        self._starts.extend([0] * (len(blocks) - len(self._starts)))
+        if start < self._valid:
+            self._valid = start
+
+    def position(self, row_id: str) -> int:
+        """
+        Display position of a row; -1 if absent.
+        """
+        block = self._block_of.get(row_id)
+        if block is None:
+            return -1
+        self._settle(block.index)
+        return self._starts[block.index] + block.ids.index(row_id)
+
+    def in_order(self, row_ids: Iterable[str]) -> List[str]:
+        """
+        The given rows that are present, in display order. Blocks holding many of them are
+        filtered in one pass; the rest are located row by row.
+        """
+        groups: Dict[int, List[str]] = {}
+        block_of = self._block_of
+        for row_id in row_ids:
+            block = block_of.get(row_id)
+            if block is not None:
+                group = groups.get(block.index)
+                if group is None:
+                    groups[block.index] = [row_id]
+                else:
+                    group.append(row_id)
+        ordered: List[str] = []
+        blocks = self._blocks
+        for index in sorted(groups):
+            group = groups[index]
+            ids = blocks[index].ids
+            if len(group) * 16 < len(ids):
+                group.sort(key=ids.index)
+                ordered.extend(group)
+            else:
+                wanted = set(group)
+                ordered.extend([id for id in ids if id in wanted])
+        return ordered
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("row index out of range")
+        self._settle(len(self._blocks) - 1)
+        n = bisect_right(self._starts, index) - 1
+        return self._blocks[n].ids[index - self._starts[n]]
+
+    def insert(self, index: int, row_id: str) -> None:
+        """
+        Inserts before position `index`, clamped like list.insert.
+        """
+        if index < 0:
+            index = max(index + self._len, 0)
+        blocks = self._blocks
+        if not blocks:
+            block = _Block([], 0)
+            blocks.append(block)
+            self._starts.append(0)
+            n, offset = 0, 0
+        elif index >= self._len:
+            n = len(blocks) - 1
+            block = blocks[n]
+            offset = len(block.ids)
+        else:
+            self._settle(len(blocks) - 1)
+            n = bisect_right(self._starts, index) - 1
+            block = blocks[n]
+            offset = index - self._starts[n]
+        block.ids.insert(offset, row_id)
+        self._block_of[row_id] = block
+        self._len += 1
+        self._touched(n)
+        if len(block.ids) > 2 * self._block_size:
+            self._split(block)
+
+    def append(self, row_id: str) -> None:
+        self.insert(self._len, row_id)
+
+    def extend(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        size = self._block_size
+        blocks = self._blocks
+        i = 0
+        if blocks:
+            # Top up the last block, then add full ones
+            last = blocks[-1]
+            i = max(0, 2 * size - len(last.ids))
+            head = ids[:i]
+            last.ids.extend(head)
+            self._block_of.update(dict.fromkeys(head, last))
+            self._touched(last.index)
+        first = len(blocks)
+        for j in range(i, len(ids), size):
+            block = _Block(ids[j:j + size], len(blocks))
+            blocks.append(block)
+            self._block_of.update(dict.fromkeys(block.ids, block))
+        self._len += len(ids)
+        self._renumber(first)
+
+    def _split(self, block: _Block) -> None:
+        half = len(block.ids) // 2
+        tail = _Block(block.ids[half:], block.index + 1)
+        del block.ids[half:]
+        self._block_of.update(dict.fromkeys(tail.ids, tail))
+        self._blocks.insert(block.index + 1, tail)
+        self._renumber(block.index + 1)
+
+    def remove(self, row_id: str) -> None:
+        block = self._block_of.pop(row_id)
+        block.ids.remove(row_id)
+        self._len -= 1
+        self._touched(block.index)
+        if not block.ids:
+            del self._blocks[block.index]
+            self._renumber(block.index)
+
+    def remove_many(self, row_ids: Set[str]) -> None:
+        """
+        Removes the rows that are present, filtering each affected block once.
+        """
+        block_of = self._block_of
+        touched: Dict[int, _Block] = {}
+        for row_id in row_ids:
+            block = block_of.pop(row_id, None)
+            if block is not None:
+                touched[block.index] = block
+                self._len -= 1
+        if not touched:
+            return
+        for block in touched.values():
+            block.ids = [id for id in block.ids if id not in row_ids]
+        first = min(touched)
+        self._blocks = [block for block in self._blocks if block.ids]
+        self._renumber(first)
+
+    def move(self, row_id: str, index: int) -> None:
+        """
+        Same result as list.pop of the row followed by list.insert(index).
+        """
+        self.remove(row_id)
+        self.insert(index, row_id)
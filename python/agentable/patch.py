@@ -0,0 +1,188 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from .models import AgentableColumn, AgentableMetadata, AgentableSchema, AgentableView
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+Change = Tuple[str, str, Optional[str]]
+PatchOp = Dict[str, Any]
+
+_VIEW_CHANGES = ("view.add", "view.update", "view.filter.add", "view.filter.remove", "view.sort.add", "view.sort.remove")
+
+
+class ChangeTracker:
+    """
+    Records the (type, id, columnId) of every change after the first checkpoint so that
+    diff_since() only looks at what changed after a token. The log keeps at most `limit`
+    entries; a token older than that raises ValueError and the client needs a full copy.
+    """
+
+    def __init__(self, manager: "AgentableManager", limit: int = 1_000_000):
+        self.manager = manager
+        self.limit = limit
+        self._log: List[Change] = []
+        self._start = 0
+        manager.add_listener(self._on_change)
+
+    def _on_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        self._log.append((change["type"], change["id"], change.get("columnId")))
+        if len(self._log) > self.limit:
+            drop = len(self._log) // 2
+            del self._log[:drop]
+            self._start += drop
+
+    def checkpoint(self) -> int:
+        return self._start + len(self._log)
+
+    def changes_since(self, token: int) -> List[Change]:
+        if not isinstance(token, int) or token > self.checkpoint():
+            raise ValueError(f"Unknown checkpoint {token}")
+        if token < self._start:
+            raise ValueError(f"Checkpoint {token} has expired")
+        return self._log[token - self._start:]
+
+
+def _dump(model: Any) -> Dict[str, Any]:
+    return model.model_dump(mode="json", by_alias=True)
+
+
+def build_patch(manager: "AgentableManager", changes: List[Change]) -> List[PatchOp]:
+    """
+    Folds a run of changes into the smallest patch that takes a copy of the table from before
+    them to the manager's current state. Only entities named by the changes are read.
+
+    Ops address entities by ID: {"op": "add" | "remove" | "replace" | "move", "path": ...}
+    with paths /metadata, /columns/<id>, /views/<id>, /rows/<id>, /rows/<id>/cells and
+    /rows/<id>/cells/<columnId>. Row adds and moves carry the row's final "index".
+    """
+    metadata = False
+    columns: Dict[str, bool] = {}
+    views: Dict[str, bool] = {}
+    # Per touched row: added since the checkpoint, moved, whole cells replaced, single cells
+    added: Set[str] = set()
+    moved: Set[str] = set()
+    replaced: Set[str] = set()
+    cells: Dict[str, Dict[str, None]] = {}
+    rows: Dict[str, None] = {}
+
+    for change_type, id, column_id in changes:
+        if change_type.startswith("row.") or change_type == "cell.update":
+            rows[id] = None
+            if change_type == "row.add":
+                added.add(id)
+            elif change_type == "row.move":
+                moved.add(id)
+            elif change_type == "row.update":
+                replaced.add(id)
+            elif change_type == "cell.update":
+                cells.setdefault(id, {})[column_id] = None
+        elif change_type.startswith("column."):
+            # True when the column is new since the checkpoint
+            columns[id] = columns.get(id, False) or change_type == "column.add"
+        elif change_type in _VIEW_CHANGES:
+            views[id] = views.get(id, False) or change_type == "view.add"
+        elif change_type == "metadata.update":
+            metadata = True
+
+    patch: List[PatchOp] = []
+    if metadata:
+        patch.append({"op": "replace", "path": "/metadata", "value": _dump(manager._schema.metadata)})
+
+    for id, is_new in columns.items():
+        col = manager.get_column(id)
+        if col is None:
+            if not is_new:
+                patch.append({"op": "remove", "path": f"/columns/{id}"})
+        else:
+            patch.append({"op": "add" if is_new else "replace", "path": f"/columns/{id}", "value": _dump(col)})
+
+    for id, is_new in views.items():
+        view = manager.get_view(id)
+        if view is not None:
+            patch.append({"op": "add" if is_new else "replace", "path": f"/views/{id}", "value": _dump(view)})
+
+    placed: List[PatchOp] = []
+    for id in rows:
+        row = manager.get_row(id)
+        if row is None:
+            if id not in added:
+                patch.append({"op": "remove", "path": f"/rows/{id}"})
+            continue
+        if id in added:
+            value = {"id": id, "cells": dict(row.cells)}
+            placed.append({"op": "add", "path": f"/rows/{id}", "index": manager._row_position(id), "value": value})
+            continue
+        if id in replaced:
+            patch.append({"op": "replace", "path": f"/rows/{id}/cells", "value": dict(row.cells)})
+        elif id in cells:
+            for column_id in cells[id]:
+                # A cell can only disappear with its column, which the column ops cover
+                if column_id in row.cells:
+                    patch.append({"op": "replace", "path": f"/rows/{id}/cells/{column_id}", "value": row.cells[column_id]})
+        if id in moved:
+            placed.append({"op": "move", "path": f"/rows/{id}", "index": manager._row_position(id)})
+
+    # Adds and moves come last, by final position, so they can be replayed in order
+    placed.sort(key=lambda op: op["index"])
+    patch.extend(placed)
+    return patch
+
+
+def _split(path: str) -> List[str]:
+    parts = path.split("/")
+    if len(parts) < 2 or parts[0] != "":
+        raise ValueError(f"Invalid patch path {path}")
+    return parts[1:]
+
+
+def apply_patch(manager: "AgentableManager", patch: List[PatchOp]) -> None:
+    """
+    Applies a patch from build_patch through the manager's own operations, so listeners and
+    on_change see the edits like any other change.
+    """
+    moved: Optional[List[PatchOp]] = [op for op in patch if op["op"] == "move"]
+    for op in patch:
+        kind = op["op"]
+        parts = _split(op["path"])
+        section = parts[0]
+
+        if section == "metadata":
+            manager._put_metadata(AgentableMetadata.model_validate(op["value"]))
+        elif section == "columns":
+            if kind == "remove":
+                manager.delete_column(parts[1])
+            else:
+                manager._put_column(AgentableColumn.model_validate(op["value"]))
+        elif section == "views":
+            manager._put_view(AgentableView.model_validate(op["value"]))
+        elif section == "rows":
+            row_id = parts[1]
+            if len(parts) == 2:
+                if kind == "remove":
+                    manager.delete_row(row_id)
+                elif kind == "add":
+                    if moved is not None:
+                        _park(manager, moved)
+                        moved = None
+                    manager._insert_row(op["index"], row_id, dict(op["value"]["cells"]))
+                elif kind == "move":
+                    if moved is not None:
+                        _park(manager, moved)
+                        moved = None
+                    manager.move_row(row_id, op["index"])
+                else:
+                    raise ValueError(f"Unsupported patch operation {kind} on {op['path']}")
+            elif len(parts) == 3 and parts[2] == "cells":
+                manager.update_row(row_id, op["value"], validate=False)
+            elif len(parts) == 4 and parts[2] == "cells":
+                manager.set_cell(row_id, parts[3], op["value"], validate=False)
+            else:
+                raise ValueError(f"Invalid patch path {op['path']}")
+        else:
+            raise ValueError(f"Invalid patch path {op['path']}")
+
+
+def _park(manager: "AgentableManager", moved: List[PatchOp]) -> None:
+    # Moved rows go to the end first so inserting them by ascending final index is exact
+    for op in moved:
+        manager.move_row(_split(op["path"])[1], manager.row_count())
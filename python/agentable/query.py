@@ -0,0 +1,281 @@
+import heapq
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import AgentableColumn, AgentableFilter, AgentableRow, AgentableSort, AgentableView
+
+Predicate = Callable[[Dict[str, Any]], bool]
+SortKey = Callable[[Dict[str, Any]], Tuple[Any, ...]]
+
+
+# --- Value helpers ---
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def _as_number(value: Any) -> Optional[float]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    return None
+
+
+def _is_multi(col: Optional[AgentableColumn]) -> bool:
+    return bool(col and col.type == "select" and col.constraints and col.constraints.multiSelect)
+
+
+# --- Filters ---
+
+def compile_filter(flt: AgentableFilter, col: Optional[AgentableColumn]) -> Predicate:
+    """
+    Compiles a single view filter into a predicate over a row's cells,
+    specialised for the column type so no per-row type dispatch is needed.
+    """
+    cid = flt.columnId
+    op = flt.operator
+    target = flt.value
+    col_type = col.type if col else "text"
+
+    if op == "isEmpty":
+        return lambda cells: _is_empty(cells.get(cid))
+    if op == "isNotEmpty":
+        return lambda cells: not _is_empty(cells.get(cid))
+
+    if op in ("is", "isNot"):
+        negate = op == "isNot"
+        if _is_multi(col):
+            def match(cells: Dict[str, Any]) -> bool:
+                value = cells.get(cid)
+                return isinstance(value, list) and target in value
+        elif col_type == "number":
+            number = _as_number(target)
+            def match(cells: Dict[str, Any]) -> bool:
+                return number is not None and _as_number(cells.get(cid)) == number
+        elif col_type == "boolean":
+            flag = _as_bool(target)
+            def match(cells: Dict[str, Any]) -> bool:
+                return flag is not None and cells.get(cid) is flag
+        else:
+            def match(cells: Dict[str, Any]) -> bool:
+                return cells.get(cid) == target
+        if negate:
+            return lambda cells: not match(cells)
+        return match
+
+    if op in ("contains", "startsWith", "endsWith"):
+        needle = str(target).lower() if target is not None else ""
+        if op == "contains":
+            test: Callable[[str], bool] = lambda text: needle in text
+        elif op == "startsWith":
+            test = lambda text: text.startswith(needle)
+        else:
+            test = lambda text: text.endswith(needle)
+
+        def match(cells: Dict[str, Any]) -> bool:
+            value = cells.get(cid)
+            if _is_empty(value):
+                return False
+            if isinstance(value, list):
+                return any(test(str(v).lower()) for v in value)
+            return test(str(value).lower())
+        return match
+
+    if op in ("gt", "lt"):
+        greater = op == "gt"
+        if col_type == "number":
+            number = _as_number(target)
+            if number is None:
+                return lambda cells: False
+
+            def match(cells: Dict[str, Any]) -> bool:
+                value = _as_number(cells.get(cid))
+                if value is None:
+                    return False
+                return value > number if greater else value < number
+            return match
+        if col_type == "boolean" or _is_multi(col):
+            return lambda cells: False
+
+        # Text-like columns (including ISO dates) compare lexicographically
+        bound = str(target)
+
+        def match(cells: Dict[str, Any]) -> bool:
+            value = cells.get(cid)
+            if _is_empty(value):
+                return False
+            return str(value) > bound if greater else str(value) < bound
+        return match
+
+    raise ValueError(f"Unsupported filter operator {op}")
+
+
+def compile_predicate(filters: List[AgentableFilter], columns: Dict[str, AgentableColumn]) -> Optional[Predicate]:
+    """
+    Combines all filters of a view into one predicate. Returns None when the view has no filters.
+    """
+    predicates = [compile_filter(f, columns.get(f.columnId)) for f in filters]
+    if not predicates:
+        return None
+    if len(predicates) == 1:
+        return predicates[0]
+
+    def predicate(cells: Dict[str, Any]) -> bool:
+        for p in predicates:
+            if not p(cells):
+                return False
+        return True
+    return predicate
+
+
+# --- Sorts ---
+
+class _Descending:
+    """Inverts comparisons for non-numeric keys so mixed asc/desc sorts need only one sort call."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def __lt__(self, other: "_Descending") -> bool:
+        return other.value < self.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, _Descending) and self.value == other.value
+
+    def __hash__(self) -> int:
+        # Materialized views group rows by their (hashable) sort keys
+        return hash(self.value)
+
+
+def _compile_sort_part(sort: AgentableSort, col: AgentableColumn, invert: bool, null_key: Tuple[int, int]) -> Callable[[Dict[str, Any]], Tuple[int, Any]]:
+    # Every part is (0, value) or null_key, chosen so empty cells always sort last
+    cid = sort.columnId
+
+    if col.type == "number":
+        sign = -1.0 if invert else 1.0
+
+        def part(cells: Dict[str, Any]) -> Tuple[int, Any]:
+            value = _as_number(cells.get(cid))
+            return null_key if value is None else (0, sign * value)
+        return part
+
+    if col.type == "boolean":
+        def part(cells: Dict[str, Any]) -> Tuple[int, Any]:
+            value = cells.get(cid)
+            if not isinstance(value, bool):
+                return null_key
+            return (0, (not value) if invert else value)
+        return part
+
+    if _is_multi(col):
+        def normalise(value: Any) -> Any:
+            return tuple(str(v) for v in value) if isinstance(value, list) else (str(value),)
+    else:
+        normalise = str
+
+    def part(cells: Dict[str, Any]) -> Tuple[int, Any]:
+        value = cells.get(cid)
+        if _is_empty(value):
+            return null_key
+        key = normalise(value)
+        return (0, _Descending(key) if invert else key)
+    return part
+
+
+def compile_sort_key(sorts: List[AgentableSort], columns: Dict[str, AgentableColumn], allow_reverse: bool = True) -> Optional[Tuple[SortKey, bool]]:
+    """
+    Builds a single tuple-valued key for all sorts of a view, plus the `reverse` flag to sort with.
+    When every sort shares a direction the key is left uninverted and `reverse` does the work;
+    only mixed directions pay for per-value inversion. Pass allow_reverse=False to always get an
+    ascending key (e.g. for bisect). Returns None when nothing is sortable.
+    """
+    sorts = [s for s in sorts if s.columnId in columns]
+    if not sorts:
+        return None
+
+    reverse = allow_reverse and all(s.direction == "desc" for s in sorts)
+    # Under reverse=True the null marker must compare below every value to still land last
+    null_key = (-1, 0) if reverse else (1, 0)
+    parts = [
+        _compile_sort_part(s, columns[s.columnId], invert=not reverse and s.direction == "desc", null_key=null_key)
+        for s in sorts
+    ]
+    if len(parts) == 1:
+        only = parts[0]
+        return (lambda cells: (only(cells),)), reverse
+    return (lambda cells: tuple([p(cells) for p in parts])), reverse
+
+
+# --- Projection ---
+
+def visible_columns(view: AgentableView, columns: List[AgentableColumn]) -> List[str]:
+    """
+    Column IDs shown by a view: columnOrder first, then any columns it does not mention,
+    minus hiddenColumns.
+    """
+    existing = [c.id for c in columns]
+    known = set(existing)
+    hidden = set(view.hiddenColumns)
+    ordered = [cid for cid in dict.fromkeys(view.columnOrder) if cid in known]
+    listed = set(ordered)
+    ordered.extend(cid for cid in existing if cid not in listed)
+    return [cid for cid in ordered if cid not in hidden]
+
+
+def project_row(row: AgentableRow, column_ids: List[str]) -> Dict[str, Any]:
+    cells = row.cells
+    return {"id": row.id, "cells": {cid: cells[cid] for cid in column_ids if cid in cells}}
+
+
+# --- Execution ---
+
+def execute_view(
+    view: AgentableView,
+    columns: List[AgentableColumn],
+    rows: Iterable[AgentableRow],
+    limit: Optional[int] = None,
+    offset: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Evaluates a view over rows (in display order), returning a lazy iterator of projected
+    rows ({"id", "cells"}) restricted to the view's visible columns.
+    """
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("limit and offset must be non-negative")
+
+    by_id = {c.id: c for c in columns}
+    predicate = compile_predicate(view.filters, by_id)
+    sorting = compile_sort_key(view.sorts, by_id)
+    column_ids = visible_columns(view, columns)
+
+    matched: Iterable[AgentableRow] = rows
+    if predicate is not None:
+        matched = (r for r in rows if predicate(r.cells))
+
+    if sorting is not None:
+        sort_key, reverse = sorting
+        key = lambda r: sort_key(r.cells)
+        if limit is not None:
+            # Both are stable and avoid sorting rows past the requested page
+            pick = heapq.nlargest if reverse else heapq.nsmallest
+            ordered: Iterable[AgentableRow] = pick(offset + limit, matched, key=key)
+        else:
+            ordered = sorted(matched, key=key, reverse=reverse)
+        matched = ordered
+
+    end = None if limit is None else offset + limit
+    return (project_row(r, column_ids) for r in islice(matched, offset, end))
@@ -0,0 +1,262 @@
+import json
+import mmap
+import struct
+import sys
+from array import array
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Union
+from .models import AgentableRow, AgentableSchema, _construct_row, construct_agentable
+from .stream import AgentableStreamWriter
+
+# Fixed header: magic, format version, row count, then offset/length of the ID segment,
+# the sorted ID index and the JSON header (schema without rows plus the column directory)
+_MAGIC = b"AGTBSNP\x00"
+_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQQQQ")
+_ID_LENGTH = 12
+_encode = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+
+def _align(fp: IO[bytes]) -> int:
+    # Segments start on 8-byte boundaries so they can be viewed as native arrays in place
+    pos = fp.tell()
+    pad = -pos % 8
+    if pad:
+        fp.write(b"\0" * pad)
+    return pos + pad
+
+
+def _write_array(fp: IO[bytes], values: array) -> int:
+    offset = _align(fp)
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    fp.write(values.tobytes())
+    return offset
+
+
+def write_snapshot(fp: IO[bytes], header: Union[AgentableSchema, Dict[str, Any]], rows: Iterable[Union[AgentableRow, Dict[str, Any]]]) -> int:
+    """
+    Writes a binary snapshot to a binary file handle and returns the number of rows written.
+
+    Each cell key gets its own segment: a u64 offsets array (one entry per row, plus one)
+    into a blob of comma-terminated compact JSON values, so a cell is located in O(1) and
+    decoded on its own. Absent cells are zero-length; null is stored as "null", keeping the
+    two apart.
+    """
+    if isinstance(header, AgentableSchema):
+        meta = header.model_dump(mode="json", by_alias=True, exclude={"rows"})
+    else:
+        meta = {k: v for k, v in header.items() if k != "rows"}
+
+    ids = bytearray()
+    offsets: Dict[str, array] = {}
+    blobs: Dict[str, bytearray] = {}
+    count = 0
+    for row in rows:
+        if isinstance(row, AgentableRow):
+            row_id, cells = row.id, row.cells
+        else:
+            row_id, cells = row["id"], row.get("cells", {})
+        encoded_id = row_id.encode("ascii")
+        if len(encoded_id) != _ID_LENGTH:
+            raise ValueError(f"Row ID {row_id} is not {_ID_LENGTH} characters")
+        ids += encoded_id
+        for key, value in cells.items():
+            blob = blobs.get(key)
+            if blob is None:
+                blob = blobs[key] = bytearray()
+                # Rows before this one have no value for the new key
+                offsets[key] = array("Q", [0]) * (count + 1)
+            # The trailing comma lets a whole column be decoded as one JSON array
+            blob += _encode(value).encode("utf-8") + b","
+        count += 1
+        for key, blob in blobs.items():
+            offsets[key].append(len(blob))
+    sorted_positions = array("I", sorted(range(count), key=lambda i: ids[i * _ID_LENGTH:(i + 1) * _ID_LENGTH]))
+
+    fp.write(b"\0" * _HEADER.size)
+    ids_offset = _align(fp)
+    fp.write(ids)
+    index_offset = _write_array(fp, sorted_positions)
+    directory = []
+    for key, blob in blobs.items():
+        offsets_at = _write_array(fp, offsets[key])
+        data_at = fp.tell()
+        fp.write(blob)
+        directory.append({"key": key, "offsets": offsets_at, "data": data_at})
+    json_offset = fp.tell()
+    body = _encode({"schema": meta, "cells": directory}).encode("utf-8")
+    fp.write(body)
+    end = fp.tell()
+    fp.seek(0)
+    fp.write(_HEADER.pack(_MAGIC, _VERSION, 0, count, ids_offset, index_offset, json_offset, len(body)))
+    fp.seek(end)
+    return count
+
+
+class AgentableSnapshot:
+    """
+    A binary snapshot opened through mmap. Opening reads only the fixed header and the schema,
+    so it takes the same time for any row count; rows and cells are decoded when accessed.
+    `header` is the table without rows.
+    """
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError("Invalid AGENTABLE snapshot: empty file")
+        magic, version, _, count, ids_offset, index_offset, json_offset, json_length = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError("Invalid AGENTABLE snapshot: bad magic")
+        if version != _VERSION:
+            self.close()
+            raise ValueError(f"Unsupported AGENTABLE snapshot version {version}")
+        body = json.loads(self._mm[json_offset:json_offset + json_length].decode("utf-8"))
+        self._meta: Dict[str, Any] = body["schema"]
+        self.header: AgentableSchema = construct_agentable({**self._meta, "rows": []})
+        self._count = count
+        view = memoryview(self._mm)
+        self._ids = view[ids_offset:ids_offset + count * _ID_LENGTH]
+        self._index = self._array(view, index_offset, count, "I")
+        self._cells = [
+            (entry["key"], self._array(view, entry["offsets"], count + 1, "Q"), entry["data"])
+            for entry in body["cells"]
+        ]
+        self._cells_by_key = {key: (offsets, data) for key, offsets, data in self._cells}
+        self._decode = json.JSONDecoder().decode
+
+    @staticmethod
+    def _array(view: memoryview, offset: int, length: int, typecode: str) -> Any:
+        size = struct.calcsize(typecode)
+        segment = view[offset:offset + length * size]
+        if sys.byteorder == "little":
+            return segment.cast(typecode)
+        # Big-endian hosts pay for one copy instead of viewing the segment in place
+        values = array(typecode, segment.tobytes())
+        values.byteswap()
+        return values
+
+    def close(self) -> None:
+        # Views into the map must be released before it can be closed
+        for attr in ("_ids", "_index"):
+            value = getattr(self, attr, None)
+            if isinstance(value, memoryview):
+                value.release()
+        for _, offsets, _ in getattr(self, "_cells", []):
+            if isinstance(offsets, memoryview):
+                offsets.release()
+        self._cells = []
+        self._cells_by_key = {}
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "AgentableSnapshot":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    # --- Lazy access ---
+
+    def __len__(self) -> int:
+        return self._count
+
+    def row_id(self, index: int) -> str:
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        return bytes(self._ids[index * _ID_LENGTH:(index + 1) * _ID_LENGTH]).decode("ascii")
+
+    def cells(self, index: int) -> Dict[str, Any]:
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        mm = self._mm
+        decode = self._decode
+        cells = {}
+        for key, offsets, data in self._cells:
+            start, end = offsets[index], offsets[index + 1]
+            if start != end:
+                cells[key] = decode(mm[data + start:data + end - 1].decode("utf-8"))
+        return cells
+
+    def cell(self, index: int, key: str) -> Any:
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        segment = self._cells_by_key.get(key)
+        if segment is None:
+            return None
+        offsets, data = segment
+        start, end = offsets[index], offsets[index + 1]
+        return None if start == end else self._decode(self._mm[data + start:data + end - 1].decode("utf-8"))
+
+    def row(self, index: int) -> AgentableRow:
+        return _construct_row(self.row_id(index), self.cells(index))
+
+    def index_of(self, row_id: str) -> int:
+        """
+        Display position of a row, found by binary search over the sorted ID index; -1 if absent.
+        """
+        target = row_id.encode("ascii")
+        ids = self._ids
+        index = self._index
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = index[mid]
+            if bytes(ids[pos * _ID_LENGTH:(pos + 1) * _ID_LENGTH]) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            pos = index[lo]
+            if bytes(ids[pos * _ID_LENGTH:(pos + 1) * _ID_LENGTH]) == target:
+                return pos
+        return -1
+
+    def get_row(self, row_id: str) -> Optional[AgentableRow]:
+        index = self.index_of(row_id)
+        return None if index == -1 else self.row(index)
+
+    def __iter__(self) -> Iterator[AgentableRow]:
+        for index in range(self._count):
+            yield self.row(index)
+
+    # --- Full conversion ---
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        The table as standard Agentable JSON data (header members in their stored form).
+        """
+        count = self._count
+        ids = bytes(self._ids).decode("ascii")
+        rows = [{"id": ids[i * _ID_LENGTH:(i + 1) * _ID_LENGTH], "cells": {}} for i in range(count)]
+        mm = self._mm
+        for key, offsets, data in self._cells:
+            size = offsets[count]
+            if not size:
+                continue
+            # One decode call per column instead of one per cell
+            values = iter(self._decode("[" + mm[data:data + size - 1].decode("utf-8") + "]"))
+            bounds = offsets.tolist()
+            for i in range(count):
+                if bounds[i] != bounds[i + 1]:
+                    rows[i]["cells"][key] = next(values)
+        return {**self._meta, "rows": rows}
+
+    def to_agentable(self) -> AgentableSchema:
+        return construct_agentable(self.to_dict())
+
+    def write_json(self, fp: IO[str]) -> int:
+        with AgentableStreamWriter(fp, self._meta) as writer:
+            for index in range(self._count):
+                writer.write_row({"id": self.row_id(index), "cells": self.cells(index)})
+            return self._count
+
+
+def open_snapshot(path: str) -> AgentableSnapshot:
+    return AgentableSnapshot(path)
@@ -0,0 +1,387 @@
+import json
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+from .models import AgentableColumn, AgentableSchema
+from .query import _as_bool, _as_number, _is_empty, _is_multi
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+AGGREGATE_OPS = ("count", "nulls", "distinct", "sum", "mean", "min", "max", "histogram", "summary")
+
+# Row key of an empty cell; never stored in the value counts
+_EMPTY: Any = object()
+
+# Finite floats are whole multiples of 2**-1074, so sums kept as integer multiples of it are
+# exact: no rounding error builds up however many edits come and go
+_SUM_SHIFT = 1074
+_SUM_UNIT = 1 << _SUM_SHIFT
+
+
+def _fixed(number: float) -> int:
+    numerator, denominator = number.as_integer_ratio()
+    return numerator << (_SUM_SHIFT + 1 - denominator.bit_length())
+
+
+def _freeze(value: Any) -> Any:
+    # Hashable stand-in for a cell value: lists become tuples, anything else unhashable its JSON
+    if isinstance(value, list):
+        value = tuple(value)
+    try:
+        hash(value)
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
+
+
+def _add(counts: Dict[Any, int], key: Any) -> bool:
+    # True when the key is new
+    n = counts.get(key, 0)
+    counts[key] = n + 1
+    return not n
+
+
+def _discard(counts: Dict[Any, int], key: Any) -> bool:
+    # True when the last occurrence of the key went away
+    n = counts[key] - 1
+    if n:
+        counts[key] = n
+        return False
+    del counts[key]
+    return True
+
+
+def select_histogram(column: AgentableColumn, counts: Dict[Any, int]) -> Dict[Any, int]:
+    # Select columns list every option in order, unused ones with 0, then any other values
+    constraints = column.constraints
+    if column.type == "select" and constraints and constraints.options:
+        result = {option.value: counts.get(option.value, 0) for option in constraints.options}
+        result.update((key, n) for key, n in counts.items() if key not in result)
+        return result
+    return dict(counts)
+
+
+class ColumnSummary:
+    """
+    Running statistics of one column over a set of rows, kept by value counts: row add, edit
+    and delete cost O(1), and so do count, nulls, distinct, sum and mean. min and max are
+    cached and only recomputed (O(distinct values)) after the current extreme is removed.
+
+    Number cells count by numeric value, so "5" and 5 are one value; boolean cells by truth
+    value. multiSelect cells count once per selected combination, and their histogram once
+    per selected option.
+    """
+
+    def __init__(self, column: AgentableColumn):
+        self._reset(column)
+
+    def _reset(self, column: AgentableColumn) -> None:
+        self.column = column
+        self.column_id = column.id
+        self._multi = _is_multi(column)
+        # Row ID -> its key (_EMPTY for empty cells), for every row in the set
+        self._keys: Dict[str, Any] = {}
+        self._counts: Dict[Any, int] = {}
+        self._options: Dict[Any, int] = {}
+        self._nulls = 0
+        self._numbers = 0
+        # Exact sum of the finite numbers (in units of 2**-1074) and counts of inf, -inf and NaN
+        self._sum = 0
+        self._nonfinite = [0, 0, 0]
+        self._bounds: Optional[Tuple[Any, Any]] = None
+        self._bounds_valid = True
+
+    @property
+    def rows(self) -> int:
+        return len(self._keys)
+
+    def _key(self, value: Any) -> Any:
+        if _is_empty(value):
+            return _EMPTY
+        column_type = self.column.type
+        if column_type == "number":
+            number = _as_number(value)
+            # NaN would never equal itself as a key
+            if number is not None and number == number:
+                return number
+        elif column_type == "boolean":
+            flag = _as_bool(value)
+            if flag is not None:
+                return flag
+        return _freeze(value)
+
+    def _orderable(self, key: Any) -> bool:
+        # min/max range over the values of the column's own type
+        column_type = self.column.type
+        if column_type == "number":
+            return isinstance(key, float)
+        if column_type == "boolean":
+            return isinstance(key, bool)
+        return isinstance(key, str)
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        """
+        Re-counts a row from its current cells; None removes it from the set.
+        """
+        key = None if cells is None else self._key(cells.get(self.column_id))
+        old = self._keys.get(row_id)
+        if old is not None:
+            if key is not None and old == key and type(old) is type(key):
+                return
+            del self._keys[row_id]
+            self._remove(old)
+        if key is not None:
+            self._keys[row_id] = key
+            self._insert(key)
+
+    def _insert(self, key: Any) -> None:
+        if key is _EMPTY:
+            self._nulls += 1
+            return
+        _add(self._counts, key)
+        if self._multi and isinstance(key, tuple):
+            for option in key:
+                _add(self._options, _freeze(option))
+        if isinstance(key, float):
+            self._numbers += 1
+            self._add_number(key, 1)
+        if self._bounds_valid and self._orderable(key):
+            if self._bounds is None:
+                self._bounds = (key, key)
+            else:
+                low, high = self._bounds
+                self._bounds = (min(low, key), max(high, key))
+
+    def _remove(self, key: Any) -> None:
+        if key is _EMPTY:
+            self._nulls -= 1
+            return
+        gone = _discard(self._counts, key)
+        if self._multi and isinstance(key, tuple):
+            for option in key:
+                _discard(self._options, _freeze(option))
+        if isinstance(key, float):
+            self._numbers -= 1
+            self._add_number(key, -1)
+        if gone and self._bounds is not None and key in self._bounds:
+            self._bounds_valid = False
+
+    def _add_number(self, key: float, sign: int) -> None:
+        if key - key == 0:
+            self._sum += sign * _fixed(key)
+        else:
+            self._nonfinite[0 if key > 0 else 1 if key < 0 else 2] += sign
+
+    def rebuild(self, column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self._reset(column)
+        for row_id, cells in rows:
+            self.update(row_id, cells)
+
+    # --- Statistics ---
+
+    def count(self) -> int:
+        return len(self._keys) - self._nulls
+
+    def nulls(self) -> int:
+        return self._nulls
+
+    def distinct(self) -> int:
+        return len(self._counts)
+
+    def sum(self) -> float:
+        positive, negative, nan = self._nonfinite
+        if nan or (positive and negative):
+            return float("nan")
+        if positive or negative:
+            return float("inf") if positive else float("-inf")
+        # Integer division rounds correctly, so this is the exact sum's nearest float
+        try:
+            return self._sum / _SUM_UNIT
+        except OverflowError:
+            return float("inf") if self._sum > 0 else float("-inf")
+
+    def mean(self) -> Optional[float]:
+        if not self._numbers:
+            return None
+        if any(self._nonfinite):
+            return self.sum() / self._numbers
+        # The mean of finite floats is a finite float even when their sum is not
+        return self._sum / (_SUM_UNIT * self._numbers)
+
+    def _extremes(self) -> Optional[Tuple[Any, Any]]:
+        if not self._bounds_valid:
+            keys = [key for key in self._counts if self._orderable(key)]
+            self._bounds = (min(keys), max(keys)) if keys else None
+            self._bounds_valid = True
+        return self._bounds
+
+    def min(self) -> Any:
+        bounds = self._extremes()
+        return None if bounds is None else bounds[0]
+
+    def max(self) -> Any:
+        bounds = self._extremes()
+        return None if bounds is None else bounds[1]
+
+    def histogram(self) -> Dict[Any, int]:
+        """
+        Rows per value. Select columns list every option in order, unused ones with 0, then
+        any values outside the options.
+        """
+        return select_histogram(self.column, self._options if self._multi else self._counts)
+
+    def summary(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {"count": self.count(), "nulls": self.nulls(), "distinct": self.distinct()}
+        column_type = self.column.type
+        if column_type == "number":
+            result.update(sum=self.sum(), mean=self.mean(), min=self.min(), max=self.max())
+        elif column_type in ("select", "boolean"):
+            result["histogram"] = self.histogram()
+        elif not self._multi:
+            result.update(min=self.min(), max=self.max())
+        return result
+
+    def value(self, op: str) -> Any:
+        if op not in AGGREGATE_OPS:
+            raise ValueError(f"Unknown aggregate {op}")
+        if op in ("sum", "mean") and self.column.type != "number":
+            raise ValueError(f"Unsupported aggregate {op} for column {self.column_id}")
+        return getattr(self, op)()
+
+
+class GroupedSummary:
+    """
+    ColumnSummary of a column per value of another (the group column), maintained the same
+    way. A row with an empty group cell falls in group None; multiSelect group cells put the
+    row in the group of each selected option.
+    """
+
+    def __init__(self, column: AgentableColumn, group_column: AgentableColumn):
+        self._reset(column, group_column)
+
+    def _reset(self, column: AgentableColumn, group_column: AgentableColumn) -> None:
+        self.column = column
+        self.group_column = group_column
+        self._group_key = ColumnSummary(group_column)._key
+        self._groups: Dict[Any, ColumnSummary] = {}
+        self._rows: Dict[str, Tuple[Any, ...]] = {}
+
+    def _row_groups(self, cells: Dict[str, Any]) -> Tuple[Any, ...]:
+        key = self._group_key(cells.get(self.group_column.id))
+        if key is _EMPTY:
+            return (None,)
+        if _is_multi(self.group_column) and isinstance(key, tuple):
+            return tuple(dict.fromkeys(_freeze(option) for option in key))
+        return (key,)
+
+    def update(self, row_id: str, cells: Optional[Dict[str, Any]]) -> None:
+        groups = () if cells is None else self._row_groups(cells)
+        for group in self._rows.pop(row_id, ()):
+            if group not in groups:
+                summary = self._groups[group]
+                summary.update(row_id, None)
+                if not summary.rows:
+                    del self._groups[group]
+        for group in groups:
+            summary = self._groups.get(group)
+            if summary is None:
+                summary = self._groups[group] = ColumnSummary(self.column)
+            summary.update(row_id, cells)
+        if groups:
+            self._rows[row_id] = groups
+
+    def rebuild(self, column: AgentableColumn, group_column: AgentableColumn, rows: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        self._reset(column, group_column)
+        for row_id, cells in rows:
+            self.update(row_id, cells)
+
+    def value(self, op: str) -> Dict[Any, Any]:
+        return {group: summary.value(op) for group, summary in self._groups.items()}
+
+    def rows(self) -> Dict[Any, int]:
+        return {group: summary.rows for group, summary in self._groups.items()}
+
+
+class ColumnStatistics:
+    """
+    A manager's column summaries, each built by one scan on first request and then kept
+    current from the change stream like the secondary indexes: cell and row edits re-count
+    only the touched row, column changes rebuild (or, on delete, drop) the summaries using
+    that column.
+    """
+
+    def __init__(self, manager: "AgentableManager"):
+        self.manager = manager
+        # (column ID, group column ID or None) -> summary
+        self._summaries: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._lock = threading.RLock()
+        manager.add_listener(self._on_change)
+
+    def close(self) -> None:
+        self.manager.remove_listener(self._on_change)
+
+    def _rows(self) -> Iterable[Tuple[str, Dict[str, Any]]]:
+        return ((row.id, row.cells) for row in self.manager.iter_rows())
+
+    def _column(self, column_id: str) -> AgentableColumn:
+        column = self.manager.get_column(column_id)
+        if not column:
+            raise ValueError(f"Column {column_id} not found")
+        return column
+
+    def summary(self, column_id: str, group_by: Optional[str] = None) -> Any:
+        with self._lock:
+            summary = self._summaries.get((column_id, group_by))
+            if summary is None:
+                column = self._column(column_id)
+                if group_by is None:
+                    summary = ColumnSummary(column)
+                    summary.rebuild(column, self._rows())
+                else:
+                    group_column = self._column(group_by)
+                    summary = GroupedSummary(column, group_column)
+                    summary.rebuild(column, group_column, self._rows())
+                self._summaries[(column_id, group_by)] = summary
+            return summary
+
+    def aggregate(self, column_id: Optional[str], op: str, group_by: Optional[str] = None) -> Any:
+        with self._lock:
+            if column_id is None:
+                if op != "count":
+                    raise ValueError(f"Aggregate {op} needs a column")
+                if group_by is None:
+                    return self.manager.row_count()
+                return self.summary(group_by, group_by).rows()
+            return self.summary(column_id, group_by).value(op)
+
+    def _on_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        if not self._summaries:
+            return
+        change_type = change["type"]
+        if change_type == "cell.update":
+            summaries: List[Any] = [s for key, s in self._summaries.items() if change["columnId"] in key]
+            if not summaries:
+                return
+        elif change_type in ("row.add", "row.update", "row.delete"):
+            summaries = list(self._summaries.values())
+        elif change_type in ("column.update", "column.delete"):
+            column_id = change["id"]
+            with self._lock:
+                for key in [key for key in self._summaries if column_id in key]:
+                    if change_type == "column.delete":
+                        del self._summaries[key]
+                        continue
+                    summary = self._summaries[key]
+                    if isinstance(summary, GroupedSummary):
+                        summary.rebuild(self._column(key[0]), self._column(summary.group_column.id), self._rows())
+                    else:
+                        summary.rebuild(self._column(key[0]), self._rows())
+            return
+        else:
+            return
+        row_id = change["id"]
+        row = self.manager.get_row(row_id)
+        cells = None if row is None else row.cells
+        with self._lock:
+            for summary in summaries:
+                summary.update(row_id, cells)
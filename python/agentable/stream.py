@@ -0,0 +1,223 @@
+import codecs
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, Optional, Tuple, Union
+from .models import AgentableRow, AgentableSchema
+
+_WHITESPACE = " \t\n\r"
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+# Header members that must be known before rows can be yielded in a single pass
+_HEADER_KEYS = ("version", "metadata", "columns", "views")
+
+
+class _JsonCursor:
+    """
+    Incremental reader over a JSON document: decodes one value at a time with
+    json.JSONDecoder.raw_decode, pulling more text from the handle only when needed.
+    """
+
+    def __init__(self, fp: IO[Any], chunk_size: int):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.fp.read(self.chunk_size)
+        if isinstance(chunk, bytes):
+            chunk = self._utf8.decode(chunk, final=not chunk)
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos > self.chunk_size:
+            # Drop consumed text so memory stays bounded by the largest single value
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                raise ValueError("Invalid AGENTABLE JSON: unexpected end of input")
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"Invalid AGENTABLE JSON: expected '{char}' at offset {self.pos}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A value touching the end of the buffer (e.g. a number) may continue in the next chunk
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Yields the keys of the object starting at the cursor, leaving it on each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ValueError("Invalid AGENTABLE JSON: object keys must be strings")
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def elements(self) -> Iterator[Any]:
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+class AgentableStreamReader:
+    """
+    Reads a .table.json file incrementally: `header` is the validated table without rows,
+    and iterating the reader yields validated AgentableRow objects one at a time.
+
+    If "rows" comes before the version, metadata, columns or views in the file, a seekable handle
+    is read twice (the first pass skips over the rows); a non-seekable one is read once and
+    members found after the rows are merged into `header` when iteration finishes (until then
+    `header` is None if required members are still missing).
+    """
+
+    def __init__(self, fp: IO[Any], chunk_size: int = 1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self._start = fp.tell() if fp.seekable() else None
+        self._data: Dict[str, Any] = {}
+        self._pending: Optional[Tuple[_JsonCursor, Iterator[str]]] = None
+        self._has_rows = False
+        self.header: Optional[AgentableSchema] = self._read_header()
+
+    def _read_header(self) -> Optional[AgentableSchema]:
+        cursor = _JsonCursor(self.fp, self.chunk_size)
+        keys = cursor.members()
+        data = self._data
+        for key in keys:
+            if key != "rows":
+                data[key] = cursor.value()
+                continue
+            self._has_rows = True
+            if all(k in data for k in _HEADER_KEYS) or self._start is None:
+                # The cursor now sits on the rows array; iteration resumes from here
+                self._pending = (cursor, keys)
+                break
+            for _ in cursor.elements():
+                pass
+        if self._pending is not None and not all(k in data for k in ("version", "metadata")):
+            return None
+        return self._build_header()
+
+    def _build_header(self) -> AgentableSchema:
+        return AgentableSchema(**{**self._data, "rows": []})
+
+    def _rows_cursor(self) -> Tuple[_JsonCursor, Optional[Iterator[str]]]:
+        if self._pending is not None:
+            cursor, keys = self._pending
+            self._pending = None
+            return cursor, keys
+        if self._start is None:
+            raise ValueError("Rows have already been consumed from a non-seekable stream")
+        self.fp.seek(self._start)
+        cursor = _JsonCursor(self.fp, self.chunk_size)
+        for key in cursor.members():
+            if key == "rows":
+                break
+            cursor.value()
+        return cursor, None
+
+    def __iter__(self) -> Iterator[AgentableRow]:
+        if not self._has_rows:
+            return
+        cursor, keys = self._rows_cursor()
+        validate = AgentableRow.model_validate
+        for data in cursor.elements():
+            yield validate(data)
+        if keys is not None:
+            trailing = {key: cursor.value() for key in keys}
+            if trailing:
+                self._data.update(trailing)
+                self.header = self._build_header()
+
+
+class AgentableStreamWriter:
+    """
+    Writes a .table.json file row by row: the header (everything but rows) first, then each row
+    as it is given, so the whole table never needs to exist as one dict.
+    """
+
+    def __init__(self, fp: IO[str], header: Union[AgentableSchema, Dict[str, Any]]):
+        self.fp = fp
+        if isinstance(header, AgentableSchema):
+            data = header.model_dump(mode="json", by_alias=True, exclude={"rows"})
+        else:
+            data = {k: v for k, v in header.items() if k != "rows"}
+        body = _encode(data)
+        # Reopen the header object to append the rows array
+        fp.write(body[:-1] + (', ' if len(data) else '') + '"rows": [')
+        self._count = 0
+        self._closed = False
+
+    def write_row(self, row: Union[AgentableRow, Dict[str, Any]]) -> None:
+        if isinstance(row, AgentableRow):
+            data = {"id": row.id, "cells": row.cells}
+        else:
+            data = row
+        self.fp.write(("\n" if self._count == 0 else ",\n") + _encode(data))
+        self._count += 1
+
+    def write_rows(self, rows: Iterable[Union[AgentableRow, Dict[str, Any]]]) -> None:
+        for row in rows:
+            self.write_row(row)
+
+    def close(self) -> None:
+        if not self._closed:
+            self.fp.write("\n]}\n" if self._count else "]}\n")
+            self._closed = True
+
+    def __enter__(self) -> "AgentableStreamWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def write_agentable(fp: IO[str], header: Union[AgentableSchema, Dict[str, Any]], rows: Iterable[Union[AgentableRow, Dict[str, Any]]]) -> int:
+    """
+    Streams a complete table to fp and returns the number of rows written.
+    """
+    with AgentableStreamWriter(fp, header) as writer:
+        writer.write_rows(rows)
+        return writer._count
@@ -0,0 +1,84 @@
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set
+from .models import AgentableSchema
+
+if TYPE_CHECKING:
+    from .manager import AgentableManager
+
+
+class RowIdIndex:
+    """
+    The manager's row IDs in sorted order, which is creation order since IDs start with their
+    creation time. It is kept up to date from the change stream and does not depend on
+    display order, so move_row leaves it untouched.
+
+    New IDs sort after existing ones and are appended. Deleted IDs are set aside and skipped
+    by reads, and the list is compacted once they make up half of it, so bulk deletes stay
+    O(1) per row.
+    """
+
+    def __init__(self, manager: "AgentableManager"):
+        self.manager = manager
+        self._ids: List[str] = sorted(row.id for row in manager.iter_rows())
+        self._deleted: Set[str] = set()
+        manager.add_listener(self._on_change)
+
+    def close(self) -> None:
+        self.manager.remove_listener(self._on_change)
+
+    def _contains(self, row_id: str) -> bool:
+        ids = self._ids
+        index = bisect_left(ids, row_id)
+        return index < len(ids) and ids[index] == row_id
+
+    def _on_change(self, schema: AgentableSchema, change: Dict[str, Any]) -> None:
+        change_type = change["type"]
+        if change_type == "row.add":
+            row_id = change["id"]
+            if row_id in self._deleted:
+                # Re-added before compaction: the ID is still in the list
+                self._deleted.discard(row_id)
+            elif not self._ids or row_id > self._ids[-1]:
+                self._ids.append(row_id)
+            else:
+                insort(self._ids, row_id)
+        elif change_type == "row.delete":
+            row_id = change["id"]
+            if row_id not in self._deleted and self._contains(row_id):
+                self._deleted.add(row_id)
+                if len(self._deleted) * 2 > len(self._ids):
+                    deleted = self._deleted
+                    self._ids = [id for id in self._ids if id not in deleted]
+                    self._deleted = set()
+
+    # --- Reading ---
+
+    def __len__(self) -> int:
+        return len(self._ids) - len(self._deleted)
+
+    def between(self, start: Optional[str] = None, end: Optional[str] = None) -> List[str]:
+        """
+        IDs in [start, end), oldest first; None leaves that side open.
+        """
+        ids = self._ids
+        lo = 0 if start is None else bisect_left(ids, start)
+        hi = len(ids) if end is None else bisect_left(ids, end)
+        found = ids[lo:hi]
+        if self._deleted:
+            deleted = self._deleted
+            found = [id for id in found if id not in deleted]
+        return found
+
+    def latest(self, n: int) -> List[str]:
+        """
+        The n newest IDs, newest first.
+        """
+        found: List[str] = []
+        deleted = self._deleted
+        for index in range(len(self._ids) - 1, -1, -1):
+            if len(found) >= n:
+                break
+            row_id = self._ids[index]
+            if row_id not in deleted:
+                found.append(row_id)
+        return found
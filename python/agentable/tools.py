@@ -1,29 +1,184 @@
-from typing import Any, Dict, List, Type, Optional
+import base64
+import hashlib
+import heapq
+import json
+from functools import lru_cache
+from typing import Any, Dict, List, Type, Optional, Tuple
 from pydantic import BaseModel, create_model, Field
 from .manager import AgentableManager
-from .models import AgentableColumn
+from .models import AgentableColumn, AgentableFilter, AgentableSort, generate_filter_id, generate_sort_id
+from .query import compile_predicate, compile_sort_key, visible_columns
+
+_FILTER_OPERATORS = ["is", "isNot", "contains", "startsWith", "endsWith", "gt", "lt", "isEmpty", "isNotEmpty"]
+_compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str).encode
+# No page entry is shorter than {"id":"","cells":{}} plus its comma
+_MIN_ROW_CHARS = len(_compact({"id": "", "cells": {}})) + 1
+
+# Tables with the same column layout share these entries: a key is the layout's JSON
+_LAYOUT_CACHE_SIZE = 256
+
+
+def _layout_columns(layout: str) -> List[AgentableColumn]:
+    return [AgentableColumn(**c) for c in json.loads(layout)]
+
+
+def _describe_column(col: AgentableColumn) -> str:
+    output = f"- **{col.name}** ({col.type}) [ID: {col.id}] \n"
+    if col.description:
+        output += f"  - Description: {col.description}\n"
+    if col.constraints and col.constraints.options:
+        options = ", ".join([o.value for o in col.constraints.options])
+        output += f"  - Options: {options}\n"
+    return output
+
+
+@lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _describe_columns(layout: str) -> str:
+    return "## Columns\n" + "".join(_describe_column(col) for col in _layout_columns(layout))
+
+
+def _describe_stats(summary: Dict[str, Any]) -> str:
+    parts = [f"{summary['count']} filled", f"{summary['nulls']} empty", f"{summary['distinct']} distinct"]
+    for key in ("min", "max", "mean", "sum"):
+        if summary.get(key) is not None:
+            parts.append(f"{key} {summary[key]:g}" if isinstance(summary[key], float) else f"{key} {summary[key]}")
+    if summary.get("histogram"):
+        parts.append("counts " + ", ".join(f"{value}: {n}" for value, n in summary["histogram"].items()))
+    return f"  - Stats: {'; '.join(parts)}\n"
+
+
+@lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _row_model(layout: str) -> Type[BaseModel]:
+    fields: Dict[str, Any] = {}
+
+    for col in _layout_columns(layout):
+        # Map AGENTABLE types to Python types
+        field_type: Any = str
+        if col.type == "number":
+            field_type = float
+        elif col.type == "boolean":
+            field_type = bool
+        elif col.type == "date":
+            field_type = str
+        elif col.type == "url":
+            field_type = str
+        elif col.type == "select":
+            # For simplicity, treating select as str or List[str]
+            if col.constraints and col.constraints.multiSelect:
+                field_type = List[str]
+            else:
+                field_type = str
+
+        # Description
+        description = f"Column: {col.name}"
+        if col.description:
+            description += f" - {col.description}"
+
+        # Constraints / Optionality
+        # Defaulting to optional unless explicitly required, to allow flexbility
+        if col.constraints and col.constraints.required:
+            fields[col.id] = (field_type, Field(..., description=description))
+        else:
+            fields[col.id] = (Optional[field_type], Field(None, description=description))
+
+    # Create Dynamic Model
+    # model_config={"extra": "forbid"} ensures strict validation
+    DynamicRowModel = create_model(
+        "DynamicRowModel",
+        __config__={"extra": "forbid"},
+        **fields
+    )
+
+    return DynamicRowModel
+
+
+# JSON schemas are cached as text, so every caller gets a fresh dict it is free to modify
+
+@lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _row_json_schema(layout: str) -> str:
+    return _compact(_row_model(layout).model_json_schema())
+
+
+@lru_cache(maxsize=_LAYOUT_CACHE_SIZE)
+def _query_rows_json_schema(layout: str) -> str:
+    column = {"type": "string", "enum": [c["id"] for c in json.loads(layout)]}
+    return _compact({
+        "type": "object",
+        "properties": {
+            "view_id": {"type": ["string", "null"], "description": "Start from this view's filters, sorts and visible columns."},
+            "filters": {
+                "type": ["array", "null"],
+                "description": "Extra filters, combined with AND (and with the view's).",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "column_id": column,
+                        "operator": {"type": "string", "enum": _FILTER_OPERATORS},
+                        "value": {"type": ["string", "number", "boolean", "null"]},
+                    },
+                    "required": ["column_id", "operator", "value"],
+                    "additionalProperties": False,
+                },
+            },
+            "sorts": {
+                "type": ["array", "null"],
+                "description": "Sort order, replacing the view's. Ties are ordered by creation time.",
+                "items": {
+                    "type": "object",
+                    "properties": {"column_id": column, "direction": {"type": "string", "enum": ["asc", "desc"]}},
+                    "required": ["column_id", "direction"],
+                    "additionalProperties": False,
+                },
+            },
+            "columns": {"type": ["array", "null"], "items": column, "description": "Columns to return (default: all visible)."},
+            "cursor": {"type": ["string", "null"], "description": "nextCursor from the previous page of the same query."},
+            "max_chars": {"type": ["integer", "null"], "description": "Size budget of the page in characters."},
+        },
+        "required": ["view_id", "filters", "sorts", "columns", "cursor", "max_chars"],
+        "additionalProperties": False,
+    })
+
 
 class AgentableAgentTooling:
+    """
+    Tool definitions, row models and the table description are derived from the column layout
+    and cached in LRUs shared by all tables; the manager's column_version tells when to look
+    the layout up again. Columns edited in place, bypassing the manager, are not noticed.
+    """
+
     def __init__(self, manager: AgentableManager):
         self.manager = manager
+        self._layout_version = -1
+        self._layout_key = ""
 
-    def describe_table(self) -> str:
+    def _permission(self, key: str) -> Any:
+        policy = self.manager._schema.policy
+        return getattr(policy.permissions, key, True) if policy and policy.permissions else True
+
+    def _layout(self) -> str:
+        version = self.manager.column_version
+        if version != self._layout_version:
+            columns = self.manager._schema.columns
+            self._layout_key = _compact([c.model_dump(mode="json", exclude_none=True) for c in columns])
+            self._layout_version = version
+        return self._layout_key
+
+    def describe_table(self, stats: bool = False) -> str:
         """
         "The Eyes": Returns a markdown description of the table state.
+        stats=True adds each column's live statistics (see AgentableManager.aggregate).
         """
-        schema = self.manager.get_agentable()
+        schema = self.manager._schema
         meta = schema.metadata
         
         output = f"# {meta.title}\n{meta.description or ''}\n\n"
         
-        output += "## Columns\n"
-        for col in schema.columns:
-            output += f"- **{col.name}** ({col.type}) [ID: {col.id}] \n"
-            if col.description:
-                output += f"  - Description: {col.description}\n"
-            if col.constraints and col.constraints.options:
-                options = ", ".join([o.value for o in col.constraints.options])
-                output += f"  - Options: {options}\n"
+        if stats:
+            output += "## Columns\n"
+            for col in schema.columns:
+                output += _describe_column(col) + _describe_stats(self.manager.aggregate(col.id, "summary"))
+        else:
+            output += _describe_columns(self._layout())
 
         output += "\n## Views\n"
         if not schema.views:
@@ -32,7 +187,7 @@ class AgentableAgentTooling:
             for view in schema.views:
                 output += f"- **{view.name}** [ID: {view.id}]\n"
 
-        output += f"\n## Row Count: {len(schema.rows)}\n"
+        output += f"\n## Row Count: {self.manager.row_count()}\n"
 
         return output
 
@@ -40,55 +195,13 @@ class AgentableAgentTooling:
         """
         Dynamically builds a Pydantic model for row creation based on current columns.
         """
-        schema = self.manager.get_agentable()
-        fields: Dict[str, Any] = {}
-        
-        for col in schema.columns:
-            # Map AGENTABLE types to Python types
-            field_type: Any = str
-            if col.type == "number":
-                field_type = float
-            elif col.type == "boolean":
-                field_type = bool
-            elif col.type == "date":
-                field_type = str
-            elif col.type == "url":
-                field_type = str
-            elif col.type == "select":
-                # For simplicity, treating select as str or List[str]
-                if col.constraints and col.constraints.multiSelect:
-                    field_type = List[str]
-                else:
-                    field_type = str
-
-            # Description
-            description = f"Column: {col.name}"
-            if col.description:
-                description += f" - {col.description}"
-            
-            # Constraints / Optionality
-            # Defaulting to optional unless explicitly required, to allow flexbility
-            if col.constraints and col.constraints.required:
-                fields[col.id] = (field_type, Field(..., description=description))
-            else:
-                fields[col.id] = (Optional[field_type], Field(None, description=description))
-
-        # Create Dynamic Model
-        # model_config={"extra": "forbid"} ensures strict validation
-        DynamicRowModel = create_model(
-            "DynamicRowModel",
-            __config__={"extra": "forbid"}, 
-            **fields
-        )
-        
-        return DynamicRowModel
+        return _row_model(self._layout())
 
     def format_openai(self, name: str = "add_row", description: str = "Add a new row to the table. Use column IDs as keys.") -> Dict[str, Any]:
         """
         Returns an OpenAI-compatible tool definition (Strict Mode).
         """
-        model = self.generate_row_model()
-        json_schema = model.model_json_schema()
+        json_schema = json.loads(_row_json_schema(self._layout()))
         
         # Pydantic's json_schema might include 'title', 'defs', etc. 
         # OpenAI strict mode requires specific structure and no additionalProperties
@@ -108,8 +221,7 @@ class AgentableAgentTooling:
         """
         Returns an Anthropic-compatible tool definition.
         """
-        model = self.generate_row_model()
-        json_schema = model.model_json_schema()
+        json_schema = json.loads(_row_json_schema(self._layout()))
         
         # Remove $defs if present and empty, or resolve refs if complex.
         # For this flat model, it should be simple.
@@ -120,11 +232,152 @@ class AgentableAgentTooling:
             "input_schema": json_schema
         }
 
+    def query_rows_schema(self) -> Dict[str, Any]:
+        """
+        JSON schema of query_rows' parameters. Every property is required and nullable, as
+        OpenAI's strict mode expects.
+        """
+        return json.loads(_query_rows_json_schema(self._layout()))
+
+    def format_query_openai(self, name: str = "query_rows", description: str = "Read table rows one page at a time. Use column IDs as keys.") -> Dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": self.query_rows_schema(),
+                "strict": True
+            }
+        }
+
+    def format_query_anthropic(self, name: str = "query_rows", description: str = "Read table rows one page at a time.") -> Dict[str, Any]:
+        return {
+            "name": name,
+            "description": description,
+            "input_schema": self.query_rows_schema()
+        }
+
+    def query_rows(
+        self,
+        view_id: Optional[str] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        One page of rows: {"rows": [{"id", "cells"}], "total", "nextCursor"}.
+
+        Rows come in sort order with the row ID (creation time) breaking ties, and the cursor
+        holds the last row's sort values and ID, so the next page starts right after it: rows
+        inserted or deleted between calls never shift a page or repeat a row. The page holds
+        as many rows as fit in max_chars of compact JSON (max_tokens counts 4 characters per
+        token), but always at least one. "total" counts every matching row, including those
+        on earlier pages.
+        """
+        manager = self.manager
+        by_id = {c.id: c for c in manager._schema.columns}
+        view_filters: List[AgentableFilter] = []
+        view_sorts: List[AgentableSort] = []
+        column_ids = [c.id for c in manager._schema.columns]
+        if view_id is not None:
+            view = manager.get_view(view_id)
+            if not view:
+                raise ValueError(f"View {view_id} not found")
+            view_filters = list(view.filters)
+            view_sorts = list(view.sorts)
+            column_ids = visible_columns(view, manager._schema.columns)
+        for flt in filters or []:
+            view_filters.append(AgentableFilter(id=generate_filter_id(), columnId=flt["column_id"], operator=flt["operator"], value=flt.get("value")))
+        if sorts:
+            view_sorts = [AgentableSort(id=generate_sort_id(), columnId=s["column_id"], direction=s["direction"]) for s in sorts]
+        if columns:
+            unknown = [cid for cid in columns if cid not in by_id]
+            if unknown:
+                raise ValueError(f"Column {unknown[0]} not found")
+            column_ids = list(columns)
+        view_sorts = [s for s in view_sorts if s.columnId in by_id]
+        for flt in view_filters:
+            if flt.columnId not in by_id:
+                raise ValueError(f"Column {flt.columnId} not found")
+
+        # Cursors only continue the query that produced them
+        fingerprint = hashlib.sha1(_compact([
+            [[f.columnId, f.operator, f.value] for f in view_filters],
+            [[s.columnId, s.direction] for s in view_sorts],
+        ]).encode("utf-8")).hexdigest()[:16]
+        predicate = compile_predicate(view_filters, by_id)
+        sorting = compile_sort_key(view_sorts, by_id, allow_reverse=False)
+        sort_key = sorting[0] if sorting else (lambda cells: ())
+        after: Optional[Tuple[Any, ...]] = None
+        if cursor is not None:
+            state = _decode_cursor(cursor)
+            if state.get("q") != fingerprint:
+                raise ValueError("Cursor does not belong to this query")
+            after = sort_key(state["k"]) + (state["id"],)
+
+        total = 0
+        keyed = []
+        for row in manager.iter_rows():
+            cells = row.cells
+            if predicate is not None and not predicate(cells):
+                continue
+            total += 1
+            key = sort_key(cells) + (row.id,)
+            if after is None or key > after:
+                keyed.append((key, row))
+
+        budget = max_chars if max_chars is not None else (max_tokens * 4 if max_tokens is not None else 8000)
+        # Room for the envelope: brackets, total and a cursor
+        used = 100
+        # Only the rows that can fit on the page are ordered, not every row after the cursor
+        limit = max(budget - used, 0) // _MIN_ROW_CHARS + 1
+        page = []
+        for _, row in heapq.nsmallest(limit, keyed, key=lambda entry: entry[0]):
+            item = {"id": row.id, "cells": {cid: row.cells[cid] for cid in column_ids if cid in row.cells}}
+            size = len(_compact(item)) + 1
+            if page and used + size > budget:
+                break
+            used += size
+            page.append((row, item))
+
+        next_cursor = None
+        if len(page) < len(keyed):
+            last = page[-1][0]
+            next_cursor = _encode_cursor({
+                "q": fingerprint,
+                "k": {s.columnId: last.cells.get(s.columnId) for s in view_sorts},
+                "id": last.id,
+            })
+        return {"rows": [item for _, item in page], "total": total, "nextCursor": next_cursor}
+
     # --- Legacy / Internal Tools ---
 
+    def tool_query_rows(
+        self,
+        view_id: Optional[str] = None,
+        filters: Optional[List[Dict[str, Any]]] = None,
+        sorts: Optional[List[Dict[str, Any]]] = None,
+        columns: Optional[List[str]] = None,
+        cursor: Optional[str] = None,
+        max_chars: Optional[int] = None,
+        max_tokens: Optional[int] = None,
+    ) -> str:
+        allow = self._permission("allowAgentRead")
+        if not allow:
+            return "Permission Denied: Agent is not allowed to read rows."
+
+        try:
+            page = self.query_rows(view_id, filters, sorts, columns, cursor, max_chars, max_tokens)
+            return _compact(page)
+        except Exception as e:
+            return f"Error: {str(e)}"
+
     def tool_add_row(self, cells: Dict[str, Any]) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentCreate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentCreate")
         if not allow:
             return "Permission Denied: Agent is not allowed to create rows."
             
@@ -136,7 +389,7 @@ class AgentableAgentTooling:
     
     def tool_update_row(self, row_id: str, updates: Dict[str, Any]) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentUpdate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentUpdate")
         if not allow:
             return "Permission Denied: Agent is not allowed to update rows."
             
@@ -148,7 +401,7 @@ class AgentableAgentTooling:
 
     def tool_delete_row(self, row_id: str) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentDelete", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentDelete")
         if not allow:
             return "Permission Denied: Agent is not allowed to delete rows."
             
@@ -160,7 +413,7 @@ class AgentableAgentTooling:
 
     def tool_add_column(self, name: str, type: str, description: Optional[str] = None) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentCreate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentCreate")
         if not allow:
             return "Permission Denied: Agent is not allowed to create columns."
             
@@ -172,7 +425,7 @@ class AgentableAgentTooling:
 
     def tool_update_column(self, column_id: str, **kwargs) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentUpdate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentUpdate")
         if not allow:
             return "Permission Denied: Agent is not allowed to update columns."
             
@@ -185,7 +438,7 @@ class AgentableAgentTooling:
 
     def tool_delete_column(self, column_id: str) -> str:
         # Check policy
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentDelete", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentDelete")
         if not allow:
             return "Permission Denied: Agent is not allowed to delete columns."
             
@@ -196,7 +449,7 @@ class AgentableAgentTooling:
             return f"Error: {str(e)}"
 
     def tool_create_view(self, name: str) -> str:
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentCreate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentCreate")
         if not allow:
             return "Permission Denied: Agent is not allowed to create views."
             
@@ -207,7 +460,7 @@ class AgentableAgentTooling:
             return f"Error: {str(e)}"
 
     def tool_add_view_filter(self, view_id: str, column_id: str, operator: str, value: Any) -> str:
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentUpdate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentUpdate")
         if not allow:
             return "Permission Denied: Agent is not allowed to update views."
             
@@ -218,7 +471,7 @@ class AgentableAgentTooling:
             return f"Error: {str(e)}"
 
     def tool_add_view_sort(self, view_id: str, column_id: str, direction: str) -> str:
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentUpdate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentUpdate")
         if not allow:
             return "Permission Denied: Agent is not allowed to update views."
             
@@ -229,7 +482,7 @@ class AgentableAgentTooling:
             return f"Error: {str(e)}"
 
     def tool_update_table_metadata(self, **kwargs) -> str:
-        allow = getattr(self.manager.get_agentable().policy.permissions, "allowAgentUpdate", True) if self.manager.get_agentable().policy and self.manager.get_agentable().policy.permissions else True
+        allow = self._permission("allowAgentUpdate")
         if not allow:
             return "Permission Denied: Agent is not allowed to update table metadata."
             
@@ -238,3 +491,14 @@ class AgentableAgentTooling:
             return "Success: Updated table metadata"
         except Exception as e:
             return f"Error: {str(e)}"
+
+
+def _encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(_compact(state).encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        return json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Invalid cursor")
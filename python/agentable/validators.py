@@ -0,0 +1,154 @@
+import re
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlsplit
+from .models import AgentableColumn
+
+CellValidator = Callable[[Any], None]
+
+
+def _is_date(value: str) -> bool:
+    # ISO-8601 date or date-time; fromisoformat only accepts a trailing "Z" from Python 3.11
+    text = value[:-1] + "+00:00" if value.endswith(("Z", "z")) else value
+    try:
+        if len(text) == 10:
+            date.fromisoformat(text)
+        else:
+            datetime.fromisoformat(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_url(value: str) -> bool:
+    try:
+        parts = urlsplit(value)
+    except ValueError:
+        return False
+    return bool(parts.scheme and parts.netloc)
+
+
+def compile_validator(col: AgentableColumn) -> CellValidator:
+    """
+    Compiles a column's type and constraints into a single function that raises ValueError
+    for an invalid cell value. Options, patterns and bounds are resolved once here rather
+    than on every call.
+    """
+    name = col.name
+    col_type = col.type
+    constraints = col.constraints
+    required = bool(constraints and constraints.required)
+    minimum = constraints.min if constraints else None
+    maximum = constraints.max if constraints else None
+    pattern = re.compile(constraints.pattern) if constraints and constraints.pattern else None
+    options = frozenset(o.value for o in constraints.options) if constraints and constraints.options else None
+    multi = bool(constraints and constraints.multiSelect)
+
+    checks: List[CellValidator] = []
+
+    if col_type == "number":
+        def check_number(value: Any) -> None:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError(f"Column {name} requires a number")
+            if minimum is not None and value < minimum:
+                raise ValueError(f"Value {value} is below the minimum {minimum} for column {name}")
+            if maximum is not None and value > maximum:
+                raise ValueError(f"Value {value} is above the maximum {maximum} for column {name}")
+        checks.append(check_number)
+
+    elif col_type == "boolean":
+        def check_boolean(value: Any) -> None:
+            if not isinstance(value, bool):
+                raise ValueError(f"Column {name} requires a boolean")
+        checks.append(check_boolean)
+
+    elif col_type == "select":
+        if multi:
+            def check_multi(value: Any) -> None:
+                if not isinstance(value, list):
+                    raise ValueError(f"Column {name} requires a list")
+                if options is not None:
+                    for v in value:
+                        if v not in options:
+                            raise ValueError(f"Value {v} not in options for column {name}")
+            checks.append(check_multi)
+        elif options is not None:
+            def check_option(value: Any) -> None:
+                try:
+                    known = value in options
+                except TypeError:
+                    known = False
+                if not known:
+                    raise ValueError(f"Value {value} not in options for column {name}")
+            checks.append(check_option)
+
+    else:
+        # text, date, url and link all hold strings
+        def check_string(value: Any) -> None:
+            if not isinstance(value, str):
+                raise ValueError(f"Column {name} requires a string")
+        checks.append(check_string)
+
+        if col_type == "date":
+            def check_date(value: str) -> None:
+                if not _is_date(value):
+                    raise ValueError(f"Column {name} requires an ISO-8601 date")
+            checks.append(check_date)
+        elif col_type == "url":
+            def check_url(value: str) -> None:
+                if not _is_url(value):
+                    raise ValueError(f"Column {name} requires a valid URL")
+            checks.append(check_url)
+
+        if minimum is not None or maximum is not None:
+            # For text-like columns min/max bound the length
+            def check_length(value: str) -> None:
+                if minimum is not None and len(value) < minimum:
+                    raise ValueError(f"Column {name} requires at least {minimum:g} characters")
+                if maximum is not None and len(value) > maximum:
+                    raise ValueError(f"Column {name} allows at most {maximum:g} characters")
+            checks.append(check_length)
+
+        if pattern is not None:
+            search = pattern.search
+
+            def check_pattern(value: str) -> None:
+                if search(value) is None:
+                    raise ValueError(f"Value {value} does not match the pattern for column {name}")
+            checks.append(check_pattern)
+
+    if required or len(checks) != 1:
+        def validate(value: Any) -> None:
+            if value is None:
+                if required:
+                    raise ValueError(f"Column {name} is required")
+                return
+            for check in checks:
+                check(value)
+    else:
+        only = checks[0]
+
+        def validate(value: Any) -> None:
+            if value is not None:
+                only(value)
+
+    return validate
+
+
+def validate_cells(
+    validators: Dict[str, CellValidator],
+    cells: Dict[str, Any],
+    complete: bool = False,
+) -> None:
+    """
+    Checks each cell against the validator for its column; cells of unknown columns are left
+    alone. With complete=True every column is checked, so missing required cells are reported.
+    """
+    if complete:
+        for col_id, validator in validators.items():
+            validator(cells.get(col_id))
+        return
+    for col_id, value in cells.items():
+        validator = validators.get(col_id)
+        if validator is not None:
+            validator(value)
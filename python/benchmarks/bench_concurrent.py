@@ -0,0 +1,73 @@
+"""
+Stress test for ConcurrentAgentableManager: worker threads update cells of disjoint rows
+(optionally alongside whole-table readers) and total throughput is reported per thread count.
+
+    python benchmarks/bench_concurrent.py --threads 1 2 4 8 --seconds 2
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.concurrent import ConcurrentAgentableManager  # noqa: E402
+
+
+def run(threads: int, seconds: float, rows: int, readers: int) -> None:
+    manager = ConcurrentAgentableManager()
+    col = manager.add_column(name="Score", type="number")
+    ids = [r.id for r in manager.add_rows([{col.id: 0} for _ in range(rows)])]
+    view = manager.create_view("Top")
+    manager.add_sort(view.id, col.id, "desc")
+    stop = threading.Event()
+    counts = [0] * (threads + readers)
+
+    def write(n: int) -> None:
+        mine = ids[n::threads]
+        done = 0
+        while not stop.is_set():
+            for row_id in mine[:100]:
+                manager.set_cell(row_id, col.id, done)
+                done += 1
+        counts[n] = done
+
+    def read(n: int) -> None:
+        done = 0
+        while not stop.is_set():
+            list(manager.query_view(view.id, limit=10))
+            done += 1
+        counts[threads + n] = done
+
+    workers = [threading.Thread(target=write, args=(n,)) for n in range(threads)]
+    workers += [threading.Thread(target=read, args=(n,)) for n in range(readers)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    writes = sum(counts[:threads]) / elapsed
+    line = f"{threads:3d} writer(s)  {writes:12,.0f} set_cell/s"
+    if readers:
+        line += f"  {sum(counts[threads:]) / elapsed:10,.1f} queries/s ({readers} reader(s))"
+    print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=0)
+    args = parser.parse_args()
+    for threads in args.threads:
+        run(threads, args.seconds, args.rows, args.readers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Retention workload: delete a share of the rows in chunks with delete_rows, through
+delete_where, and one delete_row call at a time.
+
+    python benchmarks/bench_delete.py --rows 500000 --chunk 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+
+
+def build(rows: int) -> AgentableManager:
+    manager = AgentableManager()
+    col = manager.add_column("Age", "number")
+    manager.add_rows([{col.id: i % 100} for i in range(rows)], validate=False)
+    return manager
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--chunk", type=int, default=1000)
+    parser.add_argument("--single", type=int, default=2000)
+    args = parser.parse_args()
+
+    manager = build(args.rows)
+    doomed = [row.id for row in manager.iter_rows()][::5]
+    start = time.perf_counter()
+    for i in range(0, len(doomed), args.chunk):
+        manager.delete_rows(doomed[i:i + args.chunk])
+    manager.row_count()
+    print(f"delete_rows x{len(doomed) // args.chunk} chunks   {time.perf_counter() - start:8.3f}s")
+
+    manager = build(args.rows)
+    col = manager.schema.columns[0]
+    start = time.perf_counter()
+    deleted = manager.delete_where(lambda row: row.cells[col.id] < 20)
+    print(f"delete_where ({len(deleted)} rows)   {time.perf_counter() - start:8.3f}s")
+
+    manager = build(args.rows)
+    ids = [row.id for row in manager.iter_rows()][::7][:args.single]
+    start = time.perf_counter()
+    for id in ids:
+        manager.delete_row(id)
+    print(f"delete_row x{len(ids)}            {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
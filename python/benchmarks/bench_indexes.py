@@ -0,0 +1,82 @@
+"""
+Compares filtered view queries with and without secondary column indexes.
+
+    python benchmarks/bench_indexes.py --rows 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+
+STATUSES = [f"S{i}" for i in range(50)]
+WORDS = ["invoice", "shipment", "refund", "audit", "renewal", "onboarding", "migration", "review"]
+
+
+def _time(manager: AgentableManager, view_id: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        count = sum(1 for _ in manager.query_view(view_id))
+    return (time.perf_counter() - start) / repeat, count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    manager = AgentableManager()
+    status = manager.add_column(name="Status", type="select", constraints={"options": [{"value": s} for s in STATUSES]})
+    price = manager.add_column(name="Price", type="number")
+    name = manager.add_column(name="Name", type="text")
+    manager.add_rows([
+        {status.id: rng.choice(STATUSES), price.id: rng.random() * 1000, name.id: f"{rng.choice(WORDS)} {rng.randrange(100000)} {rng.choice(WORDS)}"}
+        for _ in range(args.rows)
+    ], validate=False)
+
+    queries = {
+        "status is S7": [(status.id, "is", "S7")],
+        "price gt 999": [(price.id, "gt", 999)],
+        "status is S7, price lt 100": [(status.id, "is", "S7"), (price.id, "lt", 100)],
+        "name contains 12345": [(name.id, "contains", "12345")],
+        "name startsWith refund 99": [(name.id, "startsWith", "refund 99")],
+        "name endsWith 7 audit": [(name.id, "endsWith", "7 audit")],
+    }
+    views = {}
+    for label, filters in queries.items():
+        view = manager.create_view(label)
+        for column_id, operator, value in filters:
+            manager.add_filter(view.id, column_id, operator, value)
+        views[label] = view.id
+
+    scans = {label: _time(manager, view_id, args.repeat) for label, view_id in views.items()}
+
+    start = time.perf_counter()
+    manager.create_index(status.id)
+    manager.create_index(price.id)
+    for kind in ("trigram", "prefix", "suffix"):
+        manager.create_index(name.id, kind)
+    print(f"build indexes                  {time.perf_counter() - start:8.3f}s")
+    for key, size in manager.index_memory_usage().items():
+        print(f"  {key:28} {size / 1e6:8.1f}MB")
+
+    for label, view_id in views.items():
+        indexed, count = _time(manager, view_id, args.repeat)
+        scan, _ = scans[label]
+        print(f"{label:30} scan {scan * 1000:9.1f}ms  indexed {indexed * 1000:8.1f}ms  ({count} rows, {scan / indexed:6.1f}x)")
+
+    ids = [r.id for r in manager.schema.rows]
+    start = time.perf_counter()
+    for _ in range(10_000):
+        manager.set_cell(rng.choice(ids), price.id, rng.random() * 1000)
+    print(f"set_cell x10000 with indexes   {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares validated, trusted and trusted+sampled-validation loading of the spec fixtures,
+scaled up to a large row count.
+
+    python benchmarks/bench_load.py --rows 100000
+"""
+import argparse
+import copy
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+from agentable.models import _to_base36  # noqa: E402
+
+FIXTURES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid"))
+
+
+def scaled_fixture(filename: str, rows: int) -> dict:
+    with open(os.path.join(FIXTURES_DIR, filename), "r") as f:
+        data = json.load(f)
+    templates = data["rows"] or [{"id": "", "cells": {}}]
+    data["rows"] = [
+        {"id": _to_base36(1_700_000_000_000 + i, 9) + "000", "cells": dict(templates[i % len(templates)]["cells"])}
+        for i in range(rows)
+    ]
+    return data
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sample", type=int, default=1_000)
+    args = parser.parse_args()
+
+    for filename in sorted(os.listdir(FIXTURES_DIR)):
+        data = scaled_fixture(filename, args.rows)
+        # Each run gets its own copy since the loaders adopt or annotate the input dict
+        validated = timed(lambda: AgentableManager(copy.deepcopy(data)))
+        copy_cost = timed(lambda: copy.deepcopy(data))
+        trusted_manager = AgentableManager(copy.deepcopy(data), trusted=True)
+        trusted = timed(lambda: AgentableManager(copy.deepcopy(data), trusted=True))
+        sampled = timed(lambda: trusted_manager.validate(sample=args.sample, seed=0))
+        full = timed(lambda: trusted_manager.validate())
+
+        print(f"{filename} ({args.rows} rows)")
+        print(f"  validated load        {validated - copy_cost:8.3f}s")
+        print(f"  trusted load          {trusted - copy_cost:8.3f}s")
+        print(f"  sampled validate({args.sample}) {sampled:8.3f}s")
+        print(f"  full validate         {full:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
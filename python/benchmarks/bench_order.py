@@ -0,0 +1,53 @@
+"""
+Drag-reorder workload: random move_row, duplicate_row and delete_row calls, each needing
+the display position of a row, at several table sizes.
+
+    python benchmarks/bench_order.py --sizes 50000,200000,800000 --ops 2000
+
+Finding the position goes through RowOrder and costs O(sqrt n). Each call also shifts
+schema.rows, a plain list, with one memmove of O(n) pointers. That shift is measured on
+its own ("list shift") to show how much of the per-call time grows linearly with the table.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="50000,200000,800000")
+    parser.add_argument("--ops", type=int, default=2000)
+    args = parser.parse_args()
+
+    for rows in [int(size) for size in args.sizes.split(",")]:
+        rng = random.Random(1)
+        manager = AgentableManager()
+        col = manager.add_column("N", "number")
+        ids = [row.id for row in manager.add_rows([{col.id: i} for i in range(rows)], validate=False)]
+        plain = list(range(rows))
+
+        def shift() -> None:
+            plain.insert(rng.randrange(rows), plain.pop(rng.randrange(rows)))
+
+        print(f"{rows} rows")
+        for name, op in (
+            ("list shift", shift),
+            ("move_row", lambda: manager.move_row(rng.choice(ids), rng.randrange(rows))),
+            ("duplicate_row", lambda: ids.append(manager.duplicate_row(rng.choice(ids)).id)),
+            ("delete_row", lambda: manager.delete_row(ids.pop(rng.randrange(len(ids))))),
+        ):
+            start = time.perf_counter()
+            for _ in range(args.ops):
+                op()
+            elapsed = time.perf_counter() - start
+            print(f"  {name:14} {elapsed / args.ops * 1e6:9.1f}us per call")
+
+
+if __name__ == "__main__":
+    main()
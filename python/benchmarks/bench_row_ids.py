@@ -0,0 +1,43 @@
+"""
+Compares row ID generation: one random ID per call against the monotonic allocator.
+
+    python benchmarks/bench_row_ids.py --count 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+from agentable.models import RowIdAllocator, generate_row_id  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=1_000_000)
+    args = parser.parse_args()
+    count = args.count
+
+    start = time.perf_counter()
+    ids = [generate_row_id() for _ in range(count)]
+    print(f"generate_row_id x{count}     {time.perf_counter() - start:8.3f}s  {count - len(set(ids))} duplicates")
+
+    allocator = RowIdAllocator()
+    start = time.perf_counter()
+    ids = [allocator.next() for _ in range(count)]
+    print(f"allocator.next x{count}      {time.perf_counter() - start:8.3f}s  {count - len(set(ids))} duplicates")
+
+    start = time.perf_counter()
+    ids = allocator.reserve(count)
+    print(f"allocator.reserve({count})  {time.perf_counter() - start:8.3f}s  {count - len(set(ids))} duplicates, sorted: {ids == sorted(ids)}")
+
+    manager = AgentableManager()
+    start = time.perf_counter()
+    manager.add_rows([{} for _ in range(count)], validate=False)
+    print(f"add_rows({count})           {time.perf_counter() - start:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
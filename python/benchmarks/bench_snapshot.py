@@ -0,0 +1,61 @@
+"""
+Compares cold-start time of a JSON table against the binary snapshot format.
+
+    python benchmarks/bench_snapshot.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+from agentable.snapshot import open_snapshot  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    manager = AgentableManager()
+    name = manager.add_column(name="Name", type="text")
+    score = manager.add_column(name="Score", type="number")
+    status = manager.add_column(name="Status", type="select", constraints={"options": [{"value": "Todo"}, {"value": "Done"}]})
+    manager.add_rows([{name.id: f"Task {i}", score.id: i * 0.5, status.id: "Todo" if i % 3 else "Done"} for i in range(args.rows)])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "table.table.json")
+        snapshot_path = os.path.join(tmp, "table.agtb")
+
+        start = time.perf_counter()
+        with open(json_path, "w", encoding="utf-8") as f:
+            manager.write_json(f)
+        print(f"write json            {time.perf_counter() - start:8.3f}s  {os.path.getsize(json_path) / 1e6:8.1f}MB")
+        start = time.perf_counter()
+        manager.write_snapshot(snapshot_path)
+        print(f"write snapshot        {time.perf_counter() - start:8.3f}s  {os.path.getsize(snapshot_path) / 1e6:8.1f}MB")
+
+        start = time.perf_counter()
+        with open(json_path, "r", encoding="utf-8") as f:
+            AgentableManager(json.load(f))
+        print(f"json.load + validate  {time.perf_counter() - start:8.3f}s")
+
+        start = time.perf_counter()
+        snapshot = open_snapshot(snapshot_path)
+        print(f"open snapshot         {time.perf_counter() - start:8.6f}s")
+        middle = manager.schema.rows[args.rows // 2].id
+        start = time.perf_counter()
+        snapshot.get_row(middle)
+        print(f"get_row by id         {time.perf_counter() - start:8.6f}s")
+        start = time.perf_counter()
+        AgentableManager(snapshot.to_dict(), trusted=True)
+        print(f"full load (trusted)   {time.perf_counter() - start:8.3f}s")
+        snapshot.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Column statistics: a full scan per question against the incrementally maintained summaries,
+with edits in between.
+
+    python benchmarks/bench_stats.py --rows 500000 --queries 100
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable.manager import AgentableManager  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--queries", type=int, default=100)
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    manager = AgentableManager()
+    price = manager.add_column("Price", "number")
+    status = manager.add_column("Status", "select", constraints={"options": [{"value": s} for s in ("todo", "doing", "done")]})
+    manager.add_rows([{price.id: rng.randint(1, 1000), status.id: rng.choice(["todo", "doing", "done"])} for _ in range(args.rows)], validate=False)
+    ids = [row.id for row in manager.iter_rows()]
+
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        manager.set_cell(rng.choice(ids), price.id, rng.randint(1, 1000))
+        counts = {}
+        total = 0.0
+        for row in manager.iter_rows():
+            value = row.cells.get(status.id)
+            counts[value] = counts.get(value, 0) + 1
+            total += row.cells.get(price.id) or 0
+    scan = (time.perf_counter() - start) / args.queries
+    print(f"scan          {scan * 1000:9.3f}ms per question")
+
+    start = time.perf_counter()
+    manager.aggregate(status.id, "histogram")
+    manager.aggregate(price.id, "sum")
+    print(f"first build   {(time.perf_counter() - start) * 1000:9.3f}ms")
+
+    start = time.perf_counter()
+    for _ in range(args.queries):
+        manager.set_cell(rng.choice(ids), price.id, rng.randint(1, 1000))
+        manager.aggregate(status.id, "histogram")
+        manager.aggregate(price.id, "sum")
+    incremental = (time.perf_counter() - start) / args.queries
+    print(f"incremental   {incremental * 1000:9.3f}ms per question  ({scan / incremental:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
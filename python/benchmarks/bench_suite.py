@@ -0,0 +1,238 @@
+"""
+Benchmark suite over a deterministic synthetic table: every column type, select options
+and filtered, sorted views. Times the manager's hot paths at each size, writes the results
+as JSON and compares them with a stored baseline.
+
+    python benchmarks/bench_suite.py --sizes 1000,100000,1000000 --output results.json
+    python benchmarks/bench_suite.py --output baseline.json            # record a baseline
+    python benchmarks/bench_suite.py --baseline baseline.json --threshold 1.3
+
+Each result is the median seconds per call. A timing is a regression when it exceeds the
+baseline by more than the threshold ratio (the baseline's own "thresholds" entry for that
+operation wins over --threshold) and by more than --min-delta seconds; the script then
+exits with status 1. Baselines are machine specific, so record one per machine.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable import tools as tooling  # noqa: E402
+from agentable.manager import AgentableManager  # noqa: E402
+from agentable.migrate import validate_agentable  # noqa: E402
+from agentable.models import _to_base36  # noqa: E402
+from agentable.tools import AgentableAgentTooling  # noqa: E402
+
+STATUSES = ["backlog", "todo", "doing", "review", "done"]
+TAGS = ["bug", "feature", "docs", "infra", "ux", "perf"]
+WORDS = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "lambda"]
+
+
+def synthetic_table(rows: int, seed: int = 0) -> Dict[str, Any]:
+    """
+    Agentable data with one column of each type (plus a multiSelect one), three views and
+    `rows` rows. The same rows and seed always give the same table.
+    """
+    rng = random.Random(seed)
+    columns = [
+        {"id": "col_txt", "name": "Title", "type": "text", "constraints": {"required": True}},
+        {"id": "col_num", "name": "Price", "type": "number", "constraints": {"min": 0}},
+        {"id": "col_sel", "name": "Status", "type": "select", "constraints": {"options": [{"value": s} for s in STATUSES]}},
+        {"id": "col_tag", "name": "Tags", "type": "select", "constraints": {"multiSelect": True, "options": [{"value": t} for t in TAGS]}},
+        {"id": "col_dat", "name": "Due", "type": "date"},
+        {"id": "col_bol", "name": "Done", "type": "boolean"},
+        {"id": "col_url", "name": "Homepage", "type": "url"},
+        {"id": "col_lnk", "name": "Parent", "type": "link"},
+    ]
+    views = [
+        {
+            "id": "view_opn", "name": "Open by price",
+            "filters": [{"id": "flt_opn", "columnId": "col_sel", "operator": "isNot", "value": "done"}],
+            "sorts": [{"id": "srt_prc", "columnId": "col_num", "direction": "desc"}],
+            "hiddenColumns": ["col_lnk"], "columnOrder": [],
+        },
+        {
+            "id": "view_due", "name": "Due this year",
+            "filters": [{"id": "flt_due", "columnId": "col_dat", "operator": "gt", "value": "2024-01-01"}],
+            "sorts": [{"id": "srt_due", "columnId": "col_dat", "direction": "asc"}, {"id": "srt_ttl", "columnId": "col_txt", "direction": "asc"}],
+            "hiddenColumns": [], "columnOrder": [],
+        },
+        {
+            "id": "view_src", "name": "Search",
+            "filters": [{"id": "flt_src", "columnId": "col_txt", "operator": "contains", "value": "gamma"}],
+            "sorts": [], "hiddenColumns": [], "columnOrder": [],
+        },
+    ]
+    data_rows = []
+    for i in range(rows):
+        cells: Dict[str, Any] = {"col_txt": f"Task {i} {rng.choice(WORDS)} {rng.choice(WORDS)}"}
+        if rng.random() < 0.95:
+            cells["col_num"] = round(rng.uniform(0, 1000), 2)
+        cells["col_sel"] = rng.choice(STATUSES)
+        cells["col_tag"] = rng.sample(TAGS, rng.randint(0, 3))
+        if rng.random() < 0.8:
+            cells["col_dat"] = f"{rng.randint(2022, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        cells["col_bol"] = rng.random() < 0.3
+        if rng.random() < 0.5:
+            cells["col_url"] = f"https://example.com/{rng.choice(WORDS)}/{i}"
+        if i and rng.random() < 0.2:
+            cells["col_lnk"] = _to_base36(1_700_000_000_000 + rng.randrange(i), 9) + "000"
+        data_rows.append({"id": _to_base36(1_700_000_000_000 + i, 9) + "000", "cells": cells})
+    return {
+        "version": "agentable-1.0.0",
+        "metadata": {"title": "Synthetic", "description": f"{rows} synthetic rows"},
+        "columns": columns,
+        "views": views,
+        "rows": data_rows,
+    }
+
+
+def per_call(fn: Callable[[], Any], calls: int, repeat: int) -> float:
+    # Median over `repeat` rounds of the mean time of `calls` calls
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        rounds.append((time.perf_counter() - start) / calls)
+    return statistics.median(rounds)
+
+
+def run_size(rows: int, seed: int, repeat: int, calls: int) -> Dict[str, float]:
+    data = synthetic_table(rows, seed)
+    # Whole-table operations get fewer rounds on large tables
+    table_repeat = max(1, min(repeat, 1_000_000 // max(rows, 1)))
+    results: Dict[str, float] = {}
+    rng = random.Random(seed + 1)
+
+    def copied() -> Dict[str, Any]:
+        return copy.deepcopy(data)
+
+    copies = [copied() for _ in range(table_repeat)]
+    results["construct"] = per_call(lambda: AgentableManager(copies.pop()), 1, table_repeat)
+    copies = [copied() for _ in range(table_repeat)]
+    results["construct_trusted"] = per_call(lambda: AgentableManager(copies.pop(), trusted=True), 1, table_repeat)
+    results["validate_agentable"] = per_call(lambda: validate_agentable(data), 1, table_repeat)
+
+    manager = AgentableManager(copied(), trusted=True)
+    tools = AgentableAgentTooling(manager)
+    ids = [row.id for row in manager.iter_rows()]
+
+    def new_cells() -> Dict[str, Any]:
+        return {"col_txt": "New task", "col_num": 1.5, "col_sel": "todo", "col_tag": ["bug"], "col_bol": False}
+
+    results["add_row"] = per_call(lambda: manager.add_row(new_cells()), calls, repeat)
+    results["set_cell"] = per_call(lambda: manager.set_cell(rng.choice(ids), "col_num", rng.uniform(0, 1000)), calls, repeat)
+    results["update_row"] = per_call(lambda: manager.update_row(rng.choice(ids), {"col_sel": rng.choice(STATUSES), "col_bol": True}), calls, repeat)
+    results["move_row"] = per_call(lambda: manager.move_row(rng.choice(ids), rng.randrange(len(ids))), calls, repeat)
+    doomed = rng.sample(ids, min(len(ids) // 2, calls * repeat))
+    doomed_set = set(doomed)
+    ids = [id for id in ids if id not in doomed_set]
+    results["delete_row"] = per_call(lambda: manager.delete_row(doomed.pop()), min(calls, len(doomed) // repeat) or 1, repeat)
+
+    for view_id in ("view_opn", "view_due", "view_src"):
+        results[f"query_view/{view_id}"] = per_call(lambda: list(manager.query_view(view_id, limit=50)), 1, table_repeat)
+    results["to_dict"] = per_call(manager.to_dict, 1, table_repeat)
+
+    cached = (tooling._describe_columns, tooling._row_model, tooling._row_json_schema, tooling._query_rows_json_schema)
+
+    def cold(fn: Callable[[], Any]) -> Callable[[], Any]:
+        def run() -> Any:
+            for cache in cached:
+                cache.cache_clear()
+            tools._layout_version = -1
+            return fn()
+        return run
+
+    results["generate_row_model"] = per_call(cold(tools.generate_row_model), calls, repeat)
+    results["format_openai"] = per_call(cold(tools.format_openai), calls, repeat)
+    results["format_openai/cached"] = per_call(tools.format_openai, calls, repeat)
+    results["tool/describe_table"] = per_call(tools.describe_table, calls, repeat)
+    results["tool/add_row"] = per_call(lambda: tools.tool_add_row(new_cells()), calls, repeat)
+    results["tool/update_row"] = per_call(lambda: tools.tool_update_row(rng.choice(ids), {"col_num": 2.0}), calls, repeat)
+    results["tool/query_rows"] = per_call(lambda: tools.tool_query_rows(view_id="view_opn", max_chars=4000), 1, table_repeat)
+
+    def delete_column() -> float:
+        manager.add_column("Scratch", "text")
+        col_id = manager.schema.columns[-1].id
+        start = time.perf_counter()
+        manager.delete_column(col_id)
+        return time.perf_counter() - start
+    results["delete_column"] = statistics.median(delete_column() for _ in range(table_repeat))
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any], threshold: float, min_delta: float) -> List[str]:
+    thresholds: Dict[str, float] = baseline.get("thresholds", {})
+    regressions = []
+    for size, timings in results.items():
+        before = baseline.get("results", {}).get(size, {})
+        for name, seconds in timings.items():
+            if name not in before:
+                continue
+            limit = thresholds.get(name, threshold)
+            ratio = seconds / before[name] if before[name] else float("inf")
+            if ratio > limit and seconds - before[name] > min_delta:
+                regressions.append(f"{size} rows  {name}: {before[name] * 1000:.3f}ms -> {seconds * 1000:.3f}ms ({ratio:.2f}x, limit {limit:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against the results stored in this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.3)
+    parser.add_argument("--min-delta", type=float, default=50e-6)
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for rows in [int(size) for size in args.sizes.split(",")]:
+        timings = run_size(rows, args.seed, args.repeat, args.calls)
+        results[str(rows)] = timings
+        print(f"{rows} rows")
+        for name, seconds in timings.items():
+            print(f"  {name:28} {seconds * 1000:10.3f}ms")
+
+    report: Dict[str, Any] = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "results": results,
+    }
+    baseline: Optional[Dict[str, Any]] = None
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        # Carry the thresholds along, so a new baseline recorded from this output keeps them
+        if "thresholds" in baseline:
+            report["thresholds"] = baseline["thresholds"]
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"No regressions against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
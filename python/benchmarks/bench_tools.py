@@ -0,0 +1,57 @@
+"""
+Per-turn cost of the agent tool definitions: rebuilt from scratch every turn against the
+layout caches.
+
+    python benchmarks/bench_tools.py --columns 40 --turns 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from agentable import tools as tooling  # noqa: E402
+from agentable.manager import AgentableManager  # noqa: E402
+from agentable.tools import AgentableAgentTooling  # noqa: E402
+
+_CACHED = (tooling._describe_columns, tooling._row_model, tooling._row_json_schema, tooling._query_rows_json_schema)
+
+
+def turn(tools: AgentableAgentTooling) -> None:
+    tools.describe_table()
+    tools.format_openai()
+    tools.format_anthropic()
+    tools.format_query_openai()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    manager = AgentableManager()
+    types = ["text", "number", "boolean", "date", "url"]
+    for i in range(args.columns):
+        manager.add_column(f"Column {i}", types[i % len(types)], description=f"Column number {i}")
+    tools = AgentableAgentTooling(manager)
+
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        for fn in _CACHED:
+            fn.cache_clear()
+        tools._layout_version = -1
+        turn(tools)
+    cold = (time.perf_counter() - start) / args.turns
+    print(f"uncached   {cold * 1000:8.3f}ms per turn")
+
+    start = time.perf_counter()
+    for _ in range(args.turns):
+        turn(tools)
+    warm = (time.perf_counter() - start) / args.turns
+    print(f"cached     {warm * 1000:8.3f}ms per turn  ({cold / warm:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import asyncio
+import pytest
+from agentable.aio import AsyncAgentableAgentTooling, AsyncAgentableManager
+
+
+def test_async_tools_and_ordered_on_change():
+    seen = []
+
+    async def persist(schema, change):
+        await asyncio.sleep(0)
+        seen.append(change["type"])
+
+    async def main():
+        async with AsyncAgentableManager(on_change=persist) as manager:
+            tools = AsyncAgentableAgentTooling(manager)
+            col = await manager.add_column(name="Task", type="text")
+            assert (await tools.tool_add_row({col.id: "Write docs"})).startswith("Success")
+            await manager.add_rows([{col.id: str(i)} for i in range(3)])
+            assert "Row Count: 4" in await tools.describe_table()
+            assert (await tools.format_openai())["function"]["name"] == "add_row"
+            assert len(await manager.query_view((await manager.create_view("All")).id)) == 4
+        return seen
+
+    assert asyncio.run(main()) == ["column.add", "row.add", "batch", "view.add"]
+
+
+def test_full_queue_applies_backpressure_and_errors_surface():
+    release = None
+    handled = []
+
+    async def slow(schema, change):
+        await release.wait()
+        handled.append(change["id"])
+
+    async def main():
+        nonlocal release
+        release = asyncio.Event()
+        manager = AsyncAgentableManager(on_change=slow, max_pending=2)
+        col = await manager.add_column(name="Task", type="text")
+        writer = asyncio.ensure_future(asyncio.gather(*[manager.add_row({col.id: str(i)}) for i in range(6)]))
+        await asyncio.sleep(0.2)
+        # The handler is stuck, so producers wait once the queue and the handler are full
+        assert not writer.done()
+        release.set()
+        await writer
+        await manager.drain()
+        assert len(handled) == 7
+
+        def fail(schema, change):
+            raise RuntimeError("persistence down")
+        manager.on_change = fail
+        await manager.add_row({col.id: "x"})
+        with pytest.raises(RuntimeError):
+            await manager.drain()
+        await manager.aclose()
+
+    asyncio.run(main())
+
+
+def test_outbox_overflow_is_reported_once():
+    seen = []
+
+    async def main():
+        manager = AsyncAgentableManager(on_change=lambda schema, change: seen.append(change), max_outbox=3)
+        col = await manager.add_column(name="Task", type="text")
+        # Direct edits bypass the async calls' backpressure and fill the outbox
+        for i in range(10):
+            manager.manager.add_row({col.id: str(i)})
+        await manager.drain()
+        await manager.add_row({col.id: "after"})
+        await manager.aclose()
+
+    asyncio.run(main())
+    assert [change["type"] for change in seen] == ["column.add", "row.add", "row.add", "row.add", "overflow", "row.add"]
+    assert seen[4]["dropped"] == 7
@@ -0,0 +1,155 @@
+import random
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from agentable.manager import AgentableManager
+from agentable.columnar import ColumnarAgentableManager
+
+
+def _populate(manager, seed=7, count=300):
+    rng = random.Random(seed)
+    text = manager.add_column("Name", "text")
+    price = manager.add_column("Price", "number")
+    status = manager.add_column("Status", "select", constraints={"options": [{"value": v} for v in ("a", "b", "c")]})
+    done = manager.add_column("Done", "boolean")
+    rows = []
+    for i in range(count):
+        cells = {}
+        if rng.random() < 0.9:
+            cells[text.id] = rng.choice(["alpha", "Beta", "gamma", "delta", ""]) + str(i % 7)
+        if rng.random() < 0.8:
+            cells[price.id] = rng.choice([rng.randint(0, 50), rng.random() * 50, None])
+        if rng.random() < 0.8:
+            cells[status.id] = rng.choice(["a", "b", "c", None])
+        if rng.random() < 0.8:
+            cells[done.id] = rng.choice([True, False])
+        rows.append(cells)
+    manager.add_rows(rows)
+    return text, price, status, done
+
+
+@pytest.mark.parametrize("filters,sorts", [
+    ([("Price", "gt", 20)], [("Price", "desc")]),
+    ([("Status", "isNot", "b")], [("Status", "asc"), ("Price", "desc")]),
+    ([("Name", "contains", "ET")], [("Name", "asc")]),
+    ([("Done", "is", True), ("Price", "isNotEmpty", None)], [("Done", "desc"), ("Name", "desc")]),
+    ([("Status", "isEmpty", None)], []),
+])
+def test_columnar_queries_match_row_store(filters, sorts):
+    results = []
+    for cls in (AgentableManager, ColumnarAgentableManager):
+        manager = cls()
+        columns = {c.name: c.id for c in _populate(manager)}
+        view = manager.create_view("V")
+        for name, op, value in filters:
+            manager.add_filter(view.id, columns[name], op, value)
+        for name, direction in sorts:
+            manager.add_sort(view.id, columns[name], direction)
+        names = {cid: name for name, cid in columns.items()}
+        results.append([{names[k]: v for k, v in r["cells"].items()} for r in manager.query_view(view.id)])
+    assert results[0] == results[1]
+
+
+def test_columnar_round_trip_and_mutations():
+    manager = ColumnarAgentableManager()
+    text, price, status, done = _populate(manager, count=50)
+    reference = AgentableManager(manager.to_dict())
+
+    first, second = manager.get_agentable().rows[:2]
+    manager.set_cell(first.id, price.id, "not a number", validate=False)
+    manager.update_row(second.id, {status.id: "c", "col_zzz": [1, 2]})
+    dup = manager.duplicate_row(second.id)
+    manager.move_row(dup.id, 0)
+    manager.delete_column(done.id)
+    manager.delete_rows([r.id for r in manager.get_agentable().rows[10:40]])
+
+    reference.set_cell(first.id, price.id, "not a number", validate=False)
+    reference.update_row(second.id, {status.id: "c", "col_zzz": [1, 2]})
+    reference.get_agentable().rows.insert(0, reference.get_row(second.id).model_copy(update={"id": dup.id}))
+    reference._rebuild_indexes()
+    reference.delete_column(done.id)
+    reference.delete_rows([r.id for r in reference.get_agentable().rows[10:40]])
+
+    for key in ("columns", "views", "rows"):
+        assert manager.to_dict()[key] == reference.to_dict()[key]
+        assert ColumnarAgentableManager(manager.to_dict()).to_dict()[key] == manager.to_dict()[key]
+    assert manager.row_count() == 21
+
+
+def test_columnar_aggregates():
+    manager = ColumnarAgentableManager()
+    price = manager.add_column("Price", "number")
+    status = manager.add_column("Status", "select")
+    manager.add_rows([{price.id: 1, status.id: "x"}, {price.id: 2.5, status.id: "y"}, {price.id: None, status.id: "x"}, {}])
+    assert manager.aggregate(price.id, "sum") == 3.5
+    assert manager.aggregate(price.id, "count") == 2
+    assert manager.aggregate(price.id, "nulls") == 2
+    assert manager.aggregate(price.id, "max") == 2.5
+    assert manager.aggregate(status.id, "histogram") == {"x": 2, "y": 1}
+
+
+def test_columnar_aggregates_match_row_store():
+    results = []
+    for cls in (AgentableManager, ColumnarAgentableManager):
+        manager = cls()
+        text, price, status, done = _populate(manager, count=120)
+        manager.add_rows([{text.id: "", status.id: ""}, {text.id: [], price.id: None}, {status.id: "z"}], validate=False)
+        results.append([
+            manager.aggregate(column.id, op)
+            for column in (text, price, status, done)
+            for op in ("count", "nulls", "sum", "mean", "min", "max", "histogram")
+            if op not in ("sum", "mean") or column is price
+        ])
+    assert results[0] == results[1]
+
+
+def test_columnar_schema_rows_follow_changes():
+    seen = []
+    manager = ColumnarAgentableManager(on_change=lambda schema, change: seen.append([r.cells.get(price.id) for r in schema.rows]))
+    price = manager.add_column("Price", "number")
+    rows = manager.add_rows([{price.id: 1}, {price.id: 2}])
+    manager.set_cell(rows[0].id, price.id, 5)
+    manager.move_row(rows[1].id, 0)
+    assert seen[-3:] == [[1, 2], [5, 2], [2, 5]]
+    assert [r.id for r in manager.schema.rows] == [rows[1].id, rows[0].id]
+
+
+def test_columnar_sorts_cleared_cells_in_display_order():
+    results = []
+    for cls in (AgentableManager, ColumnarAgentableManager):
+        manager = cls()
+        text, price, status, done = _populate(manager, count=120)
+        rows = list(manager.iter_rows())
+        for row in rows[::3]:
+            manager.update_row(row.id, {price.id: None, done.id: None}, validate=False)
+        view = manager.create_view("V")
+        manager.add_sort(view.id, done.id, "desc")
+        manager.add_sort(view.id, price.id, "asc")
+        position = {row.id: i for i, row in enumerate(rows)}
+        results.append([position[r["id"]] for r in manager.query_view(view.id)])
+    assert results[0] == results[1]
+
+
+def test_columnar_edits_with_handler_do_not_rebuild_rows(monkeypatch):
+    seen = []
+    manager = ColumnarAgentableManager(on_change=lambda schema, change: seen.append(len(schema.rows)))
+    price = manager.add_column("Price", "number")
+    rows = manager.add_rows([{price.id: i} for i in range(100)])
+    assert manager.schema.rows[0].cells == {price.id: 0}
+
+    def scan():
+        raise AssertionError("schema.rows was rebuilt")
+    monkeypatch.setattr(manager, "iter_rows", scan)
+    manager.set_cell(rows[0].id, price.id, 5)
+    manager.update_row(rows[1].id, {price.id: 6})
+    manager.set_cells([(rows[2].id, price.id, 7)])
+    added = manager.add_row({price.id: 8})
+    monkeypatch.undo()
+
+    assert seen[-1] == 101
+    assert [(r.id, r.cells) for r in manager.schema.rows] == [(r["id"], r["cells"]) for r in manager.to_dict()["rows"]]
+    assert manager.schema.rows[-1].id == added.id
+    manager.delete_row(rows[3].id)
+    manager.move_row(added.id, 0)
+    assert [(r.id, r.cells) for r in manager.schema.rows] == [(r["id"], r["cells"]) for r in manager.to_dict()["rows"]]
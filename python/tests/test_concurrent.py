@@ -0,0 +1,90 @@
+import threading
+import time
+import pytest
+from agentable.concurrent import ConcurrentAgentableManager, ReadWriteLock
+
+
+def test_read_write_lock_is_reentrant_and_refuses_upgrade():
+    lock = ReadWriteLock()
+    with lock.write():
+        with lock.read(), lock.write():
+            pass
+    with lock.read():
+        with lock.read():
+            pass
+        with pytest.raises(RuntimeError):
+            lock.acquire_write()
+    with lock.write():
+        pass
+
+
+def test_concurrent_writers_and_readers():
+    manager = ConcurrentAgentableManager()
+    score = manager.add_column(name="Score", type="number")
+    rows = manager.add_rows([{score.id: 0} for _ in range(40)])
+    view = manager.create_view("By score")
+    manager.add_sort(view.id, score.id, "desc")
+    materialized = manager.materialize_view(view.id)
+    errors = []
+    added = []
+
+    def bump(worker: int) -> None:
+        try:
+            mine = rows[worker::4]
+            for i in range(1, 201):
+                for row in mine:
+                    manager.set_cell(row.id, score.id, i)
+                if i % 50 == 0:
+                    added.append(manager.add_row({score.id: -1}).id)
+        except Exception as e:  # pragma: no cover - surfaced by the assertion below
+            errors.append(e)
+
+    def read() -> None:
+        try:
+            for _ in range(50):
+                table = manager.to_dict()
+                assert len(table["rows"]) == len({r["id"] for r in table["rows"]})
+                scores = [r["cells"][score.id] for r in manager.query_view(view.id)]
+                assert scores == sorted(scores, reverse=True)
+                assert manager.get_row(rows[0].id).cells[score.id] >= 0
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=bump, args=(n,)) for n in range(4)] + [threading.Thread(target=read) for _ in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert manager.row_count() == 40 + len(added) == 56
+    assert all(manager.get_row(r.id).cells[score.id] == 200 for r in rows)
+    assert materialized.row_ids()[:40] == sorted(r.id for r in rows)
+    assert set(materialized.row_ids()[40:]) == set(added)
+
+
+def test_creation_queries_and_aggregates_do_not_deadlock():
+    manager = ConcurrentAgentableManager()
+    score = manager.add_column(name="Score", type="number")
+    manager.add_rows([{score.id: i} for i in range(50)])
+    errors = []
+
+    def run(call) -> None:
+        try:
+            for _ in range(300):
+                call()
+        except Exception as e:  # pragma: no cover - surfaced by the assertion below
+            errors.append(e)
+
+    threads = [
+        threading.Thread(target=run, args=(lambda: manager.latest(5),), daemon=True),
+        threading.Thread(target=run, args=(lambda: manager.aggregate(score.id, "sum"),), daemon=True),
+        threading.Thread(target=run, args=(lambda: manager.rows_created_between(),), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 60
+    for thread in threads:
+        thread.join(timeout=max(0, deadline - time.monotonic()))
+    assert not any(thread.is_alive() for thread in threads)
+    assert not errors
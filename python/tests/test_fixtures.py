@@ -1,7 +1,8 @@
 import pytest
 import json
 import os
-from agentable.migrate import validate_agentable
+from agentable.manager import AgentableManager
+from agentable.migrate import validate_agentable, migrate_agentable
 
 FIXTURES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures"))
 
@@ -25,3 +26,25 @@ def test_invalid_fixtures():
             # Should raise ValidationError
             with pytest.raises(Exception):
                 validate_agentable(data)
+
+def test_trusted_load_matches_validated_load():
+    valid_dir = os.path.join(FIXTURES_DIR, "valid")
+    for filename in os.listdir(valid_dir):
+        if filename.endswith(".json"):
+            with open(os.path.join(valid_dir, filename), "r") as f:
+                data = json.load(f)
+            trusted = AgentableManager(json.loads(json.dumps(data)), trusted=True)
+            assert trusted.get_agentable() == validate_agentable(data)
+            assert trusted.validate() == []
+            assert migrate_agentable(dict(data), trusted=True) == validate_agentable(data)
+
+def test_trusted_load_defers_errors_to_validate():
+    with open(os.path.join(FIXTURES_DIR, "valid", "agentable_full_1.0.table.json"), "r") as f:
+        data = json.load(f)
+    data["rows"].append({"id": "NOT-AN-ID", "cells": {}})
+    data["rows"].append(dict(data["rows"][0]))
+    manager = AgentableManager(data, trusted=True)
+    problems = manager.validate()
+    assert any("NOT-AN-ID" in p for p in problems)
+    assert any("duplicate" in p for p in problems)
+    assert manager.validate_in_background(sample=1, seed=0).result(timeout=10) is not None
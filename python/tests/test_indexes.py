@@ -0,0 +1,116 @@
+import random
+from agentable.manager import AgentableManager
+from agentable.query import execute_view
+
+OPTIONS = ["a", "b", "c"]
+
+
+def _scan(manager, view_id):
+    # The same view evaluated without indexes
+    return list(execute_view(manager.get_view(view_id), manager.schema.columns, manager.schema.rows))
+
+
+def test_indexed_views_match_full_scans_under_edits():
+    rng = random.Random(3)
+    manager = AgentableManager()
+    name = manager.add_column("Name", "text")
+    price = manager.add_column("Price", "number")
+    status = manager.add_column("Status", "select", constraints={"options": [{"value": v} for v in OPTIONS]})
+    tags = manager.add_column("Tags", "select", constraints={"multiSelect": True, "options": [{"value": v} for v in OPTIONS]})
+    due = manager.add_column("Due", "date")
+    done = manager.add_column("Done", "boolean")
+
+    def cells():
+        # Unvalidated, so numbers also arrive as strings as they might from a loaded file
+        return {
+            name.id: rng.choice(["x", "y", None]),
+            price.id: rng.choice([rng.randint(0, 20), str(rng.randint(0, 20)), None]),
+            status.id: rng.choice(OPTIONS),
+            tags.id: rng.sample(OPTIONS, rng.randint(0, 3)),
+            due.id: f"2024-01-{rng.randint(1, 28):02d}",
+            done.id: rng.random() < 0.5,
+        }
+
+    manager.add_rows([cells() for _ in range(200)], validate=False)
+    for col in (name, price, status, tags, due, done):
+        manager.create_index(col.id)
+    manager.create_index(price.id, "hash")
+
+    views = []
+    for column_id, operator, value in [
+        (status.id, "is", "a"), (tags.id, "is", "b"), (price.id, "gt", 10), (price.id, "lt", "5"),
+        (price.id, "is", 7), (due.id, "gt", "2024-01-14"), (done.id, "is", "true"), (name.id, "is", "x"),
+    ]:
+        view = manager.create_view(f"{column_id} {operator}")
+        manager.add_filter(view.id, column_id, operator, value)
+        views.append(view.id)
+    both = manager.create_view("Both")
+    manager.add_filter(both.id, price.id, "gt", 5)
+    manager.add_filter(both.id, status.id, "isNot", "b")
+    views.append(both.id)
+
+    # Every view is answered from an index
+    assert all(manager._indexes.candidates(manager.get_view(view_id).filters) is not None for view_id in views)
+
+    for step in range(300):
+        ids = [r.id for r in manager.schema.rows]
+        action = rng.random()
+        if action < 0.4:
+            manager.set_cell(rng.choice(ids), rng.choice([price.id, status.id, tags.id, due.id, name.id]), cells()[rng.choice([price.id, status.id])], validate=False)
+        elif action < 0.6:
+            manager.update_row(rng.choice(ids), cells(), validate=False)
+        elif action < 0.75:
+            manager.add_row(cells(), validate=False)
+        elif action < 0.85:
+            manager.delete_row(rng.choice(ids))
+        else:
+            manager.move_row(rng.choice(ids), rng.randint(0, len(ids)))
+        if step % 20 == 0:
+            for view_id in views:
+                assert list(manager.query_view(view_id)) == _scan(manager, view_id)
+
+    usage = manager.index_memory_usage()
+    assert set(usage) == {f"{c.id}/sorted" for c in (price, due)} | {f"{c.id}/hash" for c in (name, status, tags, done, price)}
+    assert all(size > 0 for size in usage.values())
+
+    manager.delete_column(status.id)
+    assert f"{status.id}/hash" not in manager.index_memory_usage()
+    for view_id in views:
+        assert list(manager.query_view(view_id)) == _scan(manager, view_id)
+
+
+def test_text_indexes_prune_contains_prefix_and_suffix_filters():
+    rng = random.Random(5)
+    words = ["alpha", "Beta", "gamma", "delta", "ALPHABET", "betamax", "ma", "émigré"]
+    manager = AgentableManager()
+    name = manager.add_column("Name", "text")
+    tags = manager.add_column("Tags", "select", constraints={"multiSelect": True, "options": [{"value": w} for w in words]})
+    manager.add_rows([{name.id: rng.choice(words + [None, ""]), tags.id: rng.sample(words, 2)} for _ in range(100)])
+    for kind in ("trigram", "prefix", "suffix"):
+        manager.create_index(name.id, kind)
+        manager.create_index(tags.id, kind)
+
+    views = []
+    for column_id in (name.id, tags.id):
+        for operator, value in [("contains", "ALP"), ("contains", "eta"), ("contains", "mig"), ("contains", "ta"),
+                                ("startsWith", "bet"), ("startsWith", "É"), ("endsWith", "MA"), ("endsWith", "")]:
+            view = manager.create_view(f"{column_id} {operator} {value}")
+            manager.add_filter(view.id, column_id, operator, value)
+            views.append(view.id)
+
+    for step in range(100):
+        ids = [r.id for r in manager.schema.rows]
+        if step % 3 == 0:
+            manager.update_row(rng.choice(ids), {name.id: rng.choice(words), tags.id: rng.sample(words, 3)})
+        elif step % 3 == 1:
+            manager.set_cell(rng.choice(ids), name.id, rng.choice(words) + rng.choice(words))
+        else:
+            manager.delete_row(rng.choice(ids))
+        if step % 10 == 0:
+            for view_id in views:
+                assert list(manager.query_view(view_id)) == _scan(manager, view_id)
+
+    # Short needles cannot use trigrams, empty ones match every non-empty cell
+    answered = [manager._indexes.candidates(manager.get_view(view_id).filters) is not None for view_id in views]
+    assert answered == [True, True, True, False, True, True, True, False] * 2
+    assert {f"{name.id}/trigram", f"{name.id}/prefix", f"{name.id}/suffix"} <= set(manager.index_memory_usage())
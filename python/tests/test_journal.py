@@ -0,0 +1,108 @@
+import json
+import os
+import time
+from agentable.manager import AgentableManager
+from agentable.journal import AgentableJournal, apply_journal_record, recover_agentable
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid/agentable_full_1.0.table.json"))
+
+
+def _tables_equal(a: AgentableManager, b: AgentableManager) -> None:
+    assert a.get_agentable().model_dump(exclude={"schema_url"}) == b.get_agentable().model_dump(exclude={"schema_url"})
+
+
+def _edit(manager: AgentableManager) -> None:
+    task = manager.schema.columns[0].id
+    score = manager.add_column(name="Score", type="number")
+    rows = manager.add_rows([{task: f"Task {i}", score.id: i} for i in range(5)])
+    manager.set_cell(rows[0].id, score.id, 99)
+    manager.update_row(rows[1].id, {task: "Renamed"})
+    manager.move_row(rows[4].id, 0)
+    manager.duplicate_row(rows[2].id)
+    manager.delete_row(rows[3].id)
+    view = manager.create_view("Scored")
+    manager.add_sort(view.id, score.id, "desc")
+    manager.update_column(score.id, name="Points")
+    manager.update_metadata(title="Journaled")
+
+
+def test_recover_replays_journal_onto_snapshot(tmp_path):
+    with open(FIXTURE) as f:
+        manager = AgentableManager(json.load(f))
+    path, snapshot = str(tmp_path / "table.journal"), str(tmp_path / "table.snapshot.json")
+
+    with AgentableJournal(manager, path, snapshot_path=snapshot, sync_every=4):
+        _edit(manager)
+    _tables_equal(recover_agentable(path, snapshot), manager)
+
+    # A crash after the new snapshot lands but before the journal is reset must not replay it twice
+    with open(path) as f:
+        stale = f.read()
+    journal = AgentableJournal(manager, path, snapshot_path=snapshot)
+    journal.snapshot()
+    journal.close()
+    with open(path, "w") as f:
+        f.write(stale)
+    _tables_equal(recover_agentable(path, snapshot), manager)
+
+    # Reattaching after such a crash drops the stale records
+    with AgentableJournal(manager, path, snapshot_path=snapshot):
+        manager.add_row({manager.schema.columns[0].id: "After crash"})
+    _tables_equal(recover_agentable(path, snapshot), manager)
+
+
+def test_snapshot_truncates_journal_and_torn_tail_is_ignored(tmp_path):
+    manager = AgentableManager()
+    manager.add_column(name="Task", type="text")
+    path, snapshot = str(tmp_path / "table.journal"), str(tmp_path / "table.snapshot.json")
+
+    journal = AgentableJournal(manager, path, snapshot_path=snapshot, snapshot_every=10)
+    _edit(manager)
+    journal.close()
+    with open(path) as f:
+        assert len(f.readlines()) < 10
+
+    with open(path, "a") as f:
+        f.write('{"op":"row.delete","id":')
+    _tables_equal(recover_agentable(path, snapshot), manager)
+
+    with AgentableJournal(manager, path, snapshot_path=snapshot):
+        row = manager.add_row({})
+    recovered = recover_agentable(path, snapshot)
+    assert recovered.get_row(row.id) is not None
+    _tables_equal(recovered, manager)
+
+
+def test_idle_journal_commits_pending_records(tmp_path):
+    manager = AgentableManager()
+    task = manager.add_column(name="Task", type="text")
+    path = str(tmp_path / "table.journal")
+    journal = AgentableJournal(manager, path, sync_every=1000, sync_interval=0.05)
+    rows = [manager.add_row({task.id: "first"}), manager.add_row({task.id: "second"})]
+    # No further writes: the timer commits both records
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline and len(recover_agentable(path).schema.rows) < 2:
+        time.sleep(0.02)
+    assert [r.id for r in recover_agentable(path).schema.rows] == [r.id for r in rows]
+    journal.close()
+
+
+def test_replayed_edits_reach_listeners():
+    manager = AgentableManager()
+    score = manager.add_column(name="Score", type="number")
+    row = manager.add_row({score.id: 1})
+    assert manager.aggregate(score.id, "sum") == 1
+    apply_journal_record(manager, {"op": "row.update", "id": row.id, "cells": {score.id: 5}})
+    assert manager.aggregate(score.id, "sum") == 5
+    apply_journal_record(manager, {"op": "cell.update", "id": row.id, "columnId": score.id, "value": 7})
+    assert manager.aggregate(score.id, "sum") == 7
+    assert manager.get_row(row.id).cells == {score.id: 7}
+
+
+def test_replayed_metadata_notifies_listeners():
+    manager = AgentableManager({"metadata": {"title": "Old", "description": "Gone soon"}, "columns": []})
+    seen = []
+    manager.add_listener(lambda schema, change: seen.append(change["type"]))
+    apply_journal_record(manager, {"op": "metadata.update", "metadata": {"title": "New"}})
+    assert seen == ["metadata.update"]
+    assert manager.schema.metadata.title == "New" and manager.schema.metadata.description is None
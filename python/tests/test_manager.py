@@ -1,6 +1,8 @@
+import re
 import pytest
 from unittest.mock import patch
 from agentable.manager import AgentableManager
+from agentable.models import RowIdAllocator
 from agentable.tools import AgentableAgentTooling
 
 def test_manager_initialization():
@@ -38,17 +40,30 @@ def test_prevent_col_id_collision():
         assert len(manager.get_agentable().columns) == 2
 
 def test_prevent_row_id_collision():
-    manager = AgentableManager()
-    
-    # Mock to return the same ID twice, then a new one
-    with patch('agentable.manager.generate_row_id', side_effect=["000000000abc", "000000000abc", "000000000xyz"]):
-        manager.add_row({})
-        
-        # This insertion would collide with "000000000abc", so it should loop and draw "000000000xyz"
-        row2 = manager.add_row({})
-        
-        assert row2.id == "000000000xyz"
-        assert len(manager.get_agentable().rows) == 2
+    # A row whose ID is ahead of the clock (e.g. from another replica) must not be reused
+    manager = AgentableManager({"metadata": {"title": "T"}, "rows": [{"id": "zz0000000abc", "cells": {}}]})
+    row1 = manager.add_row({})
+    rows = manager.add_rows([{} for _ in range(1000)])
+    row2 = manager.add_row({})
+
+    ids = ["zz0000000abc", row1.id] + [r.id for r in rows] + [row2.id]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids) == len(manager.get_agentable().rows)
+    assert all(len(id) == 12 for id in ids)
+
+    # Deleting the newest row does not free its ID
+    manager.delete_row(row2.id)
+    assert manager.add_row({}).id > row2.id
+
+def test_row_id_allocator_carries_into_next_millisecond():
+    allocator = RowIdAllocator()
+    # More IDs than one millisecond's 46656 suffixes
+    ids = allocator.reserve(100_000) + [allocator.next()]
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert all(re.fullmatch(r"[a-z0-9]{12}", id) for id in ids)
+    allocator.observe("zzzzzzzzzzzz")
+    with pytest.raises(ValueError):
+        allocator.next()
 
 def test_crud_columns():
     manager = AgentableManager()
@@ -75,3 +90,120 @@ def test_agent_tooling():
     desc = tools.describe_table()
     assert "# New Table" in desc
     assert "**Age** (number)" in desc
+
+def test_indexes_follow_row_mutations():
+    manager = AgentableManager()
+    rows = [manager.add_row({}) for _ in range(5)]
+    manager.move_row(rows[4].id, 0)
+    dup = manager.duplicate_row(rows[1].id)
+    manager.delete_row(rows[2].id)
+    manager.move_row(rows[0].id, -1)
+
+    ordered = manager.get_agentable().rows
+    assert [r.id for r in ordered] == [rows[4].id, rows[1].id, dup.id, rows[0].id, rows[3].id]
+    for i, row in enumerate(ordered):
+        assert manager.get_row(row.id) is row
+        assert manager._row_position(row.id) == i
+    assert manager.get_row(rows[2].id) is None
+
+def test_indexes_load_from_initial_schema():
+    manager = AgentableManager({
+        "metadata": {"title": "Loaded"},
+        "columns": [{"id": "col_abc", "name": "Name", "type": "text"}],
+        "views": [{"id": "view_abc", "name": "All"}],
+        "rows": [{"id": "000000000abc", "cells": {"col_abc": "Bob"}}],
+    })
+    assert manager.get_column("col_abc").name == "Name"
+    assert manager.get_view("view_abc").name == "All"
+    manager.set_cell("000000000abc", "col_abc", "Alice")
+    assert manager.get_row("000000000abc").cells["col_abc"] == "Alice"
+
+def test_bulk_row_operations_notify_once():
+    events = []
+    manager = AgentableManager(on_change=lambda schema, change: events.append(change))
+    col = manager.add_column(name="Score", type="number")
+    events.clear()
+
+    rows = manager.add_rows([{col.id: i} for i in range(100)])
+    assert len({r.id for r in rows}) == 100
+    assert [r.id for r in manager.get_agentable().rows] == [r.id for r in rows]
+
+    manager.update_rows({rows[0].id: {col.id: -1}})
+    manager.set_cells([(rows[1].id, col.id, 42), (rows[2].id, col.id, 43)])
+    manager.delete_rows([r.id for r in rows[50:]])
+
+    assert [e["type"] for e in events] == ["batch"] * 4
+    assert len(events[0]["changes"]) == 100
+    assert events[2]["changes"][1] == {"type": "cell.update", "id": rows[2].id, "columnId": col.id}
+    assert len(manager.get_agentable().rows) == 50
+    assert manager.get_row(rows[0].id).cells[col.id] == -1
+    assert manager.get_row(rows[99].id) is None
+    assert manager._row_position(rows[49].id) == 49
+
+def test_bulk_set_cells_is_all_or_nothing():
+    manager = AgentableManager()
+    col = manager.add_column(name="Score", type="number")
+    row = manager.add_row({col.id: 1})
+    with pytest.raises(ValueError):
+        manager.set_cells([(row.id, col.id, 2), (row.id, col.id, "bad")])
+    assert row.cells[col.id] == 1
+
+def test_cell_constraints_are_enforced():
+    manager = AgentableManager()
+    name = manager.add_column(name="Name", type="text", constraints={"required": True, "pattern": "^[A-Z]", "max": 5})
+    score = manager.add_column(name="Score", type="number", constraints={"min": 0, "max": 10})
+    due = manager.add_column(name="Due", type="date")
+    site = manager.add_column(name="Site", type="url")
+    status = manager.add_column(name="Status", type="select", constraints={"options": [{"value": "Todo"}, {"value": "Done"}]})
+
+    row = manager.add_row({name.id: "Bob", score.id: 3, due.id: "2024-01-31T12:00:00Z", site.id: "https://example.com"})
+    for cells in ({score.id: 1}, {name.id: "bob"}, {name.id: "Robert"}, {name.id: "Bob", score.id: 11}):
+        with pytest.raises(ValueError):
+            manager.add_row(cells)
+    for col_id, value in ((score.id, -1), (score.id, True), (due.id, "31/01/2024"), (site.id, "example.com"), (status.id, "Doing"), (name.id, None)):
+        with pytest.raises(ValueError):
+            manager.set_cell(row.id, col_id, value)
+    with pytest.raises(ValueError):
+        manager.update_rows({row.id: {score.id: 5}, manager.add_row({name.id: "Al"}).id: {score.id: 50}})
+    assert row.cells[score.id] == 3
+
+    manager.update_rows({row.id: {score.id: 50}}, validate=False)
+    assert row.cells[score.id] == 50
+    manager.update_rows({row.id: {score.id: 3}})
+    manager.add_row({score.id: 1}, validate=False)
+    manager.update_row(row.id, {due.id: "2024-02-01", status.id: "Done"})
+    manager.update_column(status.id, constraints={"options": [{"value": "Doing"}]})
+    manager.set_cell(row.id, status.id, "Doing")
+    with pytest.raises(ValueError):
+        manager.set_cell(row.id, status.id, "Done")
+
+def test_delete_where_tombstones_rows():
+    changes = []
+    manager = AgentableManager()
+    status = manager.add_column("Status", "text")
+    rows = manager.add_rows([{status.id: "old" if i % 3 == 0 else "new"} for i in range(30)])
+    view = manager.create_view("Expired")
+    manager.add_filter(view.id, status.id, "is", "old")
+
+    # Below the compaction ratio the deleted rows stay in the list, hidden from every reader
+    manager.delete_rows([rows[1].id, rows[2].id, "missing"])
+    assert manager._tombstones == {rows[1].id, rows[2].id}
+    assert manager.row_count() == 28
+    assert manager.get_row(rows[1].id) is None
+    assert rows[1] not in manager.schema.rows
+    assert not manager._tombstones
+
+    # on_change handlers see the compacted table, and one batch per call
+    manager.on_change = lambda schema, change: changes.append((len(schema.rows), change))
+
+    deleted = manager.delete_where(view.id)
+    assert deleted == [r.id for r in rows[::3]]
+    assert len(changes) == 1 and changes[0][0] == 18
+    assert changes[0][1]["type"] == "batch" and [c["id"] for c in changes[0][1]["changes"]] == deleted
+    assert manager.delete_where(lambda row: row.id == rows[4].id) == [rows[4].id]
+
+    expected = [r.id for i, r in enumerate(rows) if i % 3 and i not in (1, 2, 4)]
+    assert [r["id"] for r in manager.to_dict()["rows"]] == expected
+    assert not manager._tombstones
+    manager.move_row(expected[0], 5)
+    assert manager.schema.rows[5].id == expected[0]
@@ -0,0 +1,71 @@
+import json
+import os
+import pytest
+from agentable.manager import AgentableManager
+from agentable.merge import merge_agentable
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid/agentable_full_1.0.table.json"))
+
+
+def _replicas():
+    with open(FIXTURE) as f:
+        data = json.load(f)
+    return [AgentableManager(json.loads(json.dumps(data))) for _ in range(3)]
+
+
+def test_three_way_merge_combines_edits_and_reports_conflicts():
+    base, ours, theirs = _replicas()
+    task = base.schema.columns[0].id
+    first, second = [r.id for r in base.schema.rows]
+
+    ours.set_cell(first, task, "Ours")
+    theirs.set_cell(first, task, "Theirs")
+    theirs.set_cell(second, task, "Only theirs")
+    ours.delete_row(second)
+    added = theirs.add_row({task: "New in theirs"})
+    ours.update_metadata(title="Merged title")
+    score = theirs.add_column(name="Score", type="number")
+    view = ours.create_view("Mine")
+    ours.add_filter(view.id, task, "contains", "milk")
+
+    merged, conflicts = merge_agentable(base.schema, ours.schema, theirs.to_dict())
+    assert sorted(c["path"] for c in conflicts) == sorted([f"/rows/{first}/cells/{task}", f"/rows/{second}"])
+    cell = next(c for c in conflicts if c["path"].endswith(task))
+    assert (cell["base"], cell["ours"], cell["theirs"], cell["resolved"]) == ("Buy milk", "Ours", "Theirs", "Ours")
+
+    assert merged.metadata.title == "Merged title"
+    assert [c.id for c in merged.columns][-1] == score.id
+    assert [f.value for f in next(v for v in merged.views if v.id == view.id).filters] == ["milk"]
+    assert [r.id for r in merged.rows] == [first, added.id]
+    assert merged.rows[0].cells[task] == "Ours"
+
+    merged, _ = merge_agentable(base.schema, ours.schema, theirs.schema, policy="theirs")
+    assert [r.id for r in merged.rows] == [first, second, added.id]
+    assert merged.rows[1].cells[task] == "Only theirs"
+
+    merged, _ = merge_agentable(base.schema, ours.schema, theirs.schema, policy=lambda c: c.get("theirs", c.get("ours")) if "cells" in c["path"] else None)
+    assert [r.id for r in merged.rows] == [first, added.id]
+    assert merged.rows[0].cells[task] == "Theirs"
+
+    with pytest.raises(ValueError):
+        merge_agentable(base.schema, ours.schema, theirs.schema, policy="raise")
+
+
+def test_column_delete_drops_cells_and_view_references():
+    base, ours, theirs = _replicas()
+    task, status = base.schema.columns[0].id, base.schema.columns[1].id
+    view = base.create_view("By status")
+    base.add_sort(view.id, status, "asc")
+    for replica in (ours, theirs):
+        replica.apply_patch([{"op": "add", "path": f"/views/{view.id}", "value": base.get_view(view.id).model_dump()}])
+    ours.delete_column(status)
+    theirs.set_cell(base.schema.rows[0].id, task, "Still merged")
+
+    merged, conflicts = merge_agentable(base.schema, ours.schema, theirs.schema)
+    assert conflicts == []
+    assert status not in [c.id for c in merged.columns]
+    assert all(status not in r.cells for r in merged.rows)
+    assert merged.views[-1].sorts == []
+    assert merged.rows[0].cells[task] == "Still merged"
+    # The inputs are not modified
+    assert status in theirs.schema.rows[0].cells
@@ -0,0 +1,54 @@
+from agentable import AgentableManager, ConcurrentAgentableManager
+from agentable.metrics import LatencyHistogram
+
+
+def test_metrics_time_operations_and_steps():
+    changes = []
+    manager = AgentableManager(on_change=lambda schema, change: changes.append(change))
+    assert manager.stats() == {}
+    exported = []
+    manager.enable_metrics(exporter=lambda name, seconds: exported.append(name))
+    col = manager.add_column("Name", "text")
+    for i in range(5):
+        row = manager.add_row({col.id: f"row {i}"})
+    manager.set_cell(row.id, col.id, "edited")
+    stats = manager.stats()
+    assert stats["add_row"]["count"] == 5
+    assert stats["add_column"]["count"] == 1
+    assert stats["validate_cells"]["count"] == 5
+    assert stats["validate_cell"]["count"] == 1
+    assert stats["new_row_id"]["count"] == 5
+    assert stats["pydantic"]["count"] == 6
+    assert stats["on_change"]["count"] == len(changes) == 7
+    summary = stats["add_row"]
+    assert 0 < summary["p50"] <= summary["p99"] <= summary["max"]
+    assert exported.count("add_row") == 5
+
+    # Disabled: the plain methods are back and nothing more is recorded
+    manager.disable_metrics()
+    assert "add_row" not in manager.__dict__
+    manager.add_row({col.id: "untimed"})
+    assert manager.stats()["add_row"]["count"] == 5
+
+
+def test_metrics_on_concurrent_manager():
+    manager = ConcurrentAgentableManager()
+    manager.enable_metrics()
+    col = manager.add_column("Name", "text")
+    row = manager.add_row({col.id: "a"})
+    manager.update_row(row.id, {col.id: "b"})
+    assert list(manager.query_view(manager.create_view("All").id))
+    stats = manager.stats()
+    assert stats["update_row"]["count"] == 1
+    assert stats["query_view"]["count"] == 1
+
+
+def test_latency_histogram_percentiles():
+    histogram = LatencyHistogram()
+    for _ in range(98):
+        histogram.record(0.001)
+    histogram.record(0.5)
+    histogram.record(1.0)
+    assert 0.001 <= histogram.percentile(0.5) < 0.0011
+    assert 0.5 <= histogram.percentile(0.99) < 0.55
+    assert histogram.summary()["max"] == 1.0
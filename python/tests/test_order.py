@@ -0,0 +1,65 @@
+import random
+from agentable.manager import AgentableManager
+from agentable.order import RowOrder
+
+
+def test_row_order_matches_list():
+    rng = random.Random(3)
+    order = RowOrder(block_size=4)
+    expected = []
+    counter = 0
+    for step in range(3000):
+        action = rng.random()
+        if action < 0.35 or not expected:
+            counter += 1
+            id = f"r{counter}"
+            index = rng.randint(-len(expected) - 2, len(expected) + 2)
+            expected.insert(index, id)
+            order.insert(index, id)
+        elif action < 0.45:
+            ids = [f"b{counter}_{i}" for i in range(rng.randint(0, 12))]
+            counter += 1
+            expected.extend(ids)
+            order.extend(ids)
+        elif action < 0.65:
+            id = rng.choice(expected)
+            expected.remove(id)
+            order.remove(id)
+        elif action < 0.7:
+            doomed = set(rng.sample(expected, min(len(expected), 5)))
+            expected = [id for id in expected if id not in doomed]
+            order.remove_many(doomed)
+        else:
+            id = rng.choice(expected)
+            index = rng.randint(-len(expected) - 2, len(expected) + 2)
+            expected.remove(id)
+            expected.insert(index, id)
+            order.move(id, index)
+        if expected:
+            probe = rng.choice(expected)
+            assert order.position(probe) == expected.index(probe)
+            index = rng.randrange(len(expected))
+            assert order[index] == expected[index]
+        if step % 100 == 0:
+            assert list(order) == expected
+            subset = rng.sample(expected, min(len(expected), 7)) + ["missing"]
+            assert order.in_order(subset) == [id for id in expected if id in subset]
+    assert len(order) == len(expected)
+    assert order.position("missing") == -1
+
+
+def test_manager_positions_follow_moves():
+    manager = AgentableManager()
+    col = manager.add_column("N", "number")
+    rows = manager.add_rows([{col.id: i} for i in range(2000)])
+    rng = random.Random(5)
+    for _ in range(300):
+        row = rng.choice(rows)
+        manager.move_row(row.id, rng.randint(0, 1999))
+    dup = manager.duplicate_row(rows[10].id)
+    manager.delete_row(rows[20].id)
+    listed = [r.id for r in manager.schema.rows]
+    assert listed.index(dup.id) == listed.index(rows[10].id) + 1
+    for row in rng.sample(manager.schema.rows, 50):
+        assert manager._row_position(row.id) == listed.index(row.id)
+    assert list(manager._order) == listed
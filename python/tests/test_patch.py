@@ -0,0 +1,97 @@
+import json
+import os
+import random
+import pytest
+from agentable.manager import AgentableManager
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid/agentable_full_1.0.table.json"))
+
+
+def _load() -> dict:
+    with open(FIXTURE) as f:
+        return json.load(f)
+
+
+def _state(manager: AgentableManager) -> dict:
+    return manager.get_agentable().model_dump(exclude={"schema_url"})
+
+
+def test_diff_since_is_minimal_and_applies():
+    server = AgentableManager(_load())
+    client = AgentableManager(_load())
+    task = server.schema.columns[0].id
+    first, second = [r.id for r in server.schema.rows]
+
+    token = server.checkpoint()
+    assert server.diff_since(token) == []
+    server.set_cell(first, task, "Buy oat milk")
+    server.set_cell(first, task, "Buy soy milk")
+    temp = server.add_row({task: "Temporary"})
+    server.delete_row(temp.id)
+
+    patch = server.diff_since(token)
+    assert patch == [{"op": "replace", "path": f"/rows/{first}/cells/{task}", "value": "Buy soy milk"}]
+    client.apply_patch(patch)
+    assert _state(client) == _state(server)
+
+    token = server.checkpoint()
+    score = server.add_column(name="Score", type="number")
+    added = server.add_rows([{task: f"New {i}", score.id: i} for i in range(3)])
+    server.move_row(second, 0)
+    server.move_row(added[1].id, 1)
+    server.delete_row(first)
+    view = server.create_view("Scored")
+    server.add_sort(view.id, score.id, "asc")
+    server.update_metadata(title="Synced")
+    client.apply_patch(server.diff_since(token))
+    assert _state(client) == _state(server)
+
+    token = server.checkpoint()
+    server.delete_column(server.schema.columns[1].id)
+    server.update_row(added[0].id, {task: "Renamed"})
+    client.apply_patch(server.diff_since(token))
+    assert _state(client) == _state(server)
+
+    with pytest.raises(ValueError):
+        server.diff_since(token + 100)
+
+
+def test_random_edits_round_trip_through_patches():
+    rng = random.Random(7)
+    server = AgentableManager(_load())
+    client = AgentableManager(_load())
+    task = server.schema.columns[0].id
+    for _ in range(20):
+        token = server.checkpoint()
+        for _ in range(rng.randint(1, 15)):
+            ids = [r.id for r in server.schema.rows]
+            action = rng.random()
+            if action < 0.3 or not ids:
+                server.add_row({task: str(rng.random())})
+            elif action < 0.5:
+                server.move_row(rng.choice(ids), rng.randint(0, len(ids)))
+            elif action < 0.7:
+                server.set_cell(rng.choice(ids), task, str(rng.random()))
+            elif action < 0.85:
+                server.duplicate_row(rng.choice(ids))
+            else:
+                server.delete_row(rng.choice(ids))
+        client.apply_patch(server.diff_since(token))
+        assert _state(client) == _state(server)
+
+
+def test_patched_view_rebuilds_materialized_view():
+    source = AgentableManager()
+    score = source.add_column(name="Score", type="number")
+    source.add_rows([{score.id: i} for i in (3, 1, 4, 2)])
+    view = source.create_view("Top")
+    target = AgentableManager(source.to_dict())
+    materialized = target.materialize_view(view.id)
+
+    token = source.checkpoint()
+    source.add_filter(view.id, score.id, "gt", 2)
+    source.add_sort(view.id, score.id, "desc")
+    target.apply_patch(source.diff_since(token))
+    expected = [r["id"] for r in target.query_view(view.id)]
+    assert len(expected) == 2
+    assert [r["id"] for r in materialized.rows()] == expected
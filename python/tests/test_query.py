@@ -0,0 +1,128 @@
+import pytest
+from agentable.manager import AgentableManager
+
+
+@pytest.fixture
+def manager():
+    manager = AgentableManager()
+    manager.add_column("Task", "text")
+    manager.add_column("Price", "number")
+    manager.add_column("Status", "select", constraints={"options": [{"value": "Todo"}, {"value": "Done"}]})
+    manager.add_column("Done", "boolean")
+    return manager
+
+
+def _ids(columns):
+    return [c.id for c in columns]
+
+
+def test_query_view_filters_and_projects(manager):
+    task, price, status, done = _ids(manager.get_agentable().columns)
+    manager.add_row({task: "Write docs", price: 10, status: "Todo", done: False})
+    manager.add_row({task: "Fix bug", price: 30, status: "Done", done: True})
+    manager.add_row({task: "Write tests", price: 20, status: "Todo"})
+
+    view = manager.create_view("Writing")
+    manager.add_filter(view.id, task, "startsWith", "write")
+    manager.add_filter(view.id, price, "gt", 15)
+    manager.set_column_visibility(view.id, done, False)
+    manager.update_view(view.id, columnOrder=[price, task])
+
+    result = list(manager.query_view(view.id))
+    assert len(result) == 1
+    assert list(result[0]["cells"]) == [price, task, status]
+    assert result[0]["cells"][task] == "Write tests"
+
+
+@pytest.mark.parametrize("operator,value,expected", [
+    ("is", "Todo", ["a", "c"]),
+    ("isNot", "Todo", ["b", "d"]),
+    ("contains", "OD", ["a", "c"]),
+    ("endsWith", "ne", ["b"]),
+    ("isEmpty", None, ["d"]),
+    ("isNotEmpty", None, ["a", "b", "c"]),
+])
+def test_filter_operators(manager, operator, value, expected):
+    task, _, status, _ = _ids(manager.get_agentable().columns)
+    for name, state in [("a", "Todo"), ("b", "Done"), ("c", "Todo"), ("d", None)]:
+        manager.add_row({task: name, status: state})
+    view = manager.create_view("V")
+    manager.add_filter(view.id, status, operator, value)
+    assert [r["cells"][task] for r in manager.query_view(view.id)] == expected
+
+
+def test_multi_key_sort_is_stable_with_nulls_last(manager):
+    task, price, status, _ = _ids(manager.get_agentable().columns)
+    manager.add_row({task: "a", price: 5, status: "Todo"})
+    manager.add_row({task: "b", price: 1, status: "Done"})
+    manager.add_row({task: "c", status: "Todo"})
+    manager.add_row({task: "d", price: 9, status: "Todo"})
+    manager.add_row({task: "e", price: 5, status: "Done"})
+
+    view = manager.create_view("Sorted")
+    manager.add_sort(view.id, status, "desc")
+    manager.add_sort(view.id, price, "asc")
+
+    assert [r["cells"][task] for r in manager.query_view(view.id)] == ["a", "d", "c", "b", "e"]
+    assert [r["cells"][task] for r in manager.query_view(view.id, limit=2, offset=1)] == ["d", "c"]
+
+
+def test_query_view_unknown_view(manager):
+    with pytest.raises(ValueError):
+        manager.query_view("view_zzz")
+
+
+def test_materialized_view_tracks_changes(manager):
+    task, price, status, _ = _ids(manager.get_agentable().columns)
+    view = manager.create_view("Open by price")
+    manager.add_filter(view.id, status, "is", "Todo")
+    manager.add_sort(view.id, price, "desc")
+
+    a = manager.add_row({task: "a", price: 1, status: "Todo"})
+    materialized = manager.materialize_view(view.id)
+    b = manager.add_row({task: "b", price: 3, status: "Todo"})
+    c = manager.add_rows([{task: "c", price: 2, status: "Done"}])[0]
+    assert materialized.row_ids() == [b.id, a.id]
+
+    manager.set_cell(c.id, status, "Todo")
+    manager.update_row(a.id, {price: 5})
+    assert materialized.row_ids() == [a.id, b.id, c.id]
+
+    manager.delete_row(b.id)
+    manager.set_cell(a.id, task, "renamed")
+    assert [r["cells"][task] for r in materialized.rows()] == ["renamed", "c"]
+
+    manager.remove_sort(view.id, view.sorts[0].id)
+    manager.add_sort(view.id, price, "asc")
+    assert materialized.row_ids() == [r["id"] for r in manager.query_view(view.id)]
+
+    manager.delete_column(status)
+    assert len(materialized) == 2
+
+
+@pytest.mark.parametrize("sorted_view", [False, True])
+def test_materialized_view_ties_follow_display_order(manager, sorted_view):
+    task, price, status, _ = _ids(manager.get_agentable().columns)
+    view = manager.create_view("Ties")
+    if sorted_view:
+        manager.add_sort(view.id, price, "asc")
+    rows = manager.add_rows([{task: str(i), price: i % 2} for i in range(6)])
+    materialized = manager.materialize_view(view.id)
+    manager.move_row(rows[4].id, 0)
+    manager.duplicate_row(rows[1].id)
+    manager.set_cell(rows[5].id, price, 0)
+    manager.move_row(rows[0].id, manager.row_count() - 1)
+    assert materialized.row_ids() == [r["id"] for r in manager.query_view(view.id)]
+
+
+def test_materialized_view_with_descending_text_sort(manager):
+    task, price, status, _ = _ids(manager.get_agentable().columns)
+    manager.add_rows([{task: name, price: i} for i, name in enumerate(["b", "c", "a", "c"])])
+    view = manager.create_view("By task")
+    manager.add_sort(view.id, task, "desc")
+    materialized = manager.materialize_view(view.id)
+    assert materialized.row_ids() == [r["id"] for r in manager.query_view(view.id)]
+    manager.add_sort(view.id, status, "desc")
+    assert materialized.row_ids() == [r["id"] for r in manager.query_view(view.id)]
+    manager.remove_sort(view.id, view.sorts[0].id)
+    assert materialized.row_ids() == [r["id"] for r in manager.query_view(view.id)]
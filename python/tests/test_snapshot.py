@@ -0,0 +1,58 @@
+import io
+import json
+import os
+import pytest
+from agentable.manager import AgentableManager
+from agentable.snapshot import open_snapshot
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid/agentable_full_1.0.table.json"))
+
+
+def _json(writer) -> dict:
+    out = io.StringIO()
+    writer.write_json(out)
+    return json.loads(out.getvalue())
+
+
+def test_snapshot_round_trip_is_lossless(tmp_path):
+    with open(FIXTURE) as f:
+        manager = AgentableManager(json.load(f))
+    task, status = manager.schema.columns[0].id, manager.schema.columns[1].id
+    manager.add_rows([{task: "naïve ✓", status: None}, {task: "x", "col_zzz": [1, 2.5, {"a": None}]}, {}], validate=False)
+    manager.set_cell(manager.schema.rows[0].id, task, "")
+    path = str(tmp_path / "table.agtb")
+    assert manager.write_snapshot(path) == 5
+
+    with open_snapshot(path) as snapshot:
+        assert len(snapshot) == 5
+        assert snapshot.header.metadata == manager.schema.metadata
+        assert _json(snapshot) == _json(manager)
+        assert snapshot.to_agentable() == manager.get_agentable()
+
+        rows = manager.schema.rows
+        assert snapshot.row(3) == rows[3]
+        assert snapshot.cell(2, status) is None and status in snapshot.cells(2)
+        assert status not in snapshot.cells(3)
+        for index, row in enumerate(rows):
+            assert snapshot.index_of(row.id) == index
+            assert snapshot.get_row(row.id) == row
+        assert snapshot.get_row("zzzzzzzzzzzz") is None
+        with pytest.raises(IndexError):
+            snapshot.row(5)
+
+    reloaded = AgentableManager(open_snapshot(path).to_dict(), trusted=True)
+    assert _json(reloaded) == _json(manager)
+
+
+def test_empty_and_invalid_snapshots(tmp_path):
+    path = str(tmp_path / "empty.agtb")
+    AgentableManager().write_snapshot(path)
+    with open_snapshot(path) as snapshot:
+        assert len(snapshot) == 0
+        assert list(snapshot) == []
+        assert snapshot.index_of("000000000abc") == -1
+
+    bad = tmp_path / "bad.agtb"
+    bad.write_bytes(b"{}" * 40)
+    with pytest.raises(ValueError):
+        open_snapshot(str(bad))
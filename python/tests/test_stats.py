@@ -0,0 +1,101 @@
+import math
+import random
+import pytest
+from agentable.manager import AgentableManager
+from agentable.stats import ColumnStatistics
+
+
+def _scan(manager, column_id, group_id=None):
+    groups = {}
+    for row in manager.iter_rows():
+        value = row.cells.get(column_id)
+        group = row.cells.get(group_id) if group_id else None
+        groups.setdefault(group, []).append(value)
+    result = {}
+    for group, values in groups.items():
+        filled = [v for v in values if v is not None and v != ""]
+        result[group] = {
+            "count": len(filled),
+            "nulls": len(values) - len(filled),
+            "distinct": len(set(filled)),
+            "sum": float(sum(filled)),
+            "min": min(filled, default=None),
+            "max": max(filled, default=None),
+        }
+    return result
+
+
+def test_statistics_follow_edits():
+    rng = random.Random(7)
+    manager = AgentableManager()
+    price = manager.add_column("Price", "number")
+    status = manager.add_column("Status", "select", constraints={"options": [{"value": "todo"}, {"value": "done"}, {"value": "idle"}]})
+    manager.add_rows([{price.id: rng.choice([None, 1, 2.5, 7, 10]), status.id: rng.choice(["todo", "done"])} for _ in range(200)])
+
+    assert manager.aggregate() == 200
+    assert manager.aggregate(status.id, "histogram")["idle"] == 0
+    # Build the summaries first, then check they keep up
+    for op in ("count", "nulls", "distinct", "sum", "min", "max"):
+        manager.aggregate(price.id, op)
+        manager.aggregate(price.id, op, group_by=status.id)
+
+    for step in range(400):
+        ids = [row.id for row in manager.iter_rows()]
+        action = rng.random()
+        if action < 0.4:
+            manager.set_cell(rng.choice(ids), price.id, rng.choice([None, 0, 3, 7, 10, 12.5]))
+        elif action < 0.6:
+            manager.update_row(rng.choice(ids), {status.id: rng.choice(["todo", "done", "idle"])})
+        elif action < 0.8:
+            manager.add_row({price.id: rng.choice([None, 4, 10])})
+        else:
+            manager.delete_rows(rng.sample(ids, 3))
+
+    expected = _scan(manager, price.id)[None]
+    for op, value in expected.items():
+        assert manager.aggregate(price.id, op) == value, op
+    assert manager.aggregate(price.id, "mean") == expected["sum"] / expected["count"]
+    grouped = _scan(manager, price.id, status.id)
+    for op in ("count", "nulls", "distinct", "sum", "min", "max"):
+        assert manager.aggregate(price.id, op, group_by=status.id) == {g: stats[op] for g, stats in grouped.items()}
+    assert manager.aggregate(group_by=status.id) == {g: stats["count"] + stats["nulls"] for g, stats in grouped.items()}
+    assert manager.aggregate(status.id, "histogram") == {
+        "todo": len([r for r in manager.iter_rows() if r.cells.get(status.id) == "todo"]),
+        "done": len([r for r in manager.iter_rows() if r.cells.get(status.id) == "done"]),
+        "idle": len([r for r in manager.iter_rows() if r.cells.get(status.id) == "idle"]),
+    }
+
+
+def test_statistics_follow_column_changes():
+    manager = AgentableManager()
+    tags = manager.add_column("Tags", "select", constraints={"multiSelect": True, "options": [{"value": "a"}, {"value": "b"}]})
+    flag = manager.add_column("Flag", "boolean")
+    manager.add_rows([{tags.id: ["a", "b"], flag.id: True}, {tags.id: ["a"], flag.id: False}, {tags.id: [], flag.id: True}])
+
+    assert manager.aggregate(tags.id, "histogram") == {"a": 2, "b": 1}
+    assert manager.aggregate(tags.id, "count", group_by=flag.id) == {True: 1, False: 1}
+    assert manager.aggregate(flag.id, "count", group_by=tags.id) == {"a": 2, "b": 1, None: 1}
+
+    manager.update_column(tags.id, constraints={"multiSelect": True, "options": [{"value": "a"}, {"value": "b"}, {"value": "c"}]})
+    assert manager.aggregate(tags.id, "histogram") == {"a": 2, "b": 1, "c": 0}
+    manager.delete_column(flag.id)
+    assert manager.aggregate(tags.id, "summary")["nulls"] == 1
+    with pytest.raises(ValueError):
+        manager.aggregate(tags.id, "count", group_by=flag.id)
+
+
+def test_running_sum_matches_fresh_summary():
+    rng = random.Random(11)
+    manager = AgentableManager()
+    price = manager.add_column("Price", "number")
+    rows = manager.add_rows([{price.id: 0.1} for _ in range(50)])
+    manager.aggregate(price.id, "sum")
+    # Large and tiny values together lose the tiny ones' bits in a float running sum
+    for _ in range(5000):
+        manager.set_cell(rng.choice(rows).id, price.id, rng.choice([0.1, 0.2, 1e16, -1e16, 3.3, 1e-3]))
+
+    values = [row.cells[price.id] for row in manager.iter_rows()]
+    fresh = ColumnStatistics(manager)
+    assert manager.aggregate(price.id, "sum") == fresh.aggregate(price.id, "sum") == math.fsum(values)
+    assert manager.aggregate(price.id, "mean") == fresh.aggregate(price.id, "mean")
+    fresh.close()
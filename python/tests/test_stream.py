@@ -0,0 +1,56 @@
+import io
+import json
+import os
+from agentable.manager import AgentableManager
+from agentable.stream import AgentableStreamReader, AgentableStreamWriter
+
+FIXTURE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../spec/fixtures/valid/agentable_full_1.0.table.json"))
+
+
+class _Unseekable(io.StringIO):
+    def seekable(self):
+        return False
+
+
+def test_reader_matches_full_load():
+    with open(FIXTURE, "rb") as f:
+        data = json.load(f)
+    with open(FIXTURE, "rb") as f:
+        reader = AgentableStreamReader(f, chunk_size=7)
+        rows = [r.model_dump() for r in reader]
+    assert reader.header.metadata.title == data["metadata"]["title"]
+    assert [c.id for c in reader.header.columns] == [c["id"] for c in data["columns"]]
+    assert rows == data["rows"]
+
+
+def test_reader_handles_rows_before_header():
+    manager = AgentableManager()
+    col = manager.add_column("Score", "number")
+    manager.add_rows([{col.id: i * 1000.5} for i in range(50)])
+    data = manager.to_dict()
+    text = json.dumps({"rows": data["rows"], "version": data["version"], "metadata": data["metadata"], "columns": data["columns"], "views": []})
+
+    for handle in (io.StringIO(text), _Unseekable(text)):
+        reader = AgentableStreamReader(handle, chunk_size=5)
+        assert reader.header is not None or not handle.seekable()
+        assert [r.model_dump() for r in reader] == data["rows"]
+        assert reader.header.columns[0].id == col.id
+
+
+def test_writer_round_trip():
+    manager = AgentableManager()
+    col = manager.add_column("Name", "text")
+    view = manager.create_view("All")
+    manager.add_filter(view.id, col.id, "isEmpty", None)
+    manager.add_rows([{col.id: "naïve"}, {col.id: None}])
+
+    out = io.StringIO()
+    assert manager.write_json(out) == 2
+    loaded = json.loads(out.getvalue())
+    assert loaded["rows"] == manager.to_dict()["rows"]
+    assert AgentableManager(loaded).to_dict()["views"] == manager.to_dict()["views"]
+
+    empty = io.StringIO()
+    with AgentableStreamWriter(empty, {"version": "agentable-1.0.0", "metadata": {"title": "T"}}):
+        pass
+    assert list(AgentableStreamReader(io.StringIO(empty.getvalue()))) == []
@@ -0,0 +1,45 @@
+from datetime import datetime, timezone
+import pytest
+from agentable.columnar import ColumnarAgentableManager
+from agentable.manager import AgentableManager
+from agentable.models import _to_base36, row_id_created_at, row_id_floor, row_id_timestamp
+
+HOUR = 3_600_000
+BASE = 1_700_000_000_000
+
+
+def _id(ms: int, suffix: str = "abc") -> str:
+    return _to_base36(ms, 9) + suffix
+
+
+@pytest.mark.parametrize("manager_class", [AgentableManager, ColumnarAgentableManager])
+def test_creation_time_queries_follow_ids_not_display_order(manager_class):
+    # Display order differs from creation order
+    ids = [_id(BASE + 2 * HOUR), _id(BASE), _id(BASE + HOUR), _id(BASE + HOUR, "abd")]
+    manager = manager_class({"metadata": {"title": "T"}, "rows": [{"id": id, "cells": {}} for id in ids]})
+
+    assert [r.id for r in manager.rows_created_between(BASE, BASE + 2 * HOUR)] == [ids[1], ids[2], ids[3]]
+    assert [r.id for r in manager.rows_created_between(BASE + HOUR)] == [ids[2], ids[3], ids[0]]
+    start = datetime.fromtimestamp((BASE + HOUR) / 1000, tz=timezone.utc)
+    assert [r.id for r in manager.rows_created_between(start, BASE + HOUR + 1)] == [ids[2], ids[3]]
+
+    manager.move_row(ids[0], 3)
+    manager.delete_row(ids[2])
+    manager.delete_row("000000000000")
+    new = manager.add_row({})
+    copy = manager.duplicate_row(ids[1])
+    assert [r.id for r in manager.latest(3)] == [copy.id, new.id, ids[0]]
+    assert [r.id for r in manager.rows_created_between(end=BASE + 2 * HOUR)] == [ids[1], ids[3]]
+
+    manager.delete_rows([ids[1], ids[3], new.id])
+    assert [r.id for r in manager.rows_created_between()] == [ids[0], copy.id]
+    assert [r.id for r in manager.latest(10)] == [copy.id, ids[0]]
+
+
+def test_row_id_timestamp_helpers():
+    row_id = _id(BASE)
+    assert row_id_timestamp(row_id) == BASE
+    assert row_id_created_at(row_id) == datetime.fromtimestamp(BASE / 1000, tz=timezone.utc)
+    assert row_id_floor(row_id_created_at(row_id)) == _id(BASE, "000")
+    with pytest.raises(ValueError):
+        row_id_timestamp("not-an-id!!!")
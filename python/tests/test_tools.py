@@ -1,5 +1,7 @@
 import pytest
+import json
 from agentable.manager import AgentableManager
+from agentable.models import AgentablePermissions, AgentablePolicy
 from agentable.tools import AgentableAgentTooling
 
 def test_dynamic_model_generation():
@@ -47,3 +49,73 @@ def test_format_anthropic():
     assert col.id in tool_def["input_schema"]["properties"]
     # Boolean might be represented as boolean type in JSON schema
     assert tool_def["input_schema"]["properties"][col.id]["anyOf"][0]["type"] == "boolean"
+
+def test_query_rows_pages_are_stable_under_inserts():
+    manager = AgentableManager()
+    score = manager.add_column("Score", "number")
+    name = manager.add_column("Name", "text")
+    for i in range(30):
+        manager.add_row({score.id: i % 5, name.id: f"row {i}"})
+
+    tools = AgentableAgentTooling(manager)
+    assert tools.format_query_openai()["function"]["parameters"]["properties"]["columns"]["items"]["enum"] == [score.id, name.id]
+    assert "input_schema" in tools.format_query_anthropic()
+
+    sorts = [{"column_id": score.id, "direction": "desc"}]
+    filters = [{"column_id": score.id, "operator": "gt", "value": 0}]
+    seen = []
+    cursor = None
+    while True:
+        result = tools.tool_query_rows(filters=filters, sorts=sorts, columns=[name.id], cursor=cursor, max_chars=300)
+        assert len(result) <= 300
+        page = json.loads(result)
+        # Every matching row, not just those after the cursor
+        assert page["total"] == sum(1 for r in manager.iter_rows() if r.cells[score.id] > 0)
+        seen.extend(r["id"] for r in page["rows"])
+        assert all(list(r["cells"]) == [name.id] for r in page["rows"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+        # Rows added mid-scan land before or after the cursor, never shifting the pages
+        manager.add_row({score.id: 4, name.id: "late high"})
+        manager.add_row({score.id: 1, name.id: "late low"})
+
+    original = sorted((r for r in manager.iter_rows() if r.cells[name.id].startswith("row ") and r.cells[score.id] > 0), key=lambda r: (-r.cells[score.id], r.id))
+    late = [id for id in seen if manager.get_row(id).cells[name.id].startswith("late")]
+    assert [id for id in seen if id not in late] == [r.id for r in original]
+    assert len(seen) == len(set(seen))
+
+    # A cursor only continues the query it came from
+    other = tools.query_rows(max_chars=1)["nextCursor"]
+    assert tools.tool_query_rows(sorts=sorts, cursor=other).startswith("Error:")
+
+def test_query_rows_permission():
+    manager = AgentableManager()
+    manager.schema.policy = AgentablePolicy(permissions=AgentablePermissions(allowAgentRead=False))
+    tools = AgentableAgentTooling(manager)
+    assert tools.tool_query_rows().startswith("Permission Denied")
+
+def test_tool_schemas_follow_column_version():
+    manager = AgentableManager()
+    col = manager.add_column("Task", "text")
+    tools = AgentableAgentTooling(manager)
+
+    model = tools.generate_row_model()
+    assert tools.generate_row_model() is model
+    first = tools.format_openai()
+    first["function"]["parameters"]["properties"].clear()
+    assert col.id in tools.format_openai()["function"]["parameters"]["properties"]
+
+    # Tables with the same columns share the cached entries
+    twin = AgentableManager(manager.to_dict())
+    assert AgentableAgentTooling(twin).generate_row_model() is model
+
+    version = manager.column_version
+    manager.update_column(col.id, description="What to do")
+    assert manager.column_version == version + 1
+    assert tools.generate_row_model() is not model
+    assert "What to do" in tools.describe_table()
+    other = manager.add_column("Done", "boolean")
+    assert other.id in tools.format_anthropic()["input_schema"]["properties"]
+    manager.delete_column(other.id)
+    assert other.id not in tools.describe_table()